@@ -0,0 +1,76 @@
+"""Benchmark of the Arrow-native fetch path against pd.read_sql.
+
+It loads a table of a SQLite fixture with both paths and prints their
+timings. The Arrow-native path requires an ADBC driver or connectorx:
+
+    pip install adbc-driver-sqlite
+    python benchmarks/fetch.py --rows 1000000
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pandasai.helpers.connection_pool import get_connection_pool
+from pandasai_sql import arrow_to_pandas, fetch_arrow
+
+QUERY = "SELECT * FROM sales"
+
+
+def create_fixture(path: str, rows: int) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "amount": rng.random(rows) * 1000,
+            "quantity": rng.integers(0, 100, rows),
+            "country": rng.choice(["France", "Italy", "Japan", "Peru"], rows),
+        }
+    )
+    with sqlite3.connect(path) as connection:
+        df.to_sql("sales", connection, index=False)
+
+
+def timeit(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        connection_info = {"database": os.path.join(directory, "fixture.db")}
+        create_fixture(connection_info["database"], args.rows)
+
+        def read_sql():
+            with sqlite3.connect(connection_info["database"]) as connection:
+                return pd.read_sql(QUERY, connection)
+
+        def read_arrow():
+            return arrow_to_pandas(fetch_arrow("sqlite", connection_info, QUERY))
+
+        print(f"pd.read_sql: {timeit(read_sql, args.repeat):.3f}s")
+        if fetch_arrow("sqlite", connection_info, "SELECT 1") is None:
+            print("Arrow-native: no ADBC driver or connectorx installed")
+        else:
+            pd.testing.assert_frame_equal(read_arrow(), read_sql())
+            print(f"Arrow-native: {timeit(read_arrow, args.repeat):.3f}s")
+
+        get_connection_pool().close_all()
+
+
+if __name__ == "__main__":
+    main()
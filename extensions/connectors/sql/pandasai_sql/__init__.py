@@ -1,44 +1,275 @@
+import importlib
+import os
+import re
+import uuid
+from urllib.parse import quote
+
 import pandas as pd
 
+from pandasai.helpers.connection_pool import get_connection_pool, ping
 
-def load_from_mysql(connection_info, query):
+# ADBC drivers fetching query results as Arrow tables, by source type
+ADBC_DRIVERS = {
+    "sqlite": "adbc_driver_sqlite.dbapi",
+    "postgres": "adbc_driver_postgresql.dbapi",
+}
+
+# Source types supported by connectorx
+CONNECTORX_SOURCES = {"mysql", "postgres", "sqlite"}
+
+# Messages of the driver errors raised when a column can't be built as Arrow,
+# e.g. "[SQLite] Type mismatch in column 0" for a column of mixed types
+ARROW_CONVERSION_ERROR_REGEX = re.compile(
+    r"type mismatch|unsupported type|no conversion rule|cannot (?:infer|convert)",
+    re.IGNORECASE,
+)
+
+
+def _mysql_connection(connection_info):
     import pymysql
 
-    conn = pymysql.connect(
-        host=connection_info["host"],
-        user=connection_info["user"],
-        password=connection_info["password"],
-        database=connection_info["database"],
-        port=connection_info["port"],
+    def connect():
+        return pymysql.connect(
+            host=connection_info["host"],
+            user=connection_info["user"],
+            password=connection_info["password"],
+            database=connection_info["database"],
+            port=connection_info["port"],
+            # pooled connections must not keep a stale transaction snapshot
+            autocommit=True,
+        )
+
+    return get_connection_pool().connection(
+        "mysql",
+        connection_info,
+        connect,
+        health_check=lambda conn: conn.ping(reconnect=False),
     )
-    return pd.read_sql(query, conn)
 
 
-def load_from_postgres(connection_info, query):
+def _postgres_connection(connection_info):
     import psycopg2
 
-    conn = psycopg2.connect(
-        host=connection_info["host"],
-        user=connection_info["user"],
-        password=connection_info["password"],
-        dbname=connection_info["database"],
-        port=connection_info["port"],
+    def connect():
+        conn = psycopg2.connect(
+            host=connection_info["host"],
+            user=connection_info["user"],
+            password=connection_info["password"],
+            dbname=connection_info["database"],
+            port=connection_info["port"],
+        )
+        # pooled connections must not stay idle in a transaction
+        conn.autocommit = True
+        return conn
+
+    return get_connection_pool().connection(
+        "postgres", connection_info, connect, health_check=ping
     )
-    return pd.read_sql(query, conn)
 
 
-def load_from_sqlite(connection_info, query):
+def _sqlite_connection(connection_info):
     import sqlite3
 
-    conn = sqlite3.connect(connection_info["database"])
-    return pd.read_sql(query, conn)
+    def connect():
+        # the pool ensures a connection is used by a single thread at a time
+        return sqlite3.connect(connection_info["database"], check_same_thread=False)
 
+    return get_connection_pool().connection("sqlite", connection_info, connect)
 
-def load_from_cockroachdb(connection_info, query):
+
+def _cockroachdb_connection(connection_info):
     import cockroachdb
 
-    conn = cockroachdb.connect(connection_info)
-    return pd.read_sql(query, conn)
+    def connect():
+        conn = cockroachdb.connect(connection_info)
+        # pooled connections must not stay idle in a transaction
+        conn.autocommit = True
+        return conn
+
+    return get_connection_pool().connection(
+        "cockroachdb", connection_info, connect, health_check=ping
+    )
+
+
+def _fetch_chunks(cursor, query, chunk_size):
+    """Execute the query on the cursor and yield its rows by DataFrame chunks."""
+    try:
+        cursor.execute(query)
+        columns = [description[0] for description in cursor.description]
+
+        rows = cursor.fetchmany(chunk_size)
+        # always yield a chunk, so that empty results still have their columns
+        yield pd.DataFrame(rows, columns=columns)
+        while rows:
+            rows = cursor.fetchmany(chunk_size)
+            if rows:
+                yield pd.DataFrame(rows, columns=columns)
+    finally:
+        cursor.close()
+
+
+def _import_optional(name):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _get_uri(source_type, connection_info):
+    if source_type == "sqlite":
+        return f"sqlite://{os.path.abspath(connection_info['database'])}"
+
+    scheme = "postgresql" if source_type == "postgres" else source_type
+    user = quote(str(connection_info["user"]), safe="")
+    password = quote(str(connection_info["password"]), safe="")
+    return (
+        f"{scheme}://{user}:{password}@{connection_info['host']}:"
+        f"{connection_info['port']}/{connection_info['database']}"
+    )
+
+
+def _fetch_arrow_with_adbc(source_type, connection_info, query):
+    if source_type not in ADBC_DRIVERS:
+        return None
+
+    driver = _import_optional(ADBC_DRIVERS[source_type])
+    if driver is None:
+        return None
+
+    if source_type == "sqlite":
+        uri = connection_info["database"]
+    else:
+        uri = _get_uri(source_type, connection_info)
+
+    with get_connection_pool().connection(
+        f"{source_type}+adbc",
+        connection_info,
+        lambda: driver.connect(uri, autocommit=True),
+        health_check=ping,
+    ) as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query)
+            return cursor.fetch_arrow_table()
+        finally:
+            cursor.close()
+
+
+def _fetch_arrow_with_connectorx(source_type, connection_info, query):
+    connectorx = _import_optional("connectorx")
+    if connectorx is None or source_type not in CONNECTORX_SOURCES:
+        return None
+
+    return connectorx.read_sql(
+        _get_uri(source_type, connection_info), query, return_type="arrow"
+    )
+
+
+def _is_arrow_conversion_error(error):
+    if isinstance(error, (ImportError, NotImplementedError)):
+        return True
+
+    pa = _import_optional("pyarrow")
+    if pa is not None and isinstance(error, (pa.ArrowInvalid, pa.ArrowTypeError)):
+        return True
+
+    adbc = _import_optional("adbc_driver_manager")
+    if adbc is not None and isinstance(error, (adbc.NotSupportedError, adbc.DataError)):
+        return True
+
+    # the drivers report the other conversion errors as generic errors
+    return isinstance(error, (OSError, RuntimeError)) and bool(
+        ARROW_CONVERSION_ERROR_REGEX.search(str(error))
+    )
+
+
+def fetch_arrow(source_type, connection_info, query):
+    """
+    Fetch the result of the query as a `pyarrow.Table`, with an ADBC driver
+    or connectorx, which build the columns natively instead of going through
+    Python objects row by row.
+
+    Returns:
+        Optional[pyarrow.Table]: the result, None if no Arrow-native driver is
+        installed for the source or if the drivers can't build the result as
+        Arrow, e.g. a SQLite column holding values of several types.
+
+    Raises:
+        Exception: the errors of the query itself, e.g. a SQL syntax error, a
+            timeout or a missing permission, which aren't retried by the next
+            driver or by pandas.
+    """
+    for fetch in (_fetch_arrow_with_adbc, _fetch_arrow_with_connectorx):
+        try:
+            table = fetch(source_type, connection_info, query)
+        except Exception as error:
+            if not _is_arrow_conversion_error(error):
+                raise
+            # the query is run again by the next driver, or by pandas
+            continue
+        if table is not None:
+            return table
+    return None
+
+
+def arrow_to_pandas(table):
+    """
+    Convert an Arrow table to a pandas DataFrame, without copying the columns
+    that don't need to be and releasing the Arrow buffers as they are converted.
+    """
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _read_sql(source_type, connection_info, query, connection):
+    table = fetch_arrow(source_type, connection_info, query)
+    if table is not None:
+        return arrow_to_pandas(table)
+
+    with connection(connection_info) as conn:
+        return pd.read_sql(query, conn)
+
+
+def load_from_mysql(connection_info, query):
+    return _read_sql("mysql", connection_info, query, _mysql_connection)
+
+
+def stream_from_mysql(connection_info, query, chunk_size):
+    import pymysql
+
+    with _mysql_connection(connection_info) as conn:
+        # unbuffered cursor, the rows are streamed from the server
+        cursor = conn.cursor(pymysql.cursors.SSCursor)
+        yield from _fetch_chunks(cursor, query, chunk_size)
+
+
+def load_from_postgres(connection_info, query):
+    return _read_sql("postgres", connection_info, query, _postgres_connection)
+
+
+def stream_from_postgres(connection_info, query, chunk_size):
+    with _postgres_connection(connection_info) as conn:
+        # named cursors are server-side cursors, held to work in autocommit
+        cursor = conn.cursor(name=f"pandasai_{uuid.uuid4().hex}", withhold=True)
+        cursor.itersize = chunk_size
+        yield from _fetch_chunks(cursor, query, chunk_size)
+
+
+def load_from_sqlite(connection_info, query):
+    return _read_sql("sqlite", connection_info, query, _sqlite_connection)
+
+
+def stream_from_sqlite(connection_info, query, chunk_size):
+    with _sqlite_connection(connection_info) as conn:
+        yield from _fetch_chunks(conn.cursor(), query, chunk_size)
+
+
+def load_from_cockroachdb(connection_info, query):
+    return _read_sql("cockroachdb", connection_info, query, _cockroachdb_connection)
+
+
+def stream_from_cockroachdb(connection_info, query, chunk_size):
+    with _cockroachdb_connection(connection_info) as conn:
+        yield from _fetch_chunks(conn.cursor(), query, chunk_size)
 
 
 __all__ = [
@@ -49,4 +280,10 @@ __all__ = [
     "load_from_postgres",
     "load_from_sqlite",
     "load_from_cockroach",
+    "stream_from_mysql",
+    "stream_from_postgres",
+    "stream_from_sqlite",
+    "stream_from_cockroachdb",
+    "fetch_arrow",
+    "arrow_to_pandas",
 ]
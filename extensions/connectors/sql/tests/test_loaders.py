@@ -0,0 +1,164 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pyarrow as pa
+
+from pandasai_sql import (
+    load_from_cockroachdb,
+    load_from_mysql,
+    load_from_postgres,
+    load_from_sqlite,
+    stream_from_sqlite,
+)
+from pandasai.helpers.connection_pool import get_connection_pool
+
+
+class TestSQLLoaders(unittest.TestCase):
+    def setUp(self):
+        self.connection_info = {
+            "host": "localhost",
+            "user": "testuser",
+            "password": "testpass",
+            "database": "testdb",
+            "port": 3306,
+        }
+        self.query = "SELECT * FROM test_table"
+
+    def tearDown(self):
+        get_connection_pool().close_all()
+
+    @patch("pandasai_sql.pd.read_sql")
+    def test_load_from_mysql(self, mock_read_sql):
+        mock_pymysql = Mock()
+        mock_connection = Mock()
+        mock_pymysql.connect.return_value = mock_connection
+
+        expected_df = pd.DataFrame({"col1": [1, 2], "col2": ["a", "b"]})
+        mock_read_sql.return_value = expected_df
+
+        with patch.dict("sys.modules", {"pymysql": mock_pymysql}):
+            result = load_from_mysql(self.connection_info, self.query)
+
+        mock_pymysql.connect.assert_called_once_with(
+            host=self.connection_info["host"],
+            user=self.connection_info["user"],
+            password=self.connection_info["password"],
+            database=self.connection_info["database"],
+            port=self.connection_info["port"],
+            autocommit=True,
+        )
+        mock_read_sql.assert_called_once_with(self.query, mock_connection)
+        pd.testing.assert_frame_equal(result, expected_df)
+
+    @patch("pandasai_sql.pd.read_sql")
+    def test_load_from_postgres(self, mock_read_sql):
+        mock_psycopg2 = Mock()
+        mock_connection = Mock()
+        mock_psycopg2.connect.return_value = mock_connection
+
+        expected_df = pd.DataFrame({"col1": [1, 2], "col2": ["a", "b"]})
+        mock_read_sql.return_value = expected_df
+
+        with patch.dict("sys.modules", {"psycopg2": mock_psycopg2}):
+            result = load_from_postgres(self.connection_info, self.query)
+
+        mock_psycopg2.connect.assert_called_once_with(
+            host=self.connection_info["host"],
+            user=self.connection_info["user"],
+            password=self.connection_info["password"],
+            dbname=self.connection_info["database"],
+            port=self.connection_info["port"],
+        )
+        mock_read_sql.assert_called_once_with(self.query, mock_connection)
+        pd.testing.assert_frame_equal(result, expected_df)
+
+    @patch("pandasai_sql.pd.read_sql")
+    def test_load_from_cockroachdb_uses_autocommit(self, mock_read_sql):
+        mock_cockroachdb = Mock()
+        mock_connection = Mock()
+        mock_cockroachdb.connect.return_value = mock_connection
+        mock_read_sql.return_value = pd.DataFrame({"col1": [1]})
+
+        with patch.dict("sys.modules", {"cockroachdb": mock_cockroachdb}):
+            load_from_cockroachdb(self.connection_info, self.query)
+
+        mock_cockroachdb.connect.assert_called_once_with(self.connection_info)
+        assert mock_connection.autocommit is True
+        mock_read_sql.assert_called_once_with(self.query, mock_connection)
+
+    @patch("pandasai_sql.pd.read_sql")
+    def test_load_from_mysql_reuses_connection(self, mock_read_sql):
+        mock_pymysql = Mock()
+        mock_connection = Mock()
+        mock_pymysql.connect.return_value = mock_connection
+        mock_read_sql.return_value = pd.DataFrame({"col1": [1]})
+
+        with patch.dict("sys.modules", {"pymysql": mock_pymysql}):
+            load_from_mysql(self.connection_info, self.query)
+            load_from_mysql(self.connection_info, self.query)
+
+        mock_pymysql.connect.assert_called_once()
+        mock_connection.ping.assert_called_once_with(reconnect=False)
+        assert mock_read_sql.call_count == 2
+
+    def test_stream_from_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            connection_info = {"database": os.path.join(directory, "test.db")}
+            connection = sqlite3.connect(connection_info["database"])
+            pd.DataFrame({"id": range(5)}).to_sql("test_table", connection)
+            connection.close()
+
+            chunks = list(
+                stream_from_sqlite(connection_info, "SELECT id FROM test_table", 2)
+            )
+
+        assert [chunk["id"].tolist() for chunk in chunks] == [[0, 1], [2, 3], [4]]
+
+    @patch("pandasai_sql.pd.read_sql")
+    @patch("pandasai_sql.fetch_arrow")
+    def test_load_from_sqlite_with_arrow(self, mock_fetch_arrow, mock_read_sql):
+        mock_fetch_arrow.return_value = pa.table({"col1": [1, 2], "col2": ["a", "b"]})
+        connection_info = {"database": "test.db"}
+
+        result = load_from_sqlite(connection_info, self.query)
+
+        mock_fetch_arrow.assert_called_once_with("sqlite", connection_info, self.query)
+        mock_read_sql.assert_not_called()
+        pd.testing.assert_frame_equal(
+            result, pd.DataFrame({"col1": [1, 2], "col2": ["a", "b"]})
+        )
+
+    def test_load_from_sqlite_with_mixed_types(self):
+        with tempfile.TemporaryDirectory() as directory:
+            connection_info = {"database": os.path.join(directory, "test.db")}
+            connection = sqlite3.connect(connection_info["database"])
+            connection.execute("CREATE TABLE test_table (value)")
+            connection.executemany(
+                "INSERT INTO test_table VALUES (?)",
+                [(i,) for i in range(3000)] + [("x",)],
+            )
+            connection.commit()
+            connection.close()
+
+            # the Arrow drivers reject the column, pandas reads it
+            result = load_from_sqlite(connection_info, "SELECT value FROM test_table")
+
+        assert len(result) == 3001
+        assert result["value"].iloc[-1] == "x"
+
+    @patch("pandasai_sql.pd.read_sql")
+    def test_load_from_sqlite_raises_query_errors(self, mock_read_sql):
+        with tempfile.TemporaryDirectory() as directory:
+            connection_info = {"database": os.path.join(directory, "test.db")}
+            sqlite3.connect(connection_info["database"]).close()
+
+            # the query isn't run again by pandas
+            with self.assertRaises(Exception) as context:
+                load_from_sqlite(connection_info, "SELECT * FROM missing_table")
+
+        assert "no such table" in str(context.exception)
+        mock_read_sql.assert_not_called()
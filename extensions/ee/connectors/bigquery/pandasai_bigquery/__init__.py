@@ -1,16 +1,32 @@
 from google.cloud import bigquery
 import pandas as pd
+
+from pandasai.helpers.connection_pool import get_connection_pool
+from pandasai_sql import arrow_to_pandas
 from .google_big_query import GoogleBigQueryConnector
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 
 def load_from_bigquery(connection_info, query):
-    client = bigquery.Client(
-        project=connection_info["project_id"],
-        credentials=connection_info.get("credentials"),
-    )
+    def connect():
+        return bigquery.Client(
+            project=connection_info["project_id"],
+            credentials=connection_info.get("credentials"),
+        )
 
-    query_job = client.query(query)
-    return pd.DataFrame(query_job.result())
+    # BigQuery clients are stateless HTTP clients, they don't need health checks
+    with get_connection_pool().connection(
+        "bigquery", connection_info, connect
+    ) as client:
+        query_job = client.query(query)
+        if pa is not None:
+            # fetch the result natively as an Arrow table
+            return arrow_to_pandas(query_job.to_arrow())
+        return pd.DataFrame(query_job.result())
 
 
 __all__ = ["GoogleBigQueryConnector", "load_from_bigquery"]
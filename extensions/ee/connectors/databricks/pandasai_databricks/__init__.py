@@ -1,9 +1,11 @@
 from .databricks import DatabricksConnector
-import pandas as pd
 from databricks import sql
 
+from pandasai.helpers.connection_pool import get_connection_pool, ping
+from pandasai_sql import arrow_to_pandas
 
-def load_from_databricks(config):
+
+def load_from_databricks(config, query=None):
     """
     Load data from Databricks SQL into a pandas DataFrame.
 
@@ -15,19 +17,13 @@ def load_from_databricks(config):
             - database: (optional) Database name
             - table: (optional) Table name
             - query: (optional) Custom SQL query
+        query (str, optional): SQL query, takes precedence over the query or
+            the table of the config
 
     Returns:
         pd.DataFrame: DataFrame containing the query results
     """
-    connection = sql.connect(
-        server_hostname=config["host"],
-        http_path=config["http_path"],
-        access_token=config["token"],
-    )
-
-    cursor = connection.cursor()
-
-    try:
+    if query is None:
         if "query" in config:
             query = config["query"]
         elif "table" in config:
@@ -35,17 +31,30 @@ def load_from_databricks(config):
         else:
             raise ValueError("Either 'query' or 'table' must be provided in config")
 
-        cursor.execute(query)
-        result = cursor.fetchall()
-
-        if not result:
-            return pd.DataFrame()
-
-        columns = [desc[0] for desc in cursor.description]
-        return pd.DataFrame(result, columns=columns)
-    finally:
-        cursor.close()
-        connection.close()
+    def connect():
+        return sql.connect(
+            server_hostname=config["host"],
+            http_path=config["http_path"],
+            access_token=config["token"],
+        )
+
+    connection_info = {
+        "host": config["host"],
+        "http_path": config["http_path"],
+        "token": config["token"],
+    }
+    with get_connection_pool().connection(
+        "databricks", connection_info, connect, health_check=ping
+    ) as connection:
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute(query)
+            # fetch the result natively as an Arrow table, with its columns
+            # even if it's empty
+            return arrow_to_pandas(cursor.fetchall_arrow())
+        finally:
+            cursor.close()
 
 
 __all__ = ["DatabricksConnector", "load_from_databricks"]
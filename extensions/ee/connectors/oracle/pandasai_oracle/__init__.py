@@ -1,19 +1,26 @@
 import pandas as pd
 import cx_Oracle
+
+from pandasai.helpers.connection_pool import get_connection_pool
 from .oracle import OracleConnector
 
 
 def load_from_oracle(connection_info, query):
-    dsn = cx_Oracle.makedsn(
-        connection_info["host"],
-        connection_info["port"],
-        service_name=connection_info.get("service_name"),
-        sid=connection_info.get("sid"),
-    )
-    conn = cx_Oracle.connect(
-        user=connection_info["user"], password=connection_info["password"], dsn=dsn
-    )
-    return pd.read_sql(query, conn)
+    def connect():
+        dsn = cx_Oracle.makedsn(
+            connection_info["host"],
+            connection_info["port"],
+            service_name=connection_info.get("service_name"),
+            sid=connection_info.get("sid"),
+        )
+        return cx_Oracle.connect(
+            user=connection_info["user"], password=connection_info["password"], dsn=dsn
+        )
+
+    with get_connection_pool().connection(
+        "oracle", connection_info, connect, health_check=lambda conn: conn.ping()
+    ) as conn:
+        return pd.read_sql(query, conn)
 
 
 __all__ = ["OracleConnector", "load_from_oracle"]
@@ -10,6 +10,7 @@ from extensions.ee.connectors.oracle.pandasai_oracle.oracle import (
 from extensions.ee.connectors.oracle.pandasai_oracle import load_from_oracle
 import cx_Oracle
 from sqlalchemy.exc import DatabaseError
+from pandasai.helpers.connection_pool import get_connection_pool
 
 
 class TestOracleConnector(unittest.TestCase):
@@ -63,6 +64,9 @@ class TestOracleConnector(unittest.TestCase):
 
 
 class TestLoadFromOracle(unittest.TestCase):
+    def tearDown(self):
+        get_connection_pool().close_all()
+
     @patch("extensions.ee.connectors.oracle.pandasai_oracle.cx_Oracle.makedsn")
     @patch("extensions.ee.connectors.oracle.pandasai_oracle.cx_Oracle.connect")
     @patch("extensions.ee.connectors.oracle.pandasai_oracle.pd.read_sql")
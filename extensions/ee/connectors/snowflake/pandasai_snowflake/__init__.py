@@ -1,19 +1,57 @@
 import pandas as pd
 from snowflake import connector
+
+from pandasai.helpers.connection_pool import get_connection_pool
+from pandasai_sql import arrow_to_pandas
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 from .snowflake import SnowflakeConnector
 
 
 def load_from_snowflake(connection_info, query):
-    conn = connector.connect(
-        account=connection_info["account"],
-        user=connection_info["user"],
-        password=connection_info["password"],
-        warehouse=connection_info["warehouse"],
-        database=connection_info["database"],
-        schema=connection_info.get("schema"),
-        role=connection_info.get("role"),
-    )
-    return pd.read_sql(query, conn)
+    def connect():
+        return connector.connect(
+            account=connection_info["account"],
+            user=connection_info["user"],
+            password=connection_info["password"],
+            warehouse=connection_info["warehouse"],
+            database=connection_info["database"],
+            schema=connection_info.get("schema"),
+            role=connection_info.get("role"),
+        )
+
+    with get_connection_pool().connection(
+        "snowflake",
+        connection_info,
+        connect,
+        health_check=lambda conn: not conn.is_closed(),
+    ) as conn:
+        table = _fetch_arrow(conn, query)
+        if table is not None:
+            return arrow_to_pandas(table)
+        return pd.read_sql(query, conn)
+
+
+def _fetch_arrow(conn, query):
+    """Fetch the result natively as an Arrow table, if pyarrow is installed."""
+    if pa is None:
+        return None
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query)
+        table = cursor.fetch_arrow_all()
+        if table is None:
+            # fetch_arrow_all returns None for empty results, whose columns
+            # are still described by the cursor
+            table = pa.table({column[0]: pa.array([]) for column in cursor.description})
+    finally:
+        cursor.close()
+
+    return table if isinstance(table, pa.Table) else None
 
 
 __all__ = ["SnowflakeConnector", "load_from_snowflake"]
@@ -8,6 +8,7 @@ from pandasai_snowflake.snowflake import (
     SnowflakeConnectorConfig,
 )
 from pandasai_snowflake import load_from_snowflake
+from pandasai.helpers.connection_pool import get_connection_pool
 
 
 class TestSQLConnector(unittest.TestCase):
@@ -118,6 +119,9 @@ WHERE column_name = :value_0 ORDER BY RANDOM() ASC
 
 
 class TestLoadFromSnowflake(unittest.TestCase):
+    def tearDown(self):
+        get_connection_pool().close_all()
+
     @patch("pandasai_snowflake.connector.connect")
     @patch("pandasai_snowflake.pd.read_sql")
     def test_load_from_snowflake(self, mock_read_sql, mock_connect):
@@ -201,6 +205,30 @@ class TestLoadFromSnowflake(unittest.TestCase):
 
         pd.testing.assert_frame_equal(result, expected_df)
 
+    @patch("pandasai_snowflake.connector.connect")
+    @patch("pandasai_snowflake.pd.read_sql")
+    def test_load_from_snowflake_empty_arrow_result(self, mock_read_sql, mock_connect):
+        connection_info = {
+            "account": "test_account",
+            "user": "test_user",
+            "password": "test_password",
+            "warehouse": "test_warehouse",
+            "database": "test_db",
+        }
+
+        mock_cursor = Mock()
+        mock_cursor.fetch_arrow_all.return_value = None
+        mock_cursor.description = [("col1", 0), ("col2", 2)]
+        mock_connect.return_value.cursor.return_value = mock_cursor
+
+        result = load_from_snowflake(connection_info, "SELECT * FROM empty_table")
+
+        # the columns come from the cursor, without running the query again
+        mock_cursor.execute.assert_called_once()
+        mock_read_sql.assert_not_called()
+        assert result.empty
+        assert list(result.columns) == ["col1", "col2"]
+
     @patch("pandasai_snowflake.connector.connect")
     @patch("pandasai_snowflake.pd.read_sql")
     def test_load_from_snowflake_without_optional_params(
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from pandasai.chat.prompts.base import BasePrompt
 from pandasai.helpers.memory import Memory
@@ -20,9 +20,12 @@ class LocalLLM(LLM):
 
         self.model = model
         self.client = OpenAI(base_url=api_base, api_key=api_key).chat.completions
+        self.async_client = AsyncOpenAI(
+            base_url=api_base, api_key=api_key
+        ).chat.completions
         self._invocation_params = kwargs
 
-    def chat_completion(self, value: str, memory: Memory) -> str:
+    def _chat_completion_params(self, value: str, memory: Memory) -> dict:
         messages = memory.to_openai_messages() if memory else []
 
         # adding current prompt as latest query message
@@ -33,8 +36,17 @@ class LocalLLM(LLM):
             }
         )
 
-        params = {"model": self.model, "messages": messages, **self._invocation_params}
-        response = self.client.create(**params)
+        return {"model": self.model, "messages": messages, **self._invocation_params}
+
+    def chat_completion(self, value: str, memory: Memory) -> str:
+        response = self.client.create(**self._chat_completion_params(value, memory))
+
+        return response.choices[0].message.content
+
+    async def achat_completion(self, value: str, memory: Memory) -> str:
+        response = await self.async_client.create(
+            **self._chat_completion_params(value, memory)
+        )
 
         return response.choices[0].message.content
 
@@ -45,6 +57,13 @@ class LocalLLM(LLM):
 
         return self.chat_completion(self.last_prompt, memory)
 
+    async def acall(self, instruction: BasePrompt, context: AgentState = None) -> str:
+        self.last_prompt = instruction.to_string()
+
+        memory = context.memory if context else None
+
+        return await self.achat_completion(self.last_prompt, memory)
+
     @property
     def type(self) -> str:
         return "local"
@@ -111,8 +111,14 @@ class AzureOpenAI(BaseOpenAI):
         # set the client
         if self._is_chat_model:
             self.client = openai.AzureOpenAI(**self._client_params).chat.completions
+            self.async_client = openai.AsyncAzureOpenAI(
+                **self._async_client_params
+            ).chat.completions
         else:
             self.client = openai.AzureOpenAI(**self._client_params).completions
+            self.async_client = openai.AsyncAzureOpenAI(
+                **self._async_client_params
+            ).completions
 
     @property
     def _default_params(self) -> Dict[str, Any]:
@@ -38,7 +38,10 @@ class BaseOpenAI(LLM):
     # Configure a custom httpx client. See the
     # [httpx documentation](https://www.python-httpx.org/api/#client) for more details.
     http_client: Union[Any, None] = None
+    # Configure a custom httpx.AsyncClient, used by the async API.
+    async_http_client: Union[Any, None] = None
     client: Any
+    async_client: Any = None
     _is_chat_model: bool
 
     def _set_params(self, **kwargs):
@@ -110,6 +113,39 @@ class BaseOpenAI(LLM):
             "http_client": self.http_client,
         }
 
+    @property
+    def _async_client_params(self) -> Dict[str, any]:
+        return {**self._client_params, "http_client": self.async_http_client}
+
+    def _completion_params(self, prompt: str) -> Dict[str, Any]:
+        params = {**self._invocation_params, "prompt": prompt}
+
+        if self.stop is not None:
+            params["stop"] = [self.stop]
+
+        return params
+
+    def _chat_completion_params(self, value: str, memory: Memory) -> Dict[str, Any]:
+        messages = memory.to_openai_messages() if memory else []
+
+        # adding current prompt as latest query message
+        messages.append(
+            {
+                "role": "user",
+                "content": value,
+            },
+        )
+
+        params = {
+            **self._invocation_params,
+            "messages": messages,
+        }
+
+        if self.stop is not None:
+            params["stop"] = [self.stop]
+
+        return params
+
     def completion(self, prompt: str, memory: Memory) -> str:
         """
         Query the completion API
@@ -123,12 +159,26 @@ class BaseOpenAI(LLM):
         """
         prompt = self.prepend_system_prompt(prompt, memory)
 
-        params = {**self._invocation_params, "prompt": prompt}
+        response = self.client.create(**self._completion_params(prompt))
 
-        if self.stop is not None:
-            params["stop"] = [self.stop]
+        self.last_prompt = prompt
+
+        return response.choices[0].text
+
+    async def acompletion(self, prompt: str, memory: Memory) -> str:
+        """
+        Query the completion API asynchronously
+
+        Args:
+            prompt (str): A string representation of the prompt.
+
+        Returns:
+            str: LLM response.
 
-        response = self.client.create(**params)
+        """
+        prompt = self.prepend_system_prompt(prompt, memory)
+
+        response = await self.async_client.create(**self._completion_params(prompt))
 
         self.last_prompt = prompt
 
@@ -145,25 +195,24 @@ class BaseOpenAI(LLM):
             str: LLM response.
 
         """
-        messages = memory.to_openai_messages() if memory else []
+        response = self.client.create(**self._chat_completion_params(value, memory))
 
-        # adding current prompt as latest query message
-        messages.append(
-            {
-                "role": "user",
-                "content": value,
-            },
-        )
+        return response.choices[0].message.content
 
-        params = {
-            **self._invocation_params,
-            "messages": messages,
-        }
+    async def achat_completion(self, value: str, memory: Memory) -> str:
+        """
+        Query the chat completion API asynchronously
 
-        if self.stop is not None:
-            params["stop"] = [self.stop]
+        Args:
+            value (str): Prompt
 
-        response = self.client.create(**params)
+        Returns:
+            str: LLM response.
+
+        """
+        response = await self.async_client.create(
+            **self._chat_completion_params(value, memory)
+        )
 
         return response.choices[0].message.content
 
@@ -190,3 +239,27 @@ class BaseOpenAI(LLM):
             if self._is_chat_model
             else self.completion(self.last_prompt, memory)
         )
+
+    async def acall(self, instruction: BasePrompt, context: AgentState = None):
+        """
+        Call the OpenAI LLM with the async client.
+
+        Args:
+            instruction (BasePrompt): A prompt object with instruction for LLM.
+            context (AgentState): context to pass.
+
+        Returns:
+            str: Response
+        """
+        if self.async_client is None:
+            return await super().acall(instruction, context)
+
+        self.last_prompt = instruction.to_string()
+
+        memory = context.memory if context else None
+
+        return await (
+            self.achat_completion(self.last_prompt, memory)
+            if self._is_chat_model
+            else self.acompletion(self.last_prompt, memory)
+        )
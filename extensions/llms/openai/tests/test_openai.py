@@ -1,4 +1,6 @@
 """Unit tests for the openai LLM class"""
+import asyncio
+
 import openai
 import pytest
 from unittest import mock
@@ -136,3 +138,39 @@ class TestOpenAILLM:
 
         result = openai.call(instruction=prompt)
         assert result == "response"
+
+    def test_acall_chat_model(self, mocker, prompt):
+        openai = OpenAI(api_token="test", model="gpt-4")
+        response = mock.Mock(choices=[mock.Mock(message=mock.Mock(content="code"))])
+        mocker.patch.object(openai, "client")
+        mocker.patch.object(openai, "async_client")
+        openai.async_client.create = mock.AsyncMock(return_value=response)
+
+        result = asyncio.run(openai.acall(instruction=prompt))
+
+        assert result == "code"
+        openai.async_client.create.assert_awaited_once()
+        openai.client.create.assert_not_called()
+
+    def test_acall_completion_model(self, mocker, prompt):
+        openai = OpenAI(api_token="test", model="gpt-3.5-turbo-instruct")
+        response = mock.Mock(choices=[mock.Mock(text="code")])
+        mocker.patch.object(openai, "client")
+        mocker.patch.object(openai, "async_client")
+        openai.async_client.create = mock.AsyncMock(return_value=response)
+
+        result = asyncio.run(openai.acall(instruction=prompt))
+
+        assert result == "code"
+        openai.async_client.create.assert_awaited_once()
+        openai.client.create.assert_not_called()
+
+    def test_acall_without_async_client(self, mocker, prompt):
+        openai = OpenAI(api_token="test", model="gpt-4")
+        openai.async_client = None
+        mocker.patch.object(openai, "chat_completion", return_value="code")
+
+        result = asyncio.run(openai.acall(instruction=prompt))
+
+        assert result == "code"
+        openai.chat_completion.assert_called_once()
@@ -3,21 +3,24 @@
 PandasAI is a wrapper around a LLM to make dataframes conversational
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 import os
-from typing import List
+import time
+from typing import Any, List, Optional
 from zipfile import ZipFile
 
 import pandas as pd
 
 from pandasai.config import ConfigManager, APIKeyManager
+from pandasai.constants import DEFAULT_LOAD_MAX_WORKERS
 from pandasai.exceptions import DatasetNotFound, PandasAIApiKeyError
 from pandasai.helpers.path import find_project_root
 from pandasai.helpers.request import get_pandaai_session
 from .agent import Agent
 from .helpers.cache import Cache
 from .dataframe.base import DataFrame
-from .data_loader.loader import DatasetLoader
+from .data_loader.loader import DatasetLoader, LoadResult
 from .smart_dataframe import SmartDataframe
 from .smart_datalake import SmartDatalake
 
@@ -78,21 +81,43 @@ def follow_up(query: str):
 _dataset_loader = DatasetLoader()
 
 
-def load(dataset_path: str, virtualized=False) -> DataFrame:
+def load(
+    dataset_path: str,
+    virtualized=False,
+    filters: Any = None,
+    columns: Optional[List[str]] = None,
+    params: Optional[dict] = None,
+) -> DataFrame:
     """
     Load data based on the provided dataset path.
 
     Args:
         dataset_path (str): Path in the format 'organization/dataset_name'.
+        virtualized (bool): Query the source lazily instead of loading it.
+        filters: Filters of the rows to load, as a list of
+            `(column, op, value)` tuples, e.g. `[("year", "=", 2024)]`. On
+            parquet datasets, only the matching partitions are read. On SQL
+            sources, they are added to the query.
+        columns (List[str], optional): Columns to load.
+        params (dict, optional): Values of the parameters of the filters of
+            the schema.
 
     Returns:
         DataFrame: A new PandasAI DataFrame instance with loaded data.
     """
+    _pull_dataset(dataset_path)
+
+    return _dataset_loader.load(
+        dataset_path, virtualized, filters=filters, columns=columns, params=params
+    )
+
+
+def _pull_dataset(dataset_path: str):
+    """Download the dataset from the remote server, unless it's stored locally."""
     path_parts = dataset_path.split("/")
     if len(path_parts) != 2:
         raise ValueError("The path must be in the format 'organization/dataset'.")
 
-    global _dataset_loader
     dataset_full_path = os.path.join(find_project_root(), "datasets", dataset_path)
     if not os.path.exists(dataset_full_path):
         api_key = os.environ.get("PANDASAI_API_KEY", None)
@@ -115,7 +140,54 @@ def load(dataset_path: str, virtualized=False) -> DataFrame:
         with ZipFile(BytesIO(file_data.content)) as zip_file:
             zip_file.extractall(dataset_full_path)
 
-    return _dataset_loader.load(dataset_path, virtualized)
+
+def load_many(
+    dataset_paths: List[str],
+    virtualized=False,
+    max_workers: int = DEFAULT_LOAD_MAX_WORKERS,
+) -> List[LoadResult]:
+    """
+    Load many datasets concurrently, e.g. all the datasets of a workspace.
+
+    Each dataset is loaded by its own loader in a worker thread. The queries
+    to the sources share the connection pool of the process, so datasets of
+    the same source reuse its connections.
+
+    Args:
+        dataset_paths (List[str]): Paths in the format 'organization/dataset_name'.
+        virtualized (bool): Query the sources lazily instead of loading them.
+        max_workers (int): Maximum number of datasets loaded at the same time.
+
+    Returns:
+        List[LoadResult]: The dataframe, or the error, and the loading time of
+        each dataset, in the order of the paths. A dataset failing to load
+        doesn't affect the others.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+
+    def load_dataset(dataset_path: str) -> LoadResult:
+        start = time.perf_counter()
+        try:
+            _pull_dataset(dataset_path)
+            df = DatasetLoader().load(dataset_path, virtualized)
+        except Exception as e:
+            duration = time.perf_counter() - start
+            return LoadResult(dataset_path, error=e, duration=duration)
+
+        duration = time.perf_counter() - start
+        return LoadResult(dataset_path, df=df, duration=duration)
+
+    # a dataset listed twice is loaded once
+    unique_paths = list(dict.fromkeys(dataset_paths))
+    if not unique_paths:
+        return []
+
+    max_workers = min(max_workers, len(unique_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = dict(zip(unique_paths, executor.map(load_dataset, unique_paths)))
+
+    return [results[dataset_path] for dataset_path in dataset_paths]
 
 
 def read_csv(filepath: str) -> DataFrame:
@@ -131,6 +203,7 @@ __all__ = [
     "chat",
     "follow_up",
     "load",
+    "load_many",
     "SmartDataframe",
     "SmartDatalake",
 ]
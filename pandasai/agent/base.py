@@ -1,8 +1,13 @@
+import asyncio
+import copy
+import dataclasses
+import functools
+import threading
 import traceback
 import uuid
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Any, List, Optional, Tuple, Union
 
-from pandasai.chat.cache import Cache
 from pandasai.chat.code_execution.code_executor import CodeExecutor
 from pandasai.chat.code_generation.base import CodeGenerator
 from pandasai.chat.prompts import (
@@ -19,13 +24,19 @@ from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
 
 from .state import AgentState
 from pandasai.chat.prompts.base import BasePrompt
+from pandasai.data_loader.federated_engine import FederatedQueryEngine
 from pandasai.data_loader.schema_validator import is_schema_source_same
 from pandasai.llm.bamboo_llm import BambooLLM
 from pandasai.vectorstores.vectorstore import VectorStore
 
 from ..config import load_config_from_json
-from ..constants import DEFAULT_CACHE_DIRECTORY, DEFAULT_CHART_DIRECTORY
+from ..constants import (
+    DEFAULT_BATCH_MAX_CONCURRENCY,
+    DEFAULT_CACHE_DIRECTORY,
+    DEFAULT_CHART_DIRECTORY,
+)
 from ..exceptions import (
+    CodeExecutionCancelledError,
     InvalidLLMOutputType,
     InvalidConfigError,
     MissingVectorStoreError,
@@ -99,7 +110,9 @@ class Agent:
         self._state.vectorstore = vectorstore
 
         # Initialize Cache
-        self._state.cache = Cache() if self._state.config.enable_cache else None
+        self._state.cache = (
+            self._state.get_cache_backend() if self._state.config.enable_cache else None
+        )
 
         # Setup directory paths for cache and charts
         self._configure()
@@ -110,6 +123,13 @@ class Agent:
         # Initialze Response Generator
         self._response_parser = ResponseParser()
 
+        # Executor running the generated code in the async API, None for the
+        # default executor of the event loop
+        self._executor: Optional[Executor] = None
+
+        # Set to cancel the query being processed
+        self._cancel_event = threading.Event()
+
     def chat(self, query: str, output_type: Optional[str] = None):
         """
         Start a new chat interaction with the assistant on Dataframe.
@@ -124,6 +144,115 @@ class Agent:
         """
         return self._process_query(query, output_type)
 
+    async def achat(self, query: str, output_type: Optional[str] = None):
+        """
+        Start a new chat interaction with the assistant on Dataframe, without
+        blocking the event loop.
+        """
+        self.start_new_conversation()
+
+        return await self._aprocess_query(query, output_type)
+
+    async def afollow_up(self, query: str, output_type: Optional[str] = None):
+        """
+        Continue the existing chat interaction with the assistant on Dataframe,
+        without blocking the event loop.
+        """
+        return await self._aprocess_query(query, output_type)
+
+    def chat_batch(
+        self,
+        queries: List[str],
+        output_type: Optional[str] = None,
+        max_concurrency: int = DEFAULT_BATCH_MAX_CONCURRENCY,
+    ) -> List[Any]:
+        """
+        Answer many independent questions on the dataframes concurrently.
+
+        Args:
+            queries (List[str]): questions to answer, each one in a new
+                conversation.
+            output_type (Optional[str]): output type of every answer.
+            max_concurrency (int): maximum number of questions processed at
+                the same time.
+
+        Returns:
+            List[Any]: the answers, in the order of the questions. A question
+            failing doesn't affect the others, its answer is the error message.
+        """
+        batch = self.achat_batch(queries, output_type, max_concurrency)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(batch)
+
+        # An event loop already runs in this thread, e.g. in Jupyter, the
+        # batch runs in its own event loop in another thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, batch).result()
+
+    async def achat_batch(
+        self,
+        queries: List[str],
+        output_type: Optional[str] = None,
+        max_concurrency: int = DEFAULT_BATCH_MAX_CONCURRENCY,
+    ) -> List[Any]:
+        """
+        Answer many independent questions on the dataframes concurrently,
+        without blocking the event loop. See `chat_batch`.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+
+        # Serialize the dataframes once for the prompts of all the questions
+        serialized_dataframes = [
+            df.serialize_dataframe(
+                index,
+                self._state.config.direct_sql,
+                self._state.config.enforce_privacy,
+            )
+            for index, df in enumerate(self._state.dfs)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+
+            async def answer(query: str) -> Any:
+                async with semaphore:
+                    agent = self._fork(executor)
+                    agent._state.add("serialized_dataframes", serialized_dataframes)
+                    return await agent._aprocess_query(query, output_type)
+
+            return await asyncio.gather(*(answer(query) for query in queries))
+
+    def _fork(self, executor: Optional[Executor] = None) -> "Agent":
+        """
+        Return a copy of the agent sharing its dataframes, config and caches,
+        with a new conversation, to process a query concurrently.
+        """
+        agent = copy.copy(self)
+        agent._state = dataclasses.replace(
+            self._state,
+            memory=Memory(self._state.memory.size, agent_info=self.agent_info),
+            intermediate_values=dict(self._state.intermediate_values),
+            last_code_generated=None,
+            last_code_executed=None,
+            last_prompt_id=None,
+            last_prompt_used=None,
+            output_type=None,
+        )
+        agent._code_generator = CodeGenerator(agent._state)
+        agent._executor = executor
+        agent._cancel_event = threading.Event()
+        return agent
+
+    def cancel(self):
+        """
+        Cancel the query being processed from another thread. The execution
+        of its code is stopped if it runs in the sandbox, and it isn't retried.
+        """
+        self._cancel_event.set()
+
     def call_llm_with_prompt(self, prompt: BasePrompt):
         """
         Call LLM with prompt using error handling to retry based on config
@@ -152,39 +281,114 @@ class Agent:
         """Generate code using the LLM."""
 
         self._state.memory.add(str(query), is_user=True)
-        if self._state.config.enable_cache:
-            cached_code = self._state.cache.get(
-                self._state.cache.get_cache_key(self._state)
-            )
-            if cached_code:
-                self._state.logger.log("Using cached code.")
-                return self._code_generator.validate_and_clean_code(cached_code)
+        cached_code = self._get_cached_code(query)
+        if cached_code:
+            return self._code_generator.validate_and_clean_code(cached_code)
+
+        self._state.logger.log("Generating new code...")
+        prompt = self._get_chat_prompt()
+        code, additional_dependencies = self._code_generator.generate_code(prompt)
+        self._state.last_prompt_used = prompt
+        return code, additional_dependencies
+
+    async def agenerate_code(
+        self, query: Union[UserQuery, str]
+    ) -> Tuple[str, Optional[List[str]]]:
+        """Generate code using the LLM, without blocking the event loop."""
+
+        self._state.memory.add(str(query), is_user=True)
+        cached_code = self._get_cached_code(query)
+        if cached_code:
+            return self._code_generator.validate_and_clean_code(cached_code)
 
         self._state.logger.log("Generating new code...")
-        prompt = (
+        prompt = self._get_chat_prompt()
+        code, additional_dependencies = await self._code_generator.agenerate_code(
+            prompt
+        )
+        self._state.last_prompt_used = prompt
+        return code, additional_dependencies
+
+    def _get_cached_code(self, query: Union[UserQuery, str]) -> Optional[str]:
+        if not self._state.config.enable_cache:
+            return None
+
+        cached_code = self._state.cache.get(
+            self._state.cache.get_cache_key(self._state)
+        )
+        if cached_code:
+            self._state.logger.log("Using cached code.")
+            return cached_code
+
+        cached_code = self._get_semantically_cached_code(str(query))
+        if cached_code:
+            self._state.logger.log("Using cached code of a similar query.")
+            return cached_code
+
+        return None
+
+    def _get_chat_prompt(self) -> BasePrompt:
+        return (
             get_chat_prompt_for_sql(self._state)
             if self._state.config.direct_sql
             else get_chat_prompt(self._state)
         )
-        code, additional_dependencies = self._code_generator.generate_code(prompt)
-        self._state.last_prompt_used = prompt
-        return code, additional_dependencies
 
     def execute_code(
         self, code: str, additional_dependencies: Optional[List[str]]
     ) -> dict:
         """Execute the generated code."""
+        if self._cancel_event.is_set():
+            raise CodeExecutionCancelledError("The code execution was cancelled")
+
         self._state.logger.log(f"Executing code: {code}")
+        self._state.last_code_executed = code
+        sandbox = self._state.config.sandbox
+        if sandbox is not None:
+            # The code runs in a worker process, stopped on timeout or cancel
+            return sandbox.execute(
+                code,
+                self._state.dfs,
+                additional_dependencies,
+                execute_sql_query=(
+                    self._get_execute_sql_query()
+                    if self._state.config.direct_sql
+                    else None
+                ),
+                cancel_event=self._cancel_event,
+            )
+
         code_executor = CodeExecutor(additional_dependencies)
         code_executor.add_to_env("dfs", self._state.dfs)
 
         if self._state.config.direct_sql:
-            code_executor.add_to_env(
-                "execute_sql_query", self._state.dfs[0].execute_sql_query
-            )
+            code_executor.add_to_env("execute_sql_query", self._get_execute_sql_query())
 
         return code_executor.execute_and_return_result(code)
 
+    def _get_execute_sql_query(self):
+        if self._is_federated():
+            # the dataframes of different sources are joined by DuckDB
+            execute_sql_query = FederatedQueryEngine(self._state.dfs).execute_sql_query
+        else:
+            execute_sql_query = self._state.dfs[0].execute_sql_query
+        config = self._state.config
+        options = {}
+
+        if config.max_result_rows is not None or config.max_result_bytes is not None:
+            # Abort the queries whose result would exhaust the memory
+            options["max_rows"] = config.max_result_rows
+            options["max_bytes"] = config.max_result_bytes
+
+        if config.enable_cache and config.query_cache is not None:
+            # Retries and follow-ups running the same query don't hit the source
+            options["query_cache"] = config.query_cache
+
+        if not options:
+            return execute_sql_query
+
+        return functools.partial(execute_sql_query, **options)
+
     def execute_with_retries(
         self, code: str, additional_dependencies: Optional[List[str]]
     ) -> Any:
@@ -196,6 +400,8 @@ class Agent:
             try:
                 result = self.execute_code(code, additional_dependencies)
                 return self._response_parser.parse(result)
+            except CodeExecutionCancelledError:
+                raise
             except Exception as e:
                 retries += 1
                 if retries > max_retries:
@@ -208,6 +414,40 @@ class Agent:
                     code, e
                 )
 
+    async def aexecute_with_retries(
+        self, code: str, additional_dependencies: Optional[List[str]]
+    ) -> Any:
+        """
+        Execute the code with retry logic, without blocking the event loop. The
+        code runs in a worker thread and the corrections are generated with
+        the async LLM API.
+        """
+        max_retries = self._state.config.max_retries
+        retries = 0
+        loop = asyncio.get_running_loop()
+
+        while retries <= max_retries:
+            try:
+                result = await loop.run_in_executor(
+                    self._executor, self.execute_code, code, additional_dependencies
+                )
+                return self._response_parser.parse(result)
+            except CodeExecutionCancelledError:
+                raise
+            except Exception as e:
+                retries += 1
+                if retries > max_retries:
+                    self._state.logger.log(f"Max retries reached. Error: {e}")
+                    raise
+                self._state.logger.log(
+                    f"Retrying execution ({retries}/{max_retries})..."
+                )
+                prompt = self._get_error_correction_prompt(code, e)
+                (
+                    code,
+                    additional_dependencies,
+                ) = await self._code_generator.agenerate_code(prompt)
+
     def train(
         self,
         queries: Optional[List[str]] = None,
@@ -262,9 +502,34 @@ class Agent:
         """
         self.clear_memory()
 
+    def _is_federated(self) -> bool:
+        """
+        Whether the SQL queries run in an embedded engine joining dataframes
+        of different sources, rather than in the source of the dataframes.
+        """
+        dfs = self._state.dfs
+        if (
+            not self._state.config.federated_queries
+            or len(dfs) < 2
+            or not any(isinstance(df, VirtualDataFrame) for df in dfs)
+        ):
+            return False
+
+        # each csv or parquet dataset is queried on its own files
+        return not all(
+            isinstance(df, VirtualDataFrame)
+            and df.schema["source"]["type"] not in ["csv", "parquet"]
+            and is_schema_source_same(dfs[0].schema, df.schema)
+            for df in dfs
+        )
+
     def _validate_input(self):
         from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
 
+        if self._is_federated():
+            self._state.config.direct_sql = True
+            return
+
         # Check if all DataFrames are VirtualDataFrame, and set direct_sql accordingly
         all_virtual = all(isinstance(df, VirtualDataFrame) for df in self._state.dfs)
         if all_virtual:
@@ -297,32 +562,71 @@ class Agent:
 
     def _process_query(self, query: str, output_type: Optional[str] = None):
         """Process a user query and return the result."""
-        query = UserQuery(query)
-        self._state.logger.log(f"Question: {query}")
-        self._state.logger.log(
-            f"Running PandasAI with {self._state.config.llm.type} LLM..."
-        )
-
-        self._state.output_type = output_type
+        query = self._start_query(query, output_type)
         try:
-            self._assign_prompt_id()
-
-            # To ensure the cache is set properly if config is changed in between
-            if self._state.config.enable_cache and self._state.cache is None:
-                self._state.cache = Cache()
+            self._prepare_query()
 
             # Generate code
             code, additional_dependencies = self.generate_code(query)
 
+            # Reuse the result of the same code run on the same data
+            result_cache_key = self._get_result_cache_key(code)
+            cached_result = self._get_cached_result(result_cache_key)
+            if cached_result is not None:
+                self._state.logger.log("Using cached result.")
+                return cached_result
+
             # Execute code with retries
             result = self.execute_with_retries(code, additional_dependencies)
 
-            # Cache the result if caching is enabled
-            if self._state.config.enable_cache:
-                self._state.cache.set(
-                    self._state.cache.get_cache_key(self._state), code
+            # Cache the code that ran, which the error correction may have
+            # changed, and its result under its own key
+            executed_code = self._state.last_code_executed
+            if executed_code != code:
+                result_cache_key = self._get_result_cache_key(executed_code)
+
+            self._cache_response(query, executed_code, result_cache_key, result)
+
+            self._state.logger.log("Response Generated Successfully.")
+            # Generate and return the final response
+            return result
+
+        except Exception as e:
+            return self._handle_exception(e)
+
+    async def _aprocess_query(self, query: str, output_type: Optional[str] = None):
+        """Process a user query and return the result, without blocking the event loop."""
+        query = self._start_query(query, output_type)
+        try:
+            self._prepare_query()
+
+            # Generate code
+            code, additional_dependencies = await self.agenerate_code(query)
+
+            # Reuse the result of the same code run on the same data, the
+            # fingerprint of virtual dataframes requires a query to the source
+            loop = asyncio.get_running_loop()
+            result_cache_key = await loop.run_in_executor(
+                self._executor, self._get_result_cache_key, code
+            )
+            cached_result = self._get_cached_result(result_cache_key)
+            if cached_result is not None:
+                self._state.logger.log("Using cached result.")
+                return cached_result
+
+            # Execute code with retries
+            result = await self.aexecute_with_retries(code, additional_dependencies)
+
+            # Cache the code that ran, which the error correction may have
+            # changed, and its result under its own key
+            executed_code = self._state.last_code_executed
+            if executed_code != code:
+                result_cache_key = await loop.run_in_executor(
+                    self._executor, self._get_result_cache_key, executed_code
                 )
 
+            self._cache_response(query, executed_code, result_cache_key, result)
+
             self._state.logger.log("Response Generated Successfully.")
             # Generate and return the final response
             return result
@@ -330,21 +634,94 @@ class Agent:
         except Exception as e:
             return self._handle_exception(e)
 
+    def _start_query(self, query: str, output_type: Optional[str]) -> UserQuery:
+        query = UserQuery(query)
+        self._state.logger.log(f"Question: {query}")
+        self._state.logger.log(
+            f"Running PandasAI with {self._state.config.llm.type} LLM..."
+        )
+
+        self._state.output_type = output_type
+        self._cancel_event.clear()
+        return query
+
+    def _prepare_query(self):
+        self._assign_prompt_id()
+
+        # To ensure the cache is set properly if config is changed in between
+        if self._state.config.enable_cache and self._state.cache is None:
+            self._state.cache = self._state.get_cache_backend()
+
+    def _cache_response(
+        self,
+        query: UserQuery,
+        code: str,
+        result_cache_key: Optional[str],
+        result: Any,
+    ):
+        # Cache the result if caching is enabled
+        if self._state.config.enable_cache:
+            self._state.cache.set(self._state.cache.get_cache_key(self._state), code)
+            self._add_to_semantic_cache(str(query), code)
+
+        if result_cache_key is not None:
+            self._state.config.result_cache.set(result_cache_key, result.result)
+
+    def _get_semantic_cache_fingerprint(self) -> str:
+        """Return the fingerprint of the schema and options the code depends on."""
+        return "-".join(
+            [str(df.column_hash) for df in self._state.dfs]
+            + [str(self._state.config.direct_sql), str(self._state.output_type)]
+        )
+
+    def _get_semantically_cached_code(self, query: str) -> Optional[str]:
+        """
+        Return the code generated for a similar query if the semantic cache is
+        enabled. Follow-up queries are skipped as their meaning depends on the
+        previous messages of the conversation.
+        """
+        semantic_cache = self._state.config.semantic_cache
+        if semantic_cache is None or self._state.memory.count() > 1:
+            return None
+
+        return semantic_cache.get(query, self._get_semantic_cache_fingerprint())
+
+    def _add_to_semantic_cache(self, query: str, code: str):
+        semantic_cache = self._state.config.semantic_cache
+        if semantic_cache is None or self._state.memory.count() > 1:
+            return
+
+        semantic_cache.add(query, code, self._get_semantic_cache_fingerprint())
+
+    def _get_result_cache_key(self, code: str) -> Optional[str]:
+        result_cache = self._state.config.result_cache
+        if not self._state.config.enable_cache or result_cache is None:
+            return None
+
+        return result_cache.get_cache_key(code, self._state.dfs)
+
+    def _get_cached_result(self, result_cache_key: Optional[str]) -> Any:
+        if result_cache_key is None:
+            return None
+
+        result = self._state.config.result_cache.get(result_cache_key)
+        return self._response_parser.parse(result) if result is not None else None
+
     def _regenerate_code_after_error(self, code: str, error: Exception) -> str:
         """Generate a new code snippet based on the error."""
+        prompt = self._get_error_correction_prompt(code, error)
+        return self._code_generator.generate_code(prompt)
+
+    def _get_error_correction_prompt(self, code: str, error: Exception) -> BasePrompt:
         error_trace = traceback.format_exc()
         self._state.logger.log(f"Execution failed with error: {error_trace}")
 
         if isinstance(error, InvalidLLMOutputType):
-            prompt = get_correct_output_type_error_prompt(
-                self._state, code, error_trace
-            )
+            return get_correct_output_type_error_prompt(self._state, code, error_trace)
         elif self._state.config.direct_sql:
-            prompt = get_correct_error_prompt_for_sql(self._state, code, error_trace)
+            return get_correct_error_prompt_for_sql(self._state, code, error_trace)
         else:
-            prompt = get_correct_error_prompt(self._state, code, error_trace)
-
-        return self._code_generator.generate_code(prompt)
+            return get_correct_error_prompt(self._state, code, error_trace)
 
     def _configure(self):
         # Add project root path if save_charts_path is default
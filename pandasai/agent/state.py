@@ -2,7 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
-from pandasai.helpers.cache import Cache
+from pandasai.helpers.cache import BaseCache, Cache
 from pandasai.helpers.logger import Logger
 from pandasai.helpers.memory import Memory
 
@@ -23,7 +23,7 @@ class AgentState:
     dfs: List[Union[DataFrame, VirtualDataFrame]] = field(default_factory=list)
     _config: Union[Config, dict] = field(default_factory=dict)
     memory: Memory = field(default_factory=Memory)
-    cache: Optional[Cache] = None
+    cache: Optional[BaseCache] = None
     vectorstore: Optional[VectorStore] = None
     intermediate_values: Dict[str, Any] = field(default_factory=dict)
     logger: Optional[Logger] = None
@@ -39,7 +39,14 @@ class AgentState:
 
         # Initialize cache only if enabled in config
         if getattr(self.config, "enable_cache", False) and self.cache is None:
-            self.cache = Cache()
+            self.cache = self.get_cache_backend()
+
+    def get_cache_backend(self) -> BaseCache:
+        """Returns the cache backend set in the config, or the default one."""
+        if self.config.cache is not None:
+            return self.config.cache
+
+        return Cache()
 
     def reset_intermediate_values(self):
         """Resets the intermediate values dictionary."""
@@ -1,3 +1,4 @@
 from .code_executor import CodeExecutor
+from .sandbox import SandboxExecutor
 
-__all__ = ["CodeExecutor"]
+__all__ = ["CodeExecutor", "SandboxExecutor"]
@@ -1,10 +1,22 @@
 import ast
+import functools
+import types
 from pandasai.chat.code_execution.environment import get_environment
+from pandasai.constants import DEFAULT_COMPILED_CODE_CACHE_SIZE
 from pandasai.exceptions import NoResultFoundError
 
 from typing import Any, List
 
 
+@functools.lru_cache(maxsize=DEFAULT_COMPILED_CODE_CACHE_SIZE)
+def compile_code(code: str) -> types.CodeType:
+    """
+    Compile the code, once per process for the code run again, e.g. cached
+    code or code of the same query run by several agents.
+    """
+    return compile(code, "<string>", "exec")
+
+
 class CodeExecutor:
     """
     Handle the logic on how to handle different lines of code
@@ -26,14 +38,14 @@ class CodeExecutor:
         self._environment[key] = value
 
     def execute(self, code: str) -> dict:
-        exec(code, self._environment)
+        exec(compile_code(code), self._environment)
         return self._environment
 
     def execute_and_return_result(self, code: str) -> Any:
         """
         Executes the return updated environment
         """
-        exec(code, self._environment)
+        exec(compile_code(code), self._environment)
 
         # Get the result
         if "result" not in self._environment:
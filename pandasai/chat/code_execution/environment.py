@@ -3,13 +3,15 @@
 Source: Taken from pandas/compat/_optional.py
 """
 
+import functools
 import importlib
 import sys
 import warnings
-from typing import List, Union
+from typing import List, Tuple, Union
 
 from pandas.util.version import Version
 
+from .safe_libs.base_restricted_module import BaseRestrictedModule
 from .safe_libs.restricted_base64 import RestrictedBase64
 from .safe_libs.restricted_datetime import (
     RestrictedDatetime,
@@ -50,44 +52,71 @@ def get_environment(additional_deps: List[dict]) -> dict:
     """
     Returns the environment for the code to be executed.
 
+    The environment of each set of dependencies is built once per process,
+    each execution gets a copy of it, in which the code can set its variables
+    and the attributes of the restricted modules without affecting the other
+    executions.
+
     Returns (dict): A dictionary of environment variables
     """
-    env = {
-        **{
-            lib["alias"]: (
-                getattr(import_dependency(lib["module"]), lib["name"])
-                if hasattr(import_dependency(lib["module"]), lib["name"])
-                else import_dependency(lib["module"])
-            )
-            for lib in additional_deps
-        },
-        "__builtins__": {
-            **{builtin: __builtins__[builtin] for builtin in WHITELISTED_BUILTINS},
-            "__build_class__": __build_class__,
-            "__name__": "__main__",
-        },
+    base_env = _get_base_environment(
+        tuple((lib["module"], lib["name"], lib["alias"]) for lib in additional_deps)
+    )
+
+    env = dict(base_env)
+    env["__builtins__"] = dict(base_env["__builtins__"])
+    for name, value in base_env.items():
+        if isinstance(value, BaseRestrictedModule):
+            env[name] = _copy_restricted_module(value)
+
+    return env
+
+
+@functools.lru_cache(maxsize=128)
+def _get_base_environment(additional_deps: Tuple[Tuple[str, str, str], ...]) -> dict:
+    env = {}
+    for module_name, name, alias in additional_deps:
+        module = import_dependency(module_name)
+        env[alias] = getattr(module, name) if hasattr(module, name) else module
+
+    env["__builtins__"] = {
+        **{builtin: __builtins__[builtin] for builtin in WHITELISTED_BUILTINS},
+        "__build_class__": __build_class__,
+        "__name__": "__main__",
     }
 
     env["pd"] = RestrictedPandas()
     env["plt"] = RestrictedMatplotlib()
     env["np"] = RestrictedNumpy()
 
-    for lib in additional_deps:
-        if lib["name"] == "seaborn":
+    for _, name, _ in additional_deps:
+        if name == "seaborn":
             env["sns"] = RestrictedSeaborn()
 
-        if lib["name"] == "datetime":
+        if name == "datetime":
             env["datetime"] = RestrictedDatetime()
 
-        if lib["name"] == "json":
+        if name == "json":
             env["json"] = RestrictedJson()
 
-        if lib["name"] == "base64":
+        if name == "base64":
             env["base64"] = RestrictedBase64()
 
     return env
 
 
+def _copy_restricted_module(module: BaseRestrictedModule) -> BaseRestrictedModule:
+    """Copy a restricted module without wrapping the functions of the module again."""
+    copy = object.__new__(type(module))
+    copy.__dict__.update(
+        {
+            name: list(value) if isinstance(value, list) else value
+            for name, value in vars(module).items()
+        }
+    )
+    return copy
+
+
 def import_dependency(
     name: str,
     extra: str = "",
@@ -0,0 +1,619 @@
+import contextlib
+import functools
+import multiprocessing
+import pickle
+import queue
+import signal
+import threading
+import time
+import traceback
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from pandasai.constants import DEFAULT_SANDBOX_MAX_WORKERS, DEFAULT_SANDBOX_TIMEOUT
+from pandasai.exceptions import (
+    CodeExecutionCancelledError,
+    CodeExecutionTimeoutError,
+)
+
+from .code_executor import CodeExecutor
+
+# Number of seconds between two checks of the timeout and of the cancellation
+# of an execution
+POLL_INTERVAL = 0.05
+
+# Methods of the loader of a virtual dataframe that the code running in a
+# worker can call, run by the loader of the agent
+PROXIED_LOADER_METHODS = {"execute_query", "get_metadata", "get_fingerprint"}
+
+# Encoded dataframe: "arrow" and its Arrow IPC stream, or "pickle" and its
+# pickle for the dataframes Arrow can't represent
+EncodedDataFrame = Tuple[str, bytes]
+
+
+def _encode_dataframe(df: pd.DataFrame) -> EncodedDataFrame:
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # mixed types in an object column, or values Arrow can't represent
+        return "pickle", pickle.dumps(pd.DataFrame(df))
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return "arrow", sink.getvalue().to_pybytes()
+
+
+def _decode_dataframe(encoded: EncodedDataFrame) -> pd.DataFrame:
+    kind, data = encoded
+    if kind == "pickle":
+        return pickle.loads(data)
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all().to_pandas()
+
+
+def _encode_error(error: BaseException) -> BaseException:
+    """Return the error, or a RuntimeError describing it if it can't be pickled."""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+class _RemoteTraceback(Exception):
+    """Traceback of an error raised in a worker process, chained to the error."""
+
+    def __init__(self, tb: str):
+        self.tb = tb
+
+    def __str__(self) -> str:
+        return self.tb
+
+
+class _CPUTimeExceeded(BaseException):
+    """Raised in a worker process by the signal of its CPU time limit."""
+
+
+def _raise_cpu_time_exceeded(signum, frame):
+    raise _CPUTimeExceeded()
+
+
+@contextlib.contextmanager
+def _limit_cpu_time(cpu_time_limit: Optional[float]):
+    if resource is None or cpu_time_limit is None:
+        yield
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    limit = int(usage.ru_utime + usage.ru_stime + cpu_time_limit) + 1
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+
+    # only the soft limit is lowered, the process couldn't raise the hard
+    # limit again for its next executions
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _request(connection, *request) -> Any:
+    """Run a request in the agent process, which holds the connections."""
+    connection.send(("request", request))
+    kind, payload = connection.recv()
+    if kind == "error":
+        raise payload
+    if kind == "dataframe":
+        return _decode_dataframe(payload)
+    return payload
+
+
+class _LoaderProxy:
+    """Loader of a virtual dataframe in a worker, whose queries and metadata
+    requests are run by the loader of the dataframe in the agent process."""
+
+    def __init__(self, connection, index: int, head: pd.DataFrame):
+        self._connection = connection
+        self._index = index
+        self._head = head
+
+    def load_head(self) -> pd.DataFrame:
+        return self._head
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        return _request(self._connection, "loader", self._index, method, args, kwargs)
+
+    def execute_query(self, query: str, **kwargs) -> pd.DataFrame:
+        return self._call("execute_query", query, **kwargs)
+
+    def get_metadata(self) -> dict:
+        return self._call("get_metadata")
+
+    def get_fingerprint(self) -> str:
+        return self._call("get_fingerprint")
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach a segment created by the agent process, without registering it
+    with the resource tracker: the agent unlinks it, and the tracker shared
+    with the agent would otherwise forget the segment when the worker
+    unregisters it.
+    """
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+def _load_dataframes(
+    connection, shared_dfs: List[dict], live_segments: List[str], cache: dict
+) -> list:
+    from pandasai.dataframe.base import DataFrame
+    from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
+
+    # the segments unlinked by the agent are released
+    for name in set(cache) - set(live_segments):
+        shm, _ = cache.pop(name)
+        with contextlib.suppress(BufferError):
+            shm.close()
+
+    dfs = []
+    for index, shared_df in enumerate(shared_dfs):
+        segment = shared_df["segment"]
+        if segment["shm"] not in cache:
+            shm = _attach_shared_memory(segment["shm"])
+            data = shm.buf[: segment["size"]]
+            cache[segment["shm"]] = (shm, _decode_dataframe((segment["kind"], data)))
+
+        # with copy-on-write, the code modifies copies of the cached
+        # dataframes, which are created lazily
+        data = cache[segment["shm"]][1]
+        if shared_df["virtual"]:
+            # the data of the source is queried through the agent
+            df = VirtualDataFrame(
+                data_loader=_LoaderProxy(connection, index, data),
+                name=shared_df["name"],
+                description=shared_df["description"],
+                schema=shared_df["schema"],
+            )
+        else:
+            df = DataFrame(
+                data, name=shared_df["name"], description=shared_df["description"]
+            )
+        dfs.append(df)
+
+    return dfs
+
+
+def _run_worker(connection, memory_limit: Optional[int]):
+    """Main loop of a worker process, executing the code it receives."""
+    if resource is not None:
+        if memory_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        signal.signal(signal.SIGXCPU, _raise_cpu_time_exceeded)
+    # the dataframes given to the code share the data of the cached ones
+    pd.set_option("mode.copy_on_write", True)
+
+    cache = {}
+    while True:
+        try:
+            (
+                code,
+                additional_dependencies,
+                shared_dfs,
+                live_segments,
+                sql,
+                cpu_time_limit,
+            ) = connection.recv()
+        except EOFError:
+            return
+
+        try:
+            code_executor = CodeExecutor(additional_dependencies)
+            code_executor.add_to_env(
+                "dfs", _load_dataframes(connection, shared_dfs, live_segments, cache)
+            )
+            if sql:
+                code_executor.add_to_env(
+                    "execute_sql_query", functools.partial(_request, connection, "sql")
+                )
+
+            with _limit_cpu_time(cpu_time_limit):
+                result = code_executor.execute_and_return_result(code)
+
+            value = None
+            if isinstance(result, dict) and isinstance(
+                result.get("value"), pd.DataFrame
+            ):
+                # dataframes are sent back in the Arrow IPC format
+                result, value = (
+                    {**result, "value": None},
+                    _encode_dataframe(result["value"]),
+                )
+            connection.send(("result", (result, value)))
+        except _CPUTimeExceeded:
+            connection.send(
+                (
+                    "error",
+                    CodeExecutionTimeoutError(
+                        f"The code exceeded its CPU time limit of "
+                        f"{cpu_time_limit} seconds"
+                    ),
+                    "",
+                )
+            )
+        except Exception as e:
+            connection.send(("error", _encode_error(e), traceback.format_exc()))
+
+
+class _Worker:
+    def __init__(self, context, memory_limit: Optional[int]):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_run_worker, args=(child_connection, memory_limit), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+def _get_context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        # the workers are forked from a server process which imported
+        # pandasai once, not from the process running the agent
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+
+    return multiprocessing.get_context("spawn")
+
+
+def _shutdown(workers: List[_Worker], shared: Dict[str, tuple]):
+    for worker in workers:
+        worker.kill()
+    workers.clear()
+
+    for shm, _ in shared.values():
+        with contextlib.suppress(FileNotFoundError):
+            shm.unlink()
+    shared.clear()
+
+
+class SandboxExecutor:
+    """Execute the generated code in a pool of worker processes, so that code
+    running for too long or using too much memory can be stopped without
+    stopping the process of the agent.
+
+    The data of the dataframes is written once in shared memory, in the Arrow
+    IPC format, and read again by the workers only when it changes. The
+    results holding a dataframe are sent back in the Arrow IPC format as well,
+    and the charts are saved by the workers, which return their path.
+
+    The SQL queries of the code are run by the agent, which holds the
+    connections to the sources. Virtual dataframes are sent with their head
+    only, and query their source through their loader in the agent.
+
+    A worker running code past its timeout or cancelled is killed and
+    replaced by a new worker. The timeout includes the queries run by the
+    agent for the code, which are left to finish in the background.
+
+    Args:
+        max_workers (int): Number of worker processes, i.e. of executions run
+            concurrently.
+        timeout (float, optional): Number of seconds after which an execution
+            is stopped.
+        memory_limit (int, optional): Maximum memory, in bytes, of the address
+            space of a worker, beyond which the code raises a MemoryError.
+        cpu_time_limit (float, optional): Maximum CPU time, in seconds, used by
+            an execution.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_SANDBOX_MAX_WORKERS,
+        timeout: Optional[float] = DEFAULT_SANDBOX_TIMEOUT,
+        memory_limit: Optional[int] = None,
+        cpu_time_limit: Optional[float] = None,
+    ):
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required to execute the code in a sandbox. "
+                "Please install it with `pip install pyarrow`."
+            )
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.cpu_time_limit = cpu_time_limit
+        self._context = None
+        self._workers: List[_Worker] = []
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        # threads running the requests of the workers
+        self._requests: Optional[ThreadPoolExecutor] = None
+        # fingerprint of the data -> (shared memory, description of the
+        # segment sent to the workers)
+        self._shared: Dict[str, Tuple[shared_memory.SharedMemory, dict]] = {}
+        # dataframe id -> fingerprint of its shared data
+        self._shared_keys: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        weakref.finalize(self, _shutdown, self._workers, self._shared)
+
+    def execute(
+        self,
+        code: str,
+        dfs: List[pd.DataFrame],
+        additional_dependencies: Optional[List[dict]] = None,
+        execute_sql_query: Optional[Callable[[str], pd.DataFrame]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Any:
+        """
+        Execute the code in a worker and return its result.
+
+        Args:
+            code (str): Generated code, setting the `result` variable.
+            dfs (List[pd.DataFrame]): Dataframes exposed to the code as `dfs`.
+            additional_dependencies (List[dict], optional): Libraries exposed
+                to the code.
+            execute_sql_query (Callable, optional): Function exposed to the
+                code to run SQL queries.
+            cancel_event (threading.Event, optional): Event stopping the
+                execution when set.
+
+        Raises:
+            CodeExecutionTimeoutError: if the code exceeds its time limits.
+            CodeExecutionCancelledError: if the execution is cancelled.
+        """
+        shared_dfs = [self._share(df) for df in dfs]
+        worker = self._acquire(cancel_event)
+        with self._lock:
+            live_segments = [segment["shm"] for _, segment in self._shared.values()]
+
+        try:
+            worker.connection.send(
+                (
+                    code,
+                    additional_dependencies or [],
+                    shared_dfs,
+                    live_segments,
+                    execute_sql_query is not None,
+                    self.cpu_time_limit,
+                )
+            )
+            kind, *payload = self._wait(worker, dfs, execute_sql_query, cancel_event)
+        except BaseException:
+            # the worker is stopped in the middle of the execution
+            self._replace(worker)
+            raise
+
+        if kind == "error":
+            error, tb = payload
+            if isinstance(error, MemoryError):
+                # the memory of the worker may be left fragmented
+                self._replace(worker)
+            else:
+                self._idle.put(worker)
+            if tb:
+                raise error from _RemoteTraceback(tb)
+            raise error
+
+        self._idle.put(worker)
+        result, value = payload[0]
+        if value is not None:
+            result["value"] = _decode_dataframe(value)
+        return result
+
+    def _wait(
+        self,
+        worker: _Worker,
+        dfs: List[pd.DataFrame],
+        execute_sql_query: Optional[Callable[[str], pd.DataFrame]],
+        cancel_event: Optional[threading.Event],
+    ) -> tuple:
+        """Wait for the result of the worker, running its requests."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        request = None
+
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise CodeExecutionCancelledError("The code execution was cancelled")
+
+            timeout = POLL_INTERVAL
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    raise CodeExecutionTimeoutError(
+                        f"The code exceeded its time limit of {self.timeout} seconds"
+                    )
+
+            if request is not None:
+                # the request runs in another thread, so that the timeout and
+                # the cancellation are still checked
+                try:
+                    response = request.result(timeout)
+                except FutureTimeoutError:
+                    continue
+                worker.connection.send(response)
+                request = None
+                continue
+
+            if not worker.connection.poll(timeout):
+                continue
+
+            try:
+                message = worker.connection.recv()
+            except EOFError:
+                worker.process.join()
+                raise RuntimeError(
+                    "The process executing the code exited with code "
+                    f"{worker.process.exitcode}"
+                ) from None
+
+            if message[0] != "request":
+                return message
+
+            request = self._requests.submit(
+                self._run_request, message[1], dfs, execute_sql_query
+            )
+
+    @staticmethod
+    def _run_request(
+        request: tuple,
+        dfs: List[pd.DataFrame],
+        execute_sql_query: Optional[Callable[[str], pd.DataFrame]],
+    ) -> tuple:
+        """Run a SQL query, or a method of the loader of a virtual dataframe."""
+        kind, *args = request
+        try:
+            if kind == "sql":
+                value = execute_sql_query(*args)
+            else:
+                index, method, method_args, kwargs = args
+                if method not in PROXIED_LOADER_METHODS:
+                    raise ValueError(f"Unsupported loader method: {method}")
+                value = getattr(dfs[index]._loader, method)(*method_args, **kwargs)
+        except Exception as e:
+            return ("error", _encode_error(e))
+
+        if isinstance(value, pd.DataFrame):
+            return ("dataframe", _encode_dataframe(value))
+        return ("value", value)
+
+    def _share(self, df: pd.DataFrame) -> dict:
+        """
+        Write the data of the dataframe in shared memory, unless the same data
+        is already there, and return the description of the dataframe sent to
+        the workers.
+        """
+        from pandasai.dataframe.base import DataFrame
+        from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
+
+        # the segments are identified by a hash of all the in-memory rows, so
+        # any edit shares the data again. Virtual dataframes aren't loaded.
+        fingerprint = DataFrame.get_fingerprint(df)
+        key = id(df)
+
+        with self._lock:
+            shared = self._shared.get(fingerprint)
+
+        if shared is None:
+            kind, data = _encode_dataframe(df)
+            shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+            shm.buf[: len(data)] = data
+            shm.close()
+            segment = {"shm": shm.name, "size": len(data), "kind": kind}
+
+            with self._lock:
+                shared = self._shared.setdefault(fingerprint, (shm, segment))
+            if shared[0] is not shm:
+                # the same data was shared concurrently
+                with contextlib.suppress(FileNotFoundError):
+                    shm.unlink()
+
+        with self._lock:
+            previous = self._shared_keys.get(key)
+            if previous is None:
+                weakref.finalize(df, self._unshare, key)
+            self._shared_keys[key] = fingerprint
+        if previous is not None and previous != fingerprint:
+            self._release(previous)
+
+        virtual = isinstance(df, VirtualDataFrame)
+        return {
+            "segment": shared[1],
+            "name": getattr(df, "name", None),
+            "description": getattr(df, "description", None),
+            "virtual": virtual,
+            "schema": df.schema if virtual else None,
+        }
+
+    def _unshare(self, key: int):
+        with self._lock:
+            fingerprint = self._shared_keys.pop(key, None)
+        if fingerprint is not None:
+            self._release(fingerprint)
+
+    def _release(self, fingerprint: str):
+        """Free the shared data if no dataframe holds it anymore."""
+        with self._lock:
+            if fingerprint in self._shared_keys.values():
+                return
+            shared = self._shared.pop(fingerprint, None)
+        if shared is not None:
+            with contextlib.suppress(FileNotFoundError):
+                shared[0].unlink()
+
+    def start(self):
+        """Start the workers, which are otherwise started on the first execution."""
+        with self._lock:
+            if self._context is None:
+                self._context = _get_context()
+                self._requests = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="pandasai-sandbox"
+                )
+                for _ in range(self.max_workers):
+                    self._add_worker()
+
+    def _acquire(self, cancel_event: Optional[threading.Event]) -> _Worker:
+        self.start()
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise CodeExecutionCancelledError("The code execution was cancelled")
+            try:
+                worker = self._idle.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+            if worker.process.is_alive():
+                return worker
+            self._replace(worker)
+
+    def _add_worker(self):
+        worker = _Worker(self._context, self.memory_limit)
+        self._workers.append(worker)
+        self._idle.put(worker)
+
+    def _replace(self, worker: _Worker):
+        """Kill the worker and start a new one in its place."""
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+                self._add_worker()
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        with self._lock:
+            _shutdown(self._workers, self._shared)
+            self._shared_keys.clear()
+            self._context = None
+            self._idle = queue.Queue()
+            if self._requests is not None:
+                self._requests.shutdown(wait=False)
+                self._requests = None
@@ -2,10 +2,13 @@ from .code_cleaning import CodeCleaner
 from .base import CodeGenerator
 from .code_security import CodeSecurityChecker
 from .code_validation import CodeRequirementValidator
+from .code_walker import CodeHandler, walk_code
 
 __all__ = [
     "CodeCleaner",
     "CodeGenerator",
     "CodeSecurityChecker",
     "CodeRequirementValidator",
+    "CodeHandler",
+    "walk_code",
 ]
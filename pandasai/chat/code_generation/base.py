@@ -1,10 +1,19 @@
+import ast
+import hashlib
+import json
 import traceback
 
 from pandasai.agent.state import AgentState
 from pandasai.chat.prompts.base import BasePrompt
+from pandasai.constants import DEFAULT_CLEANED_CODE_CACHE_SIZE
+from pandasai.helpers.cache import InMemoryCache
 from .code_cleaning import CodeCleaner
 from .code_security import CodeSecurityChecker
 from .code_validation import CodeRequirementValidator
+from .code_walker import walk_code
+
+# Validated and cleaned code, shared by the agents of the process
+_cleaned_code_cache = InMemoryCache(max_entries=DEFAULT_CLEANED_CODE_CACHE_SIZE)
 
 
 class CodeGenerator:
@@ -33,34 +42,108 @@ class CodeGenerator:
 
             # Generate the code
             code = self._context.config.llm.generate_code(prompt, self._context)
-            self._context.last_code_generated = code
-            self._context.logger.log(f"Code Generated:\n{code}")
-
-            return self.validate_and_clean_code(code)
+            return self._process_generated_code(code)
 
         except Exception as e:
-            error_message = f"An error occurred during code generation: {e}"
-            stack_trace = traceback.format_exc()
+            self._log_generation_error(e)
+            raise e
+
+    async def agenerate_code(self, prompt: BasePrompt) -> tuple[str, list]:
+        """
+        Asynchronous version of `generate_code`, the LLM is called without
+        blocking the event loop.
+
+        Args:
+            prompt (BasePrompt): The prompt to guide code generation.
+
+        Returns:
+            str: The final cleaned and validated code.
+        """
+        try:
+            self._context.logger.log(f"Using Prompt: {prompt}")
 
-            self._context.logger.log(
-                error_message,
-            )
-            self._context.logger.log(f"Stack Trace:\n{stack_trace}")
+            # Generate the code
+            code = await self._context.config.llm.agenerate_code(prompt, self._context)
+            return self._process_generated_code(code)
 
+        except Exception as e:
+            self._log_generation_error(e)
             raise e
 
+    def _process_generated_code(self, code: str) -> tuple[str, list]:
+        self._context.last_code_generated = code
+        self._context.logger.log(f"Code Generated:\n{code}")
+
+        return self.validate_and_clean_code(code)
+
+    def _log_generation_error(self, error: Exception):
+        error_message = f"An error occurred during code generation: {error}"
+        stack_trace = traceback.format_exc()
+
+        self._context.logger.log(
+            error_message,
+        )
+        self._context.logger.log(f"Stack Trace:\n{stack_trace}")
+
     def validate_and_clean_code(self, code) -> tuple[str, list]:
-        # Check for malicious code
+        # The same code was already validated and cleaned for the same
+        # dataframes and configuration
+        cache_key = self._get_cleaned_code_cache_key(code)
+        cached = _cleaned_code_cache.get(cache_key)
+        if cached is not None:
+            self._context.logger.log("Using cached validated code.")
+            cleaned_code, additional_dependencies, saves_chart = json.loads(cached)
+            if saves_chart:
+                # the directory of the chart may have been removed since
+                self._code_cleaner._get_chart_path()
+            return cleaned_code, additional_dependencies
+
+        # Check the text of the code for malicious content
         self._context.logger.log("Checking for malicious code...")
-        self._code_security.check(code)
-        self._context.logger.log("Malicious code check passed.")
+        self._code_security.check_source(code)
 
-        # Validate code requirements
-        self._context.logger.log("Validating code requirements...")
-        if not self._code_validator.validate(code):
-            raise ValueError("Code validation failed due to unmet requirements.")
+        # Check, validate and clean the code in a single walk of its tree
+        self._context.logger.log("Validating and cleaning the generated code...")
+        cleaning = self._code_cleaner.get_handler()
+        tree = walk_code(
+            ast.parse(code),
+            [
+                self._code_security.get_handler(),
+                self._code_validator.get_handler(),
+                cleaning,
+            ],
+        )
         self._context.logger.log("Code validation successful.")
 
-        # Clean the code
-        self._context.logger.log("Cleaning the generated code...")
-        return self._code_cleaner.clean_code(code)
+        cleaned_code = self._code_cleaner.to_source(tree)
+        saves_chart = cleaning._chart_path is not None
+        _cleaned_code_cache.set(
+            cache_key,
+            json.dumps([cleaned_code, cleaning.additional_dependencies, saves_chart]),
+        )
+        return cleaned_code, cleaning.additional_dependencies
+
+    def _get_cleaned_code_cache_key(self, code: str) -> str:
+        """
+        Return the key of the cleaned code, derived from the code and from
+        everything its validation and cleaning depend on: the tables and
+        columns of the dataframes, and the configuration.
+        """
+        config = self._context.config
+        key = {
+            "code": code,
+            "dfs": [
+                [df.name, df.column_hash, len(df.get_head())]
+                for df in self._context.dfs
+            ],
+            "direct_sql": config.direct_sql,
+            "whitelisted_dependencies": config.custom_whitelisted_dependencies,
+            "charts": (
+                [config.save_charts_path, getattr(self._context, "prompt_id", None)]
+                if config.save_charts
+                else None
+            ),
+        }
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode()
+        ).hexdigest()
@@ -1,18 +1,21 @@
 import ast
-import copy
 import re
-from typing import Union
+from pathlib import Path
+from typing import Any, Optional, Union
 
 import astor
+import pandas as pd
 from pandasai.agent.state import AgentState
 
-from pandasai.chat.code_execution.code_executor import CodeExecutor
 from pandasai.helpers.path import find_project_root
 from pandasai.helpers.sql import extract_table_names
 
 from ...constants import WHITELISTED_LIBRARIES
 from ...exceptions import BadImportError, MaliciousQueryError
-from ...helpers.save_chart import add_save_chart
+from .code_walker import CodeHandler, walk_code
+
+# Files of the charts saved by the generated code
+CHART_FILE_REGEX = re.compile(r"[^'\"]*\.png")
 
 
 class CodeCleaner:
@@ -172,16 +175,13 @@ class CodeCleaner:
         return node
 
     def extract_fix_dataframe_redeclarations(
-        self,
-        node: ast.AST,
-        code_lines: list[str],
-        additional_deps: list[dict],
+        self, node: ast.AST, body: list[ast.stmt]
     ) -> ast.AST:
         """
         Checks if dataframe reclaration in the code like pd.DataFrame({...})
         Args:
             node (ast.AST): Code Node
-            code_lines (list[str]): List of code str line by line
+            body (list[ast.stmt]): Statements of the code before the node
 
         Returns:
             ast.AST: Updated Ast Node fixing redeclaration
@@ -190,17 +190,9 @@ class CodeCleaner:
             target_names, is_slice, target = self.get_target_names(node.targets)
 
             if target_names and self.check_is_df_declaration(node):
-                # Construct dataframe from node
-                code = "\n".join(code_lines)
-                code_executor = CodeExecutor(additional_deps)
-                code_executor.add_to_env("dfs", copy.deepcopy(self.context.dfs))
-                env = code_executor.execute(code)
-
-                df_generated = (
-                    env[target_names[0]][target.slice.value]
-                    if is_slice
-                    else env[target_names[0]]
-                )
+                df_generated = self._get_declared_dataframe(node.value, body)
+                if df_generated is None:
+                    return None
 
                 # check if exists in provided dfs
                 for index, df in enumerate(self.context.dfs):
@@ -221,12 +213,60 @@ class CodeCleaner:
                             targets=[target_var],
                             value=ast.Subscript(
                                 value=ast.Name(id="dfs", ctx=ast.Load()),
-                                slice=ast.Index(value=ast.Num(n=index)),
+                                slice=ast.Constant(value=index),
                                 ctx=ast.Load(),
                             ),
                         )
         return None
 
+    def _get_declared_dataframe(
+        self, call: ast.Call, body: list[ast.stmt]
+    ) -> Optional[pd.DataFrame]:
+        """
+        Build the dataframe declared by a `pd.DataFrame(...)` call from the
+        literal values of its arguments, without running the code. Return
+        None if an argument isn't a literal.
+        """
+        if any(keyword.arg is None for keyword in call.keywords):
+            return None
+
+        try:
+            args = [self._get_literal_value(arg, body) for arg in call.args]
+            kwargs = {
+                keyword.arg: self._get_literal_value(keyword.value, body)
+                for keyword in call.keywords
+            }
+            return pd.DataFrame(*args, **kwargs)
+        except Exception:
+            # not a literal, or not a valid dataframe
+            return None
+
+    @staticmethod
+    def _get_literal_value(node: ast.expr, body: list[ast.stmt]) -> Any:
+        """
+        Return the value of a literal, or of a variable last assigned a
+        literal by the statements before the declaration.
+        """
+        if isinstance(node, ast.Name):
+            for statement in reversed(body):
+                stored_names = {
+                    child.id
+                    for child in ast.walk(statement)
+                    if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store)
+                }
+                if node.id not in stored_names:
+                    continue
+                if not (
+                    isinstance(statement, ast.Assign)
+                    and len(statement.targets) == 1
+                    and isinstance(statement.targets[0], ast.Name)
+                ):
+                    raise ValueError(f"The value of '{node.id}' is unknown")
+                node = statement.value
+                break
+
+        return ast.literal_eval(node)
+
     def get_target_names(self, targets):
         target_names = []
         is_slice = False
@@ -253,66 +293,97 @@ class CodeCleaner:
             and value.func.attr == "DataFrame"
         )
 
-    def clean_code(self, code: str) -> tuple[str, list]:
+    class _CleaningHandler(CodeHandler):
         """
-        Clean the provided code by validating imports, handling SQL queries, and processing charts.
-
-        Args:
-            code (str): The code to clean.
-
-        Returns:
-            tuple: Cleaned code as a string and a list of additional dependencies.
+        Handler removing the imports and the definition of `execute_sql_query`,
+        validating the tables of the SQL queries, replacing the redeclarations
+        of the dataframes and the paths of the charts.
         """
-        code = self._handle_charts(code)
-        additional_dependencies = []
-        clean_code_lines = []
 
-        tree = ast.parse(code)
-        new_body = []
+        def __init__(self, cleaner: "CodeCleaner"):
+            self.cleaner = cleaner
+            self.additional_dependencies = []
+            self._chart_path = None
+
+        def visit_Constant(self, node: ast.Constant):
+            if isinstance(node.value, str):
+                node.value = self._replace_chart_path(node.value)
 
-        for node in tree.body:
+        def visit_JoinedStr(self, node: ast.JoinedStr):
+            # f"{name}.png" is a chart file too
+            last = node.values[-1] if node.values else None
+            if (
+                isinstance(last, ast.Constant)
+                and isinstance(last.value, str)
+                and CHART_FILE_REGEX.fullmatch(last.value)
+            ):
+                node.values = [ast.Constant(value=self._get_chart_path())]
+
+        def _replace_chart_path(self, value: str) -> str:
+            if CHART_FILE_REGEX.fullmatch(value):
+                value = "temp_chart.png"
+            if "temp_chart.png" in value:
+                value = value.replace("temp_chart.png", self._get_chart_path())
+            return value
+
+        def _get_chart_path(self) -> str:
+            if self._chart_path is None:
+                self._chart_path = self.cleaner._get_chart_path()
+            return self._chart_path
+
+        def visit_statement(
+            self, node: ast.stmt, body: list[ast.stmt]
+        ) -> Optional[ast.stmt]:
             if isinstance(node, (ast.Import, ast.ImportFrom)):
-                imported_lib = self._check_imports(node)
+                imported_lib = self.cleaner._check_imports(node)
                 if imported_lib:
-                    additional_dependencies.append(imported_lib)
-                continue
+                    self.additional_dependencies.append(imported_lib)
+                return None
 
-            if self._check_direct_sql_func_def_exists(node):
-                continue
+            if self.cleaner._check_direct_sql_func_def_exists(node):
+                return None
 
-            if self.context.config.direct_sql:
-                node = self._validate_and_make_table_name_case_sensitive(node)
+            if self.cleaner.context.config.direct_sql:
+                node = self.cleaner._validate_and_make_table_name_case_sensitive(node)
 
-            clean_code_lines.append(astor.to_source(node))
+            return self.cleaner.extract_fix_dataframe_redeclarations(node, body) or node
 
-            new_body.append(
-                self.extract_fix_dataframe_redeclarations(
-                    node, clean_code_lines, additional_dependencies
-                )
-                or node
-            )
+    def get_handler(self) -> CodeHandler:
+        """Return the handler cleaning the tree of the code."""
+        return self._CleaningHandler(self)
 
-        new_tree = ast.Module(body=new_body)
-        return (
-            astor.to_source(new_tree, pretty_source=lambda x: "".join(x)).strip(),
-            additional_dependencies,
-        )
+    def clean_code(self, code: str) -> tuple[str, list]:
+        """
+        Clean the provided code by validating imports, handling SQL queries, and processing charts.
 
-    def _handle_charts(self, code: str) -> str:
+        Args:
+            code (str): The code to clean.
+
+        Returns:
+            tuple: Cleaned code as a string and a list of additional dependencies.
         """
-        Handle chart-related code modifications.
+        handler = self.get_handler()
+        tree = walk_code(ast.parse(code), [handler])
+        return self.to_source(tree), handler.additional_dependencies
+
+    @staticmethod
+    def to_source(tree: ast.Module) -> str:
+        """Return the code of a cleaned tree."""
+        return astor.to_source(tree, pretty_source=lambda x: "".join(x)).strip()
+
+    def _get_chart_path(self) -> str:
+        """
+        Return the path where the chart of the query is saved, and create its
+        directory.
         """
-        code = re.sub(r"""(['"])([^'"]*\.png)\1""", r"\1temp_chart.png\1", code)
         if self.context.config.save_charts:
-            return add_save_chart(
-                code,
-                logger=self.context.logger,
-                file_name=str(self.context.prompt_id),
-                save_charts_path_str=self.context.config.save_charts_path,
-            )
-        return add_save_chart(
-            code,
-            logger=self.context.logger,
-            file_name="temp_chart",
-            save_charts_path_str=f"{find_project_root()}/exports/charts",
-        )
+            save_charts_path = Path(self.context.config.save_charts_path)
+            file_name = str(self.context.prompt_id)
+        else:
+            save_charts_path = Path(f"{find_project_root()}/exports/charts")
+            file_name = "temp_chart"
+
+        save_charts_path.mkdir(parents=True, exist_ok=True)
+        save_charts_file = save_charts_path / f"{file_name}.png"
+        self.context.logger.log(f"Saving charts to {save_charts_file}")
+        return save_charts_file.as_posix()
@@ -1,10 +1,11 @@
 import ast
 import re
-import astor
 from pandasai.agent.state import AgentState
 from pandasai.constants import RESTRICTED_LIBS
 from pandasai.exceptions import MaliciousCodeGenerated
 
+from .code_walker import CodeHandler, walk_code
+
 
 class CodeSecurityChecker:
     """
@@ -52,20 +53,64 @@ class CodeSecurityChecker:
             ".to_markdown",
             ".to_clipboard",
         ]
+        self._dangerous_modules_regex = re.compile(
+            "|".join(
+                r"\b" + re.escape(module) + r"\b" for module in self.dangerous_modules
+            )
+        )
 
-    def _is_malicious_code(self, code: str) -> bool:
+    class _SecurityHandler(CodeHandler):
+        """
+        Handler raising on the restricted imports, the access to restricted
+        modules and private attributes, and the use of restricted builtins or
+        of methods writing files.
         """
-        Check if the provided code contains malicious content.
 
-        Args:
-            code (str): The code to be checked.
+        def __init__(self, checker: "CodeSecurityChecker"):
+            self.checker = checker
 
-        Returns:
-            bool: True if malicious code is found, otherwise False.
-        """
-        tree = ast.parse(code)
+        def visit_Import(self, node: ast.Import):
+            for alias in node.names:
+                sub_module_names = alias.name.split(".")
+                if any(module in RESTRICTED_LIBS for module in sub_module_names):
+                    raise MaliciousCodeGenerated(
+                        f"Restricted library import detected: {alias.name}"
+                    )
+
+        def visit_ImportFrom(self, node: ast.ImportFrom):
+            sub_module_names = (node.module or "").split(".")
+            if any(module in RESTRICTED_LIBS for module in sub_module_names):
+                raise MaliciousCodeGenerated(
+                    f"Restricted library import detected: {node.module}"
+                )
+            if any(alias.name in RESTRICTED_LIBS for alias in node.names):
+                raise MaliciousCodeGenerated(
+                    "Restricted library import detected in 'from ... import ...'"
+                )
 
-        def check_restricted_access(node):
+        def visit_Attribute(self, node: ast.Attribute):
+            self._check_restricted_access(node)
+            if self.checker._is_unsafe_text("." + node.attr):
+                self._raise_unsafe()
+
+        def visit_Subscript(self, node: ast.Subscript):
+            self._check_restricted_access(node)
+
+        def visit_Constant(self, node: ast.Constant):
+            if isinstance(node.value, str) and self.checker._is_unsafe_text(node.value):
+                self._raise_unsafe()
+
+        def visit_AST(self, node: ast.AST):
+            # the names and the strings of every node
+            for _, value in ast.iter_fields(node):
+                values = value if isinstance(value, list) else [value]
+                if any(
+                    isinstance(value, str) and self.checker._is_jailbreak_text(value)
+                    for value in values
+                ):
+                    raise MaliciousCodeGenerated("Restricted builtins are used!")
+
+        def _check_restricted_access(self, node: ast.AST):
             """Check if the node accesses restricted modules or private attributes."""
             if isinstance(node, ast.Attribute):
                 attr_chain = []
@@ -85,59 +130,45 @@ class CodeSecurityChecker:
             elif isinstance(node, ast.Subscript) and isinstance(
                 node.value, ast.Attribute
             ):
-                check_restricted_access(node.value)
+                self._check_restricted_access(node.value)
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    sub_module_names = alias.name.split(".")
-                    if any(module in RESTRICTED_LIBS for module in sub_module_names):
-                        raise MaliciousCodeGenerated(
-                            f"Restricted library import detected: {alias.name}"
-                        )
-            elif isinstance(node, ast.ImportFrom):
-                sub_module_names = node.module.split(".")
-                if any(module in RESTRICTED_LIBS for module in sub_module_names):
-                    raise MaliciousCodeGenerated(
-                        f"Restricted library import detected: {node.module}"
-                    )
-                if any(alias.name in RESTRICTED_LIBS for alias in node.names):
-                    raise MaliciousCodeGenerated(
-                        "Restricted library import detected in 'from ... import ...'"
-                    )
-            elif isinstance(node, (ast.Attribute, ast.Subscript)):
-                check_restricted_access(node)
+        @staticmethod
+        def _raise_unsafe():
+            raise MaliciousCodeGenerated(
+                "The code is unsafe and can lead to I/O operations or other malicious operations that are not permitted!"
+            )
 
-        return any(
-            re.search(r"\b" + re.escape(module) + r"\b", code)
-            for module in self.dangerous_modules
-        )
+    def get_handler(self) -> CodeHandler:
+        """Return the handler checking the tree of the code."""
+        return self._SecurityHandler(self)
 
-    def _is_jailbreak(self, node: ast.stmt) -> bool:
+    def _is_malicious_code(self, code: str) -> bool:
         """
-        Check if the code node contains jailbreak methods.
+        Check if the text of the code refers to dangerous modules.
 
         Args:
-            node (ast.stmt): A code node to be checked.
+            code (str): The code to be checked.
 
         Returns:
-            bool: True if jailbreak methods are found, otherwise False.
+            bool: True if malicious code is found, otherwise False.
         """
-        node_str = ast.dump(node)
-        return any(builtin in node_str for builtin in self.dangerous_builtins)
+        return self._dangerous_modules_regex.search(code) is not None
 
-    def _is_unsafe(self, node: ast.stmt) -> bool:
-        """
-        Check if the code node contains unsafe operations.
+    def _is_jailbreak_text(self, text: str) -> bool:
+        return any(builtin in text for builtin in self.dangerous_builtins)
 
-        Args:
-            node (ast.stmt): A code node to be checked.
+    def _is_unsafe_text(self, text: str) -> bool:
+        return any(method in text for method in self.unsafe_methods)
 
-        Returns:
-            bool: True if unsafe operations are found, otherwise False.
+    def check_source(self, code: str) -> None:
         """
-        code = astor.to_source(node)
-        return any(method in code for method in self.unsafe_methods)
+        Check the text of the code, before it's parsed.
+
+        Raises:
+            MaliciousCodeGenerated: If the code refers to dangerous modules.
+        """
+        if self._is_malicious_code(code):
+            raise MaliciousCodeGenerated("Malicious code is generated!")
 
     def check(self, code: str) -> None:
         """
@@ -149,14 +180,5 @@ class CodeSecurityChecker:
         Raises:
             MaliciousCodeGenerated: If malicious or unsafe code is detected.
         """
-        if self._is_malicious_code(code):
-            raise MaliciousCodeGenerated("Malicious code is generated!")
-
-        tree = ast.parse(code)
-        for node in tree.body:
-            if self._is_jailbreak(node):
-                raise MaliciousCodeGenerated("Restricted builtins are used!")
-            if self._is_unsafe(node):
-                raise MaliciousCodeGenerated(
-                    "The code is unsafe and can lead to I/O operations or other malicious operations that are not permitted!"
-                )
+        self.check_source(code)
+        walk_code(ast.parse(code), [self.get_handler()])
@@ -3,18 +3,22 @@ import ast
 from pandasai.agent.state import AgentState
 from pandasai.exceptions import ExecuteSQLQueryNotUsed
 
+from .code_walker import CodeHandler, walk_code
+
 
 class CodeRequirementValidator:
     """
     Class to validate code requirements based on a pipeline context.
     """
 
-    class _FunctionCallVisitor(ast.NodeVisitor):
+    class _FunctionCallHandler(CodeHandler):
         """
-        AST visitor to collect all function calls in a given Python code.
+        Handler collecting all function calls in a given Python code, and
+        checking them once the whole code was visited.
         """
 
-        def __init__(self):
+        def __init__(self, context: AgentState):
+            self.context = context
             self.function_calls = []
 
         def visit_Call(self, node: ast.Call):
@@ -27,7 +31,16 @@ class CodeRequirementValidator:
                 node.func.value, ast.Name
             ):
                 self.function_calls.append(f"{node.func.value.id}.{node.func.attr}")
-            self.generic_visit(node)  # Continue visiting child nodes
+
+        def finalize(self, tree: ast.Module):
+            # Validate requirements
+            if (
+                self.context.config.direct_sql
+                and "execute_sql_query" not in self.function_calls
+            ):
+                raise ExecuteSQLQueryNotUsed(
+                    "The code must execute SQL queries using the `execute_sql_query` function, which is already defined!"
+                )
 
     def __init__(self, context: AgentState):
         """
@@ -52,20 +65,9 @@ class CodeRequirementValidator:
             ExecuteSQLQueryNotUsed: If the `direct_sql` configuration is enabled and
                                      `execute_sql_query` is not used in the code.
         """
-        # Parse the code into an AST
-        tree = ast.parse(code)
-
-        # Use the visitor to collect function calls
-        func_call_visitor = self._FunctionCallVisitor()
-        func_call_visitor.visit(tree)
-
-        # Validate requirements
-        if (
-            self.context.config.direct_sql
-            and "execute_sql_query" not in func_call_visitor.function_calls
-        ):
-            raise ExecuteSQLQueryNotUsed(
-                "The code must execute SQL queries using the `execute_sql_query` function, which is already defined!"
-            )
-
+        walk_code(ast.parse(code), [self.get_handler()])
         return True
+
+    def get_handler(self) -> CodeHandler:
+        """Return the handler validating the tree of the code."""
+        return self._FunctionCallHandler(self.context)
@@ -0,0 +1,79 @@
+import ast
+import functools
+from typing import Callable, List, Optional, Tuple
+
+
+class CodeHandler:
+    """
+    A pass over the syntax tree of the generated code.
+
+    The passes share a single parse of the code and a single walk of its
+    tree: the `visit_<NodeType>` methods of a handler are called on each node
+    of that type or of a subtype (`visit_expr` on every expression,
+    `visit_AST` on every node), then `visit_statement` is called on each
+    top-level statement, once all its nodes were visited.
+    """
+
+    def visit_statement(
+        self, node: ast.stmt, body: List[ast.stmt]
+    ) -> Optional[ast.stmt]:
+        """
+        Return the statement replacing a top-level statement, or None to
+        remove it.
+
+        Args:
+            node (ast.stmt): The statement.
+            body (List[ast.stmt]): The statements kept before it.
+        """
+        return node
+
+    def finalize(self, tree: ast.Module) -> None:
+        """Called once the whole tree was walked."""
+
+
+@functools.lru_cache(maxsize=None)
+def _get_visitors(handler_class: type, node_class: type) -> Tuple[str, ...]:
+    return tuple(
+        f"visit_{base.__name__}"
+        for base in node_class.__mro__
+        if hasattr(handler_class, f"visit_{base.__name__}")
+    )
+
+
+def walk_code(tree: ast.Module, handlers: List[CodeHandler]) -> ast.Module:
+    """
+    Walk the tree of the code once, running all the handlers on each node.
+
+    Returns:
+        ast.Module: The tree, with the top-level statements replaced or
+        removed by the handlers.
+    """
+    visitors_cache = {}
+
+    def get_visitors(node_class: type) -> List[Callable[[ast.AST], None]]:
+        if node_class not in visitors_cache:
+            visitors_cache[node_class] = [
+                getattr(handler, name)
+                for handler in handlers
+                for name in _get_visitors(type(handler), node_class)
+            ]
+        return visitors_cache[node_class]
+
+    body = []
+    for statement in tree.body:
+        for node in ast.walk(statement):
+            for visit in get_visitors(type(node)):
+                visit(node)
+
+        for handler in handlers:
+            statement = handler.visit_statement(statement, body)
+            if statement is None:
+                break
+        else:
+            body.append(statement)
+
+    tree.body = body
+    for handler in handlers:
+        handler.finalize(tree)
+
+    return tree
@@ -5,6 +5,11 @@ import os
 import pandasai.llm as llm
 from pandasai.llm.base import LLM
 
+from .chat.code_execution.sandbox import SandboxExecutor
+from .helpers.cache import BaseCache
+from .helpers.query_cache import QueryCache
+from .helpers.result_cache import ResultCache
+from .helpers.semantic_cache import SemanticCache
 from .helpers.path import find_closest
 
 from typing import Any, List, Optional, Dict, Union
@@ -18,15 +23,23 @@ class Config(BaseModel):
     verbose: bool = False
     enforce_privacy: bool = False
     enable_cache: bool = True
+    cache: Optional[BaseCache] = None
+    semantic_cache: Optional[SemanticCache] = None
+    result_cache: Optional[ResultCache] = None
+    query_cache: Optional[QueryCache] = None
     use_error_correction_framework: bool = True
     save_charts: bool = False
     save_charts_path: str = DEFAULT_CHART_DIRECTORY
     custom_whitelisted_dependencies: List[str] = Field(default_factory=list)
     max_retries: int = 3
+    sandbox: Optional[SandboxExecutor] = None
 
     llm: Optional[LLM] = None
     data_viz_library: Optional[str] = None
     direct_sql: bool = False
+    federated_queries: bool = False
+    max_result_rows: Optional[int] = None
+    max_result_bytes: Optional[int] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
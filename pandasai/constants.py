@@ -12,6 +12,67 @@ DEFAULT_CHART_DIRECTORY = "exports/charts"
 # Default directory for cache
 DEFAULT_CACHE_DIRECTORY = "cache"
 
+# Default maximum number of entries kept in the cache
+DEFAULT_CACHE_MAX_ENTRIES = 1000
+
+# Default minimum similarity for the semantic cache to reuse generated code
+DEFAULT_SEMANTIC_CACHE_THRESHOLD = 0.9
+
+# Default maximum size, in bytes, of the results kept in the result cache
+DEFAULT_RESULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+# Default maximum size, in bytes, of the query results kept in memory by the
+# query cache, and of the results it spills to disk
+DEFAULT_QUERY_CACHE_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_QUERY_CACHE_MAX_DISK_SIZE = 1024 * 1024 * 1024
+
+# Default number of seconds during which the fingerprint of a source is reused
+DEFAULT_QUERY_CACHE_FINGERPRINT_TTL = 300
+
+# Default number of queries of a batch processed concurrently
+DEFAULT_BATCH_MAX_CONCURRENCY = 8
+
+# Default number of datasets loaded concurrently by `load_many`
+DEFAULT_LOAD_MAX_WORKERS = 8
+
+# File caching the metadata of a virtualized dataset, next to its schema
+DEFAULT_METADATA_FILE = "metadata.json"
+
+# Default frequency at which the metadata of a virtualized dataset is refreshed
+DEFAULT_METADATA_REFRESH_FREQUENCY = "daily"
+
+# Expected number of rows read by the sample of a table used to pick its head
+DEFAULT_HEAD_SAMPLE_ROWS = 1000
+
+# File holding the state of the incremental materialization of a dataset
+DEFAULT_MATERIALIZATION_STATE_FILE = "materialization.json"
+
+# Default number of incremental files of a materialization before compacting it
+DEFAULT_COMPACTION_THRESHOLD = 10
+
+# Default maximum number of open connections to a data source
+DEFAULT_POOL_MAX_SIZE = 5
+
+# Default number of seconds after which an idle connection is closed
+DEFAULT_POOL_IDLE_TIMEOUT = 300
+
+# Default number of seconds to wait for a connection when all are in use
+DEFAULT_POOL_TIMEOUT = 30
+
+# Default number of rows of the chunks of a streamed query result
+DEFAULT_QUERY_CHUNK_SIZE = 10000
+
+# Default number of worker processes running the generated code in the sandbox
+DEFAULT_SANDBOX_MAX_WORKERS = 4
+
+# Default number of seconds after which the sandbox stops the generated code
+DEFAULT_SANDBOX_TIMEOUT = 60
+
+# Maximum number of generated codes kept compiled, and kept validated and
+# cleaned, by the process
+DEFAULT_COMPILED_CODE_CACHE_SIZE = 256
+DEFAULT_CLEANED_CODE_CACHE_SIZE = 256
+
 # Default permissions for files and directories
 DEFAULT_FILE_PERMISSIONS = 0o755
 
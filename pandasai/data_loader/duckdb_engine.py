@@ -0,0 +1,196 @@
+import os
+import tempfile
+import threading
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from pandasai.exceptions import MaliciousQueryError
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Functions of DuckDB reading each type of file source
+READ_FUNCTIONS = {
+    "csv": "read_csv_auto('{path}')",
+    "parquet": "read_parquet('{path}')",
+}
+
+
+def connect(memory_limit: Optional[str] = None) -> "duckdb.DuckDBPyConnection":
+    """
+    Open an in-memory DuckDB database spilling the intermediate results that
+    exceed `memory_limit` to a temporary directory.
+    """
+    if duckdb is None:
+        raise ImportError(
+            "duckdb is required to query csv and parquet datasets and to join "
+            "datasets of different sources. "
+            "Please install it with `pip install duckdb`."
+        )
+
+    config = {"temp_directory": os.path.join(tempfile.gettempdir(), "pandasai-duckdb")}
+    if memory_limit:
+        config["memory_limit"] = memory_limit
+
+    return duckdb.connect(config=config)
+
+
+def lock_down(
+    connection: "duckdb.DuckDBPyConnection", allowed_paths: Optional[List[str]] = None
+):
+    """
+    Restrict the queries of the database, once its relations are created, to
+    reading the files and directories of `allowed_paths`: they can't read or
+    write other files, attach databases, install extensions or change the
+    configuration of the database.
+    """
+    allowed_paths = [os.path.abspath(path) for path in allowed_paths or []]
+    files = [path for path in allowed_paths if not os.path.isdir(path)]
+    directories = [
+        os.path.join(path, "") for path in allowed_paths if os.path.isdir(path)
+    ]
+    if files:
+        connection.execute("SET allowed_paths = ?", [files])
+    if directories:
+        connection.execute("SET allowed_directories = ?", [directories])
+    connection.execute("SET enable_external_access = false")
+    connection.execute("SET lock_configuration = true")
+
+
+def check_select_query(query: str):
+    """
+    Check that the query is a single SELECT statement, parsed by DuckDB.
+
+    Raises:
+        MaliciousQueryError: if the query holds other statements, e.g. COPY,
+            ATTACH, INSTALL or SET.
+    """
+    try:
+        statements = duckdb.extract_statements(query)
+    except duckdb.Error as error:
+        raise MaliciousQueryError(f"Invalid SQL query: {error}") from error
+
+    if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+        raise MaliciousQueryError("Only SELECT queries are allowed.")
+
+
+def iter_result(
+    cursor: "duckdb.DuckDBPyConnection", chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """Yield the result of the query executed by a cursor by chunks of rows."""
+    if hasattr(cursor, "to_arrow_reader"):
+        reader = cursor.to_arrow_reader(chunk_size)
+    else:
+        reader = cursor.fetch_record_batch(chunk_size)
+
+    empty = True
+    for batch in reader:
+        empty = False
+        yield batch.to_pandas()
+    if empty:
+        yield reader.schema.empty_table().to_pandas()
+
+
+class DuckDBEngine:
+    """Embedded DuckDB database running the queries on the csv or parquet
+    file of a dataset in place, exposed as a view named after the dataset.
+
+    The files are scanned by DuckDB without being loaded in memory, and the
+    intermediate results of large aggregations, joins and sorts are spilled to
+    a temporary directory when they exceed `memory_limit`, so that queries on
+    files larger than the memory still run.
+
+    Only SELECT queries run, and they can't access other files than the one
+    of the dataset.
+
+    Args:
+        table_name (str): Name of the view of the file.
+        path (str): Path of the file, or of a directory of parquet files
+            partitioned in the hive style.
+        source_type (str): "csv" or "parquet".
+        memory_limit (str, optional): Maximum memory used by DuckDB, e.g.
+            "4GB". Defaults to 80% of the memory of the machine.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        path: str,
+        source_type: str,
+        memory_limit: Optional[str] = None,
+    ):
+        if duckdb is None:
+            raise ImportError(
+                "duckdb is required to virtualize csv and parquet datasets. "
+                "Please install it with `pip install duckdb`."
+            )
+        if source_type not in READ_FUNCTIONS:
+            raise ValueError(f"Unsupported file format: {source_type}")
+
+        self.table_name = table_name
+        self.path = path
+        self.source_type = source_type
+        self.memory_limit = memory_limit
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _get_connection(self) -> "duckdb.DuckDBPyConnection":
+        with self._lock:
+            if self._connection is None:
+                connection = connect(self.memory_limit)
+                connection.execute(
+                    f"CREATE VIEW {self._quote_identifier(self.table_name)} "
+                    f"AS SELECT * FROM {self.get_read_function()}"
+                )
+                # the view reads the file when it is queried
+                lock_down(connection, allowed_paths=[self.path])
+                self._connection = connection
+
+            # a cursor is a connection to the same database usable from
+            # another thread
+            return self._connection.cursor()
+
+    def get_read_function(self) -> str:
+        """Return the DuckDB table function reading the file."""
+        if self.source_type == "parquet" and os.path.isdir(self.path):
+            path = os.path.join(self.path, "**", "*.parquet")
+            return f"read_parquet('{self._escape(path)}', hive_partitioning = true)"
+
+        return READ_FUNCTIONS[self.source_type].format(path=self._escape(self.path))
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace("'", "''")
+
+    @staticmethod
+    def _quote_identifier(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def execute(self, query: str) -> pd.DataFrame:
+        """Execute the SELECT query and return its result."""
+        check_select_query(query)
+        cursor = self._get_connection()
+        try:
+            return cursor.execute(query).df()
+        finally:
+            cursor.close()
+
+    def stream(self, query: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Execute the SELECT query and yield its result by chunks of rows."""
+        check_select_query(query)
+        cursor = self._get_connection()
+        try:
+            cursor.execute(query)
+            yield from iter_result(cursor, chunk_size)
+        finally:
+            cursor.close()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
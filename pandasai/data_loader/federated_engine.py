@@ -0,0 +1,328 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import sqlglot
+from sqlglot import exp
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
+
+from ..constants import DEFAULT_QUERY_CHUNK_SIZE
+from .duckdb_engine import check_select_query, connect, iter_result, lock_down
+from .loader import limit_chunks
+from .query_builder import QueryBuilder
+
+if TYPE_CHECKING:
+    from pandasai.helpers.query_cache import QueryCache
+
+# Comparisons pushed down to the sources, with their operator and the
+# operator of the same comparison with its operands swapped
+PUSHDOWN_COMPARISONS = {
+    exp.EQ: ("=", "="),
+    exp.NEQ: ("!=", "!="),
+    exp.LT: ("<", ">"),
+    exp.LTE: ("<=", ">="),
+    exp.GT: (">", "<"),
+    exp.GTE: (">=", "<="),
+}
+
+# Filter of a scan, as in the `filters` of the QueryBuilder
+Filter = Tuple[str, str, Any]
+
+
+class FederatedQueryEngine:
+    """Run the SQL queries joining dataframes of different sources in an
+    embedded DuckDB database, in which each dataframe is a relation named
+    after it.
+
+    Each source evaluates what it can of a query:
+    - csv and parquet files are scanned in place by DuckDB, which pushes the
+      projection and the filters of the query down to the scan.
+    - the other sources run a query selecting only the columns used by the
+      query and the rows matching its comparisons of a column with
+      constants, e.g. `amount > 100` or `country IN ('FR', 'DE')`.
+    - local dataframes are registered as Arrow tables, scanned by DuckDB
+      without being copied.
+
+    Args:
+        dfs (List[pd.DataFrame]): Dataframes queried. The dataframes without
+            a name are named `df<index>`.
+        memory_limit (str, optional): Maximum memory used by DuckDB, e.g.
+            "4GB", beyond which the intermediate results are spilled to disk.
+    """
+
+    def __init__(self, dfs: List[pd.DataFrame], memory_limit: Optional[str] = None):
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required to join datasets of different sources. "
+                "Please install it with `pip install pyarrow`."
+            )
+
+        self.memory_limit = memory_limit
+        self._relations: Dict[str, pd.DataFrame] = {}
+        for index, df in enumerate(dfs):
+            name = getattr(df, "name", None) or f"df{index}"
+            self._relations[name.lower()] = df
+
+    def execute_sql_query(
+        self,
+        query: str,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        truncate: bool = False,
+        query_cache: Optional["QueryCache"] = None,
+    ) -> pd.DataFrame:
+        """
+        Execute the query and return its result.
+
+        Args:
+            query (str): SQL query, in the DuckDB dialect.
+            max_rows (int, optional): maximum number of rows of the result.
+            max_bytes (int, optional): maximum size of the result in memory.
+            truncate (bool): truncate the result to the limits instead of
+                raising an error.
+            query_cache (QueryCache, optional): cache of the results of the
+                queries run on the sources.
+
+        Raises:
+            MaliciousQueryError: if the query isn't a single SELECT statement.
+            QueryResultTooLargeError: if the result exceeds the limits and
+                `truncate` is False.
+        """
+        check_select_query(query)
+        connection = connect(self.memory_limit)
+        try:
+            allowed_paths = self._register_relations(connection, query, query_cache)
+            # the query can only read the files of the csv and parquet views
+            lock_down(connection, allowed_paths)
+            try:
+                cursor = connection.execute(query)
+            except Exception as e:
+                raise RuntimeError(f"Failed to execute federated query: {query}") from e
+
+            if max_rows is None and max_bytes is None:
+                return cursor.df()
+
+            chunks = iter_result(cursor, DEFAULT_QUERY_CHUNK_SIZE)
+            return pd.concat(
+                list(limit_chunks(chunks, query, max_rows, max_bytes, truncate)),
+                ignore_index=True,
+            )
+        finally:
+            connection.close()
+
+    def _register_relations(
+        self, connection, query: str, query_cache: Optional["QueryCache"]
+    ) -> List[str]:
+        """
+        Create the relations used by the query and return the paths of the
+        files read by their views.
+        """
+        scans = self._get_scans(query)
+        source_scans = {}
+        file_paths = []
+
+        for name, (columns, filters) in scans.items():
+            df = self._relations[name]
+            if not isinstance(df, VirtualDataFrame):
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                connection.register(name, table)
+            elif df.schema["source"]["type"] in ["csv", "parquet"]:
+                duckdb_engine = df._loader._get_duckdb_engine()
+                connection.execute(
+                    f'CREATE VIEW "{name}" AS SELECT * FROM '
+                    f"{duckdb_engine.get_read_function()}"
+                )
+                file_paths.append(duckdb_engine.path)
+            else:
+                source_scans[name] = QueryBuilder(
+                    df.schema, filters=filters or None, columns=columns
+                ).build_query()
+
+        if not source_scans:
+            return file_paths
+
+        def read_source(name: str) -> pd.DataFrame:
+            return self._relations[name].execute_sql_query(
+                source_scans[name], query_cache=query_cache
+            )
+
+        # the sources are read concurrently
+        with ThreadPoolExecutor(max_workers=len(source_scans)) as executor:
+            results = executor.map(read_source, source_scans)
+            for name, result in zip(source_scans, results):
+                connection.register(
+                    name, pa.Table.from_pandas(result, preserve_index=False)
+                )
+
+        return file_paths
+
+    def _get_scans(
+        self, query: str
+    ) -> Dict[str, Tuple[Optional[List[str]], List[Filter]]]:
+        """
+        Return the columns and the filters of the scan of each relation used
+        by the query.
+        """
+        try:
+            statements = [
+                statement
+                for statement in sqlglot.parse(query, read="duckdb")
+                if statement is not None
+            ]
+        except sqlglot.errors.SqlglotError:
+            # DuckDB reports the error, the relations named in the query
+            # are read in full
+            words = {word.lower() for word in re.findall(r"\w+", query)}
+            return {name: (None, []) for name in self._relations if name in words}
+
+        tables = [
+            table
+            for statement in statements
+            for table in statement.find_all(exp.Table)
+            if not table.args.get("db")
+        ]
+        identifiers = {
+            identifier.name.lower()
+            for statement in statements
+            for identifier in statement.find_all(exp.Identifier)
+        }
+        all_columns = any(
+            self._selects_all_columns(statement) for statement in statements
+        )
+
+        scans = {}
+        for name, df in self._relations.items():
+            references = [table for table in tables if table.name.lower() == name]
+            if not references:
+                continue
+
+            columns = None
+            if not all_columns:
+                # the names used by the query are a superset of its columns
+                columns = [
+                    column
+                    for column in df.columns
+                    if str(column).lower() in identifiers
+                ] or list(df.columns[:1])
+                if len(columns) == len(df.columns):
+                    columns = None
+
+            # the filters of a source used once are those of its query
+            filters = []
+            if isinstance(df, VirtualDataFrame) and len(references) == 1:
+                filters = self._get_filters(references[0], df)
+            scans[name] = (columns, filters)
+
+        return scans
+
+    @staticmethod
+    def _selects_all_columns(statement: exp.Expression) -> bool:
+        if any(
+            not isinstance(star.parent, exp.Count)
+            for star in statement.find_all(exp.Star)
+        ):
+            return True
+
+        return any(
+            str(join.args.get("method") or "").lower() == "natural"
+            for join in statement.find_all(exp.Join)
+        )
+
+    def _get_filters(self, table: exp.Table, df: pd.DataFrame) -> List[Filter]:
+        select = table.find_ancestor(exp.Select)
+        if select is None or not select.args.get("where"):
+            return []
+
+        table_names = {table.name.lower(), table.alias_or_name.lower()}
+        single_source = not select.args.get("joins")
+        # the computed columns can't be filtered in the query of the source
+        computed_columns = {
+            column["name"]
+            for column in df.schema.get("columns", [])
+            if "expression" in column
+        }
+        columns = {
+            str(column).lower(): column
+            for column in df.columns
+            if column not in computed_columns
+        }
+
+        filters = []
+        for condition in self._get_conjuncts(select.args["where"].this):
+            filter = self._get_filter(condition)
+            if filter is None:
+                continue
+
+            column, operator, value = filter
+            if column.table:
+                if column.table.lower() not in table_names:
+                    continue
+            elif not single_source:
+                continue
+
+            name = columns.get(column.name.lower())
+            if name is not None:
+                filters.append((name, operator, value))
+
+        return filters
+
+    def _get_conjuncts(self, condition: exp.Expression) -> List[exp.Expression]:
+        if isinstance(condition, exp.Paren):
+            return self._get_conjuncts(condition.this)
+        if isinstance(condition, exp.And):
+            return self._get_conjuncts(condition.this) + self._get_conjuncts(
+                condition.expression
+            )
+        return [condition]
+
+    def _get_filter(
+        self, condition: exp.Expression
+    ) -> Optional[Tuple[exp.Column, str, Any]]:
+        """
+        Return the column, operator and value of a comparison of a column
+        with constants, which is false for the NULL values of the column, so
+        that the rows it excludes from the scan of an outer join are
+        excluded from the result of the query as well.
+        """
+        if isinstance(condition, exp.Not) and isinstance(condition.this, exp.In):
+            filter = self._get_filter(condition.this)
+            return filter and (filter[0], "not in", filter[2])
+
+        if isinstance(condition, exp.In):
+            if not isinstance(condition.this, exp.Column) or condition.args.get(
+                "query"
+            ):
+                return None
+            values = [self._get_value(value) for value in condition.expressions]
+            if not values or any(value is None for value in values):
+                return None
+            return condition.this, "in", values
+
+        for comparison, (operator, swapped_operator) in PUSHDOWN_COMPARISONS.items():
+            if type(condition) is not comparison:
+                continue
+
+            left, right = condition.this, condition.expression
+            if isinstance(left, exp.Column) and self._get_value(right) is not None:
+                return left, operator, self._get_value(right)
+            if isinstance(right, exp.Column) and self._get_value(left) is not None:
+                return right, swapped_operator, self._get_value(left)
+
+        return None
+
+    @staticmethod
+    def _get_value(expression: exp.Expression) -> Any:
+        """Return the value of a constant, None for NULL and expressions."""
+        if isinstance(expression, (exp.Literal, exp.Boolean)):
+            return expression.to_py()
+        if isinstance(expression, exp.Neg) and isinstance(expression.this, exp.Literal):
+            if expression.this.is_number:
+                return -expression.this.to_py()
+        return None
@@ -1,5 +1,11 @@
+import asyncio
 import copy
+import dataclasses
+import functools
+import io
+import json
 import os
+import shutil
 import yaml
 import pandas as pd
 from datetime import datetime, timedelta
@@ -7,33 +13,166 @@ import hashlib
 
 from pandasai.dataframe.base import DataFrame
 from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
-from pandasai.exceptions import InvalidDataSourceType
+from pandasai.exceptions import InvalidDataSourceType, QueryResultTooLargeError
+from pandasai.helpers.cron import get_previous_cron_time
 from pandasai.helpers.path import find_project_root
 import importlib
-from typing import Any
-from .query_builder import QueryBuilder
-from ..constants import SUPPORTED_SOURCES
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional
+from .duckdb_engine import DuckDBEngine
+from .parquet import filter_dataframe, read_parquet, write_parquet
+from .query_builder import SQL_DIALECTS, QueryBuilder, has_range_stats
+from ..constants import (
+    DEFAULT_COMPACTION_THRESHOLD,
+    DEFAULT_MATERIALIZATION_STATE_FILE,
+    DEFAULT_METADATA_FILE,
+    DEFAULT_METADATA_REFRESH_FREQUENCY,
+    DEFAULT_QUERY_CHUNK_SIZE,
+    SUPPORTED_SOURCES,
+)
+
+if TYPE_CHECKING:
+    from pandasai.helpers.query_cache import QueryCache
+
+# Maximum age of the materialization or of the cached metadata of a dataset
+REFRESH_FREQUENCIES = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "monthly": timedelta(days=30),
+    "yearly": timedelta(days=365),
+}
+
+
+@dataclasses.dataclass
+class LoadResult:
+    """Outcome of the loading of a dataset by `load_many`."""
+
+    dataset_path: str
+    df: Optional[DataFrame] = None
+    error: Optional[Exception] = None
+    # number of seconds spent loading the dataset
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _format_limits(max_rows: Optional[int], max_bytes: Optional[int]) -> str:
+    limits = []
+    if max_rows is not None:
+        limits.append(f"{max_rows} rows")
+    if max_bytes is not None:
+        limits.append(f"{max_bytes} bytes")
+    return " and ".join(limits)
+
+
+def limit_chunks(
+    chunks: Iterator[pd.DataFrame],
+    query: str,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    truncate: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the chunks of the result of a query until it exceeds `max_rows` rows
+    or `max_bytes` bytes in memory.
+
+    Raises:
+        QueryResultTooLargeError: if the result exceeds the limits and
+            `truncate` is False.
+    """
+    rows_count = 0
+    size = 0
+
+    try:
+        for chunk in chunks:
+            chunk_bytes = int(chunk.memory_usage(index=False, deep=True).sum())
+            keep = len(chunk)
+
+            if max_rows is not None and rows_count + len(chunk) > max_rows:
+                keep = max_rows - rows_count
+            if max_bytes is not None and size + chunk_bytes > max_bytes:
+                bytes_per_row = chunk_bytes / max(len(chunk), 1)
+                keep = min(keep, int((max_bytes - size) // bytes_per_row))
+
+            if keep < len(chunk):
+                if not truncate:
+                    raise QueryResultTooLargeError(
+                        f"The result of the query exceeds the limit of "
+                        f"{_format_limits(max_rows, max_bytes)}, aggregate "
+                        f"or filter the data in the query: {query}"
+                    )
+                yield chunk.iloc[:keep]
+                return
+
+            rows_count += len(chunk)
+            size += chunk_bytes
+            yield chunk
+    finally:
+        # release the connection when the iteration is interrupted
+        chunks.close()
 
 
 class DatasetLoader:
     def __init__(self):
         self.schema = None
         self.dataset_path = None
-
-    def load(self, dataset_path: str, virtualized=False) -> DataFrame:
+        self._metadata: Optional[dict] = None
+        self._duckdb_engine: Optional[DuckDBEngine] = None
+
+    def load(
+        self,
+        dataset_path: str,
+        virtualized=False,
+        filters: Any = None,
+        columns: Optional[List[str]] = None,
+        params: Optional[dict] = None,
+    ) -> DataFrame:
+        """
+        Load the dataset.
+
+        Args:
+            dataset_path (str): Path in the format 'organization/dataset_name'.
+            virtualized (bool): Query the source lazily instead of loading it.
+            filters: Filters of the rows to load, either a pyarrow expression
+                or a list of `(column, op, value)` tuples as in
+                `pd.read_parquet`. They are pushed down to the scan of the
+                parquet files, skipping the partitions that don't match, or
+                to the query of the SQL sources.
+            columns (List[str], optional): Columns to load.
+            params (dict, optional): Values of the parameters of the `filters`
+                of the schema, overriding its `params`.
+        """
         self.dataset_path = dataset_path
         self._load_schema()
         self._validate_source_type()
         if not virtualized:
             cache_file = self._get_cache_file_path()
+            source_type = self.schema["source"]["type"]
 
-            if self._is_cache_valid(cache_file):
-                cache_format = self.schema["destination"]["format"]
-                return self._read_csv_or_parquet(cache_file, cache_format)
+            if params and (self._is_incremental() or source_type in ["csv", "parquet"]):
+                raise ValueError(
+                    "Parameters are only supported for SQL sources not "
+                    "materialized incrementally."
+                )
 
-            df = self._load_from_source()
-            df = self._apply_transformations(df)
-            self._cache_data(df, cache_file)
+            if self._is_incremental():
+                df = self._load_incrementally(cache_file)
+                df = filter_dataframe(df, filters, columns)
+            elif not params and self._is_cache_valid(cache_file):
+                cache_format = self.schema["destination"]["format"]
+                return self._read_csv_or_parquet(
+                    cache_file, cache_format, filters, columns
+                )
+            elif filters or columns or params:
+                # a part of the dataset is read, it can't be cached
+                df = self._load_from_source(filters, columns, params)
+                df = self._apply_transformations(df)
+            else:
+                df = self._load_from_source()
+                df = self._apply_transformations(df)
+                self._cache_data(df, cache_file)
 
             table_name = self.schema["source"].get("table", None) or self.schema["name"]
             table_description = self.schema.get("description", None)
@@ -47,11 +186,9 @@ class DatasetLoader:
             )
         else:
             # Initialize new dataset loader for virtualization
-            source_type = self.schema["source"]["type"]
-
-            if source_type in ["csv", "parquet"]:
+            if filters or columns:
                 raise ValueError(
-                    "Virtualization is not supported for CSV and Parquet files."
+                    "Filters and columns are not supported for virtualized datasets."
                 )
 
             data_loader = self.copy()
@@ -90,6 +227,10 @@ class DatasetLoader:
                 self._get_abs_dataset_path(), self.schema["destination"]["path"]
             )
 
+        if self.schema["destination"].get("partition_by"):
+            # a directory of partitions
+            return os.path.join(self._get_abs_dataset_path(), "data")
+
         file_extension = (
             "parquet" if self.schema["destination"]["format"] == "parquet" else "csv"
         )
@@ -99,15 +240,195 @@ class DatasetLoader:
         if not os.path.exists(cache_file):
             return False
 
-        file_mtime = datetime.fromtimestamp(os.path.getmtime(cache_file))
         update_frequency = self.schema.get("update_frequency", None)
+        if not update_frequency:
+            return False
+
+        refreshed_at = datetime.fromtimestamp(os.path.getmtime(cache_file))
+        if self._is_incremental():
+            state = self._read_materialization_state()
+            if state is None:
+                return False
+            refreshed_at = datetime.fromisoformat(state["refreshed_at"])
+
+        return refreshed_at > self._get_last_scheduled_refresh(update_frequency)
+
+    @staticmethod
+    def _get_last_scheduled_refresh(frequency: str) -> datetime:
+        """
+        Return the time of the last refresh scheduled by `frequency`, either
+        one of `REFRESH_FREQUENCIES` or a cron expression such as
+        `0 */6 * * *`.
+        """
+        now = datetime.now()
+        if frequency in REFRESH_FREQUENCIES:
+            return now - REFRESH_FREQUENCIES[frequency]
+
+        try:
+            return get_previous_cron_time(frequency, now)
+        except ValueError as e:
+            raise ValueError(f"Unsupported refresh frequency: {frequency}") from e
+
+    def _is_incremental(self) -> bool:
+        if not self.schema.get("destination", {}).get("incremental", False):
+            return False
+
+        if self.schema["source"]["type"] in ["csv", "parquet"]:
+            raise ValueError(
+                "Incremental materialization is not supported for CSV and "
+                "Parquet files."
+            )
+        if not self.schema["source"].get("update_column"):
+            raise ValueError(
+                "Incremental materialization requires the `update_column` of "
+                "the source."
+            )
+        if self.schema["destination"]["format"] != "parquet":
+            raise ValueError(
+                "Incremental materialization is only supported for the parquet "
+                "format."
+            )
+
+        return True
 
-        if update_frequency and update_frequency == "weekly":
-            return file_mtime > datetime.now() - timedelta(weeks=1)
+    def _load_incrementally(self, cache_file: str) -> pd.DataFrame:
+        """
+        Refresh the materialization of the dataset with the rows added or
+        updated in the source since the last refresh, i.e. whose
+        `update_column` is greater than the latest value seen so far.
+
+        The new rows are appended as a new parquet file next to the main
+        file, and the files are compacted into the main file once there are
+        `compaction_threshold` of them. The whole source is loaded the first
+        time, or when the schema changed.
+        """
+        if self._is_cache_valid(cache_file):
+            return self._read_materialization(cache_file)
+
+        update_column = self.schema["source"]["update_column"]
+        query_builder = QueryBuilder(self.schema)
+        state = self._read_materialization_state()
+
+        if (
+            state is None
+            or state.get("cursor") is None
+            or not os.path.exists(cache_file)
+        ):
+            df = self.execute_query(query_builder.build_query())
+            cursor = self._get_cursor(df, update_column)
+            df = self._apply_transformations(df)
+            self._cache_data(df, cache_file)
+            shutil.rmtree(self._get_increments_dir(cache_file), ignore_errors=True)
+            self._write_materialization_state(cursor)
+            return df
+
+        increment = self.execute_query(
+            query_builder.build_incremental_query(state["cursor"])
+        )
+        cursor = self._get_cursor(increment, update_column, state["cursor"])
+        if len(increment):
+            increment = self._apply_transformations(increment)
+            self._write_increment(increment, cache_file)
+        self._write_materialization_state(cursor)
+
+        compaction_threshold = self.schema["destination"].get(
+            "compaction_threshold", DEFAULT_COMPACTION_THRESHOLD
+        )
+        if len(self._get_increment_files(cache_file)) >= compaction_threshold:
+            return self._compact_materialization(cache_file)
+
+        return self._read_materialization(cache_file)
+
+    @staticmethod
+    def _get_cursor(df: pd.DataFrame, update_column: str, default: Any = None) -> Any:
+        if update_column not in df.columns:
+            raise ValueError(
+                f"The update column {update_column} must be one of the columns "
+                "of the dataset."
+            )
+        if df[update_column].isna().all():
+            return default
+
+        cursor = df[update_column].max()
+        if pd.api.types.is_integer(cursor):
+            return int(cursor)
+        if pd.api.types.is_float(cursor):
+            return float(cursor)
+        return str(cursor)
+
+    def _get_increments_dir(self, cache_file: str) -> str:
+        return f"{os.path.splitext(cache_file)[0]}_increments"
+
+    def _get_increment_files(self, cache_file: str) -> List[str]:
+        increments_dir = self._get_increments_dir(cache_file)
+        if not os.path.isdir(increments_dir):
+            return []
+
+        return [
+            os.path.join(increments_dir, file_name)
+            for file_name in sorted(os.listdir(increments_dir))
+            if file_name.endswith(".parquet")
+        ]
+
+    def _write_increment(self, df: pd.DataFrame, cache_file: str):
+        increments_dir = self._get_increments_dir(cache_file)
+        os.makedirs(increments_dir, exist_ok=True)
+
+        index = len(self._get_increment_files(cache_file)) + 1
+        increment_file = os.path.join(increments_dir, f"part-{index:05d}.parquet")
+        # write the file under a temporary name so that readers never see a
+        # partially written increment
+        df.to_parquet(f"{increment_file}.tmp", index=False)
+        os.replace(f"{increment_file}.tmp", increment_file)
+
+    def _read_materialization(self, cache_file: str) -> pd.DataFrame:
+        files = [cache_file] + self._get_increment_files(cache_file)
+        df = pd.concat([read_parquet(file) for file in files], ignore_index=True)
+
+        # keep the latest version of the rows updated since the last refresh
+        primary_key = self.schema["source"].get("primary_key")
+        if primary_key and len(files) > 1:
+            df = df.drop_duplicates(subset=primary_key, keep="last", ignore_index=True)
+
+        return df
 
-        return False
+    def _compact_materialization(self, cache_file: str) -> pd.DataFrame:
+        """Merge the incremental files of the materialization into its main file."""
+        df = self._read_materialization(cache_file)
+        self._cache_data(df, cache_file)
+        shutil.rmtree(self._get_increments_dir(cache_file), ignore_errors=True)
+        return df
+
+    def _get_materialization_state_file_path(self) -> str:
+        return os.path.join(
+            self._get_abs_dataset_path(), DEFAULT_MATERIALIZATION_STATE_FILE
+        )
 
-    def _get_loader_function(self, source_type: str):
+    def _read_materialization_state(self) -> Optional[dict]:
+        try:
+            with open(self._get_materialization_state_file_path(), "r") as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        # the materialization is reloaded when the source or the columns change
+        if state.get("schema_hash") != self._get_schema_hash():
+            return None
+
+        return state
+
+    def _write_materialization_state(self, cursor: Any):
+        state_file = self._get_materialization_state_file_path()
+        state = {
+            "schema_hash": self._get_schema_hash(),
+            "refreshed_at": datetime.now().isoformat(),
+            "cursor": cursor,
+        }
+        with open(f"{state_file}.tmp", "w") as file:
+            json.dump(state, file)
+        os.replace(f"{state_file}.tmp", state_file)
+
+    def _get_loader_function(self, source_type: str, prefix: str = "load_from"):
         """
         Get the loader function for a specified data source type.
         """
@@ -126,7 +447,7 @@ class DatasetLoader:
                     f"Unsupported data source type: {source_type}"
                 )
 
-            return getattr(module, f"load_from_{source_type}")
+            return getattr(module, f"{prefix}_{source_type}")
 
         except KeyError:
             raise InvalidDataSourceType(f"Unsupported data source type: {source_type}")
@@ -137,12 +458,22 @@ class DatasetLoader:
                 f"Please install the {SUPPORTED_SOURCES[source_type]} library."
             ) from e
 
-    def _read_csv_or_parquet(self, file_path: str, format: str) -> DataFrame:
+    def _read_csv_or_parquet(
+        self,
+        file_path: str,
+        format: str,
+        filters: Any = None,
+        columns: Optional[List[str]] = None,
+    ) -> DataFrame:
         table_name = self.schema["source"].get("table") or self.schema.get("name", None)
         table_description = self.schema.get("description", None)
         if format == "parquet":
+            if filters or columns or os.path.isdir(file_path):
+                df = read_parquet(file_path, filters, columns)
+            else:
+                df = pd.read_parquet(file_path)
             return DataFrame(
-                pd.read_parquet(file_path),
+                df,
                 schema=self.schema,
                 path=self.dataset_path,
                 name=table_name,
@@ -150,7 +481,7 @@ class DatasetLoader:
             )
         elif format == "csv":
             return DataFrame(
-                pd.read_csv(file_path),
+                filter_dataframe(pd.read_csv(file_path), filters, columns),
                 schema=self.schema,
                 path=self.dataset_path,
                 name=table_name,
@@ -159,23 +490,130 @@ class DatasetLoader:
         else:
             raise ValueError(f"Unsupported file format: {format}")
 
-    def _load_from_source(self) -> pd.DataFrame:
+    def _load_from_source(
+        self,
+        filters: Any = None,
+        columns: Optional[List[str]] = None,
+        params: Optional[dict] = None,
+    ) -> pd.DataFrame:
         source_type = self.schema["source"]["type"]
         if source_type in ["csv", "parquet"]:
-            filepath = os.path.join(
-                self._get_abs_dataset_path(),
-                self.schema["source"]["path"],
-            )
-            return self._read_csv_or_parquet(filepath, source_type)
+            filepath = self._get_source_file_path()
+            return self._read_csv_or_parquet(filepath, source_type, filters, columns)
 
-        query_builder = QueryBuilder(self.schema)
-        query = query_builder.build_query()
-        return self.execute_query(query)
+        if filters is None or isinstance(filters, list):
+            query_builder = QueryBuilder(self.schema, filters, columns, params)
+            return self.execute_query(query_builder.build_query())
+
+        # a pyarrow expression can't be translated to SQL
+        query_builder = QueryBuilder(self.schema, params=params)
+        df = self.execute_query(query_builder.build_query())
+        return filter_dataframe(df, filters, columns)
 
     def load_head(self) -> pd.DataFrame:
+        metadata = self.get_metadata()
+        return pd.read_json(
+            io.StringIO(json.dumps(metadata["head"])),
+            orient="table",
+            convert_dates=False,
+        )
+
+    def get_metadata(self) -> dict:
+        """
+        Return the metadata of the source: its row count, a sample of its rows
+        and the stats of its columns.
+
+        The metadata is cached in a file next to the schema and refreshed
+        when older than the `metadata_refresh_frequency` of the schema, so
+        opening a virtualized dataset doesn't scan the source every time.
+        """
+        if self._metadata is None:
+            self._metadata = self._read_metadata()
+
+        if self._metadata is None or not self._is_metadata_valid(self._metadata):
+            self._metadata = self.refresh_metadata()
+
+        return self._metadata
+
+    def refresh_metadata(self) -> dict:
+        """
+        Compute the metadata of the source and store it next to the schema.
+        """
         query_builder = QueryBuilder(self.schema)
-        query = query_builder.get_head_query()
-        return self.execute_query(query)
+        try:
+            stats = self.execute_query(query_builder.get_stats_query())
+        except Exception:
+            # e.g. a column the source can't aggregate, the metadata is then
+            # limited to the row count
+            stats = self.execute_query(query_builder.get_row_count())
+        stats = json.loads(stats.head(1).to_json(orient="values", date_format="iso"))[0]
+        rows_count = int(stats[0])
+
+        head = self.execute_query(query_builder.get_head_query(rows_count=rows_count))
+        if len(head) < min(5, rows_count):
+            # an unlucky sample of the blocks of the table
+            head = self.execute_query(query_builder.get_first_rows_query())
+
+        columns = {}
+        if len(stats) > 1:
+            values = iter(stats[1:])
+            for column in self.schema.get("columns", []):
+                column_stats = {"non_null_count": int(next(values))}
+                if has_range_stats(column):
+                    column_stats["min"] = next(values)
+                    column_stats["max"] = next(values)
+                columns[column["name"]] = column_stats
+
+        metadata = {
+            "schema_hash": self._get_schema_hash(),
+            "refreshed_at": datetime.now().isoformat(),
+            "rows_count": rows_count,
+            "head": json.loads(head.to_json(orient="table", index=False)),
+            "columns": columns,
+        }
+
+        # Round-trip through JSON so that the metadata is the same whether it
+        # was just refreshed or read from the file
+        metadata = json.loads(json.dumps(metadata, default=str))
+        try:
+            with open(self._get_metadata_file_path(), "w") as file:
+                json.dump(metadata, file)
+        except OSError:
+            # the metadata is still cached in memory for this loader
+            pass
+
+        return metadata
+
+    def _get_metadata_file_path(self) -> str:
+        return os.path.join(self._get_abs_dataset_path(), DEFAULT_METADATA_FILE)
+
+    def _read_metadata(self) -> Optional[dict]:
+        try:
+            with open(self._get_metadata_file_path(), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _is_metadata_valid(self, metadata: dict) -> bool:
+        if metadata.get("schema_hash") != self._get_schema_hash():
+            return False
+
+        frequency = self.schema.get(
+            "metadata_refresh_frequency", DEFAULT_METADATA_REFRESH_FREQUENCY
+        )
+        refreshed_at = datetime.fromisoformat(metadata["refreshed_at"])
+        return refreshed_at > self._get_last_scheduled_refresh(frequency)
+
+    def _get_schema_hash(self) -> str:
+        schema = {
+            "source": self.schema.get("source"),
+            "columns": self.schema.get("columns"),
+            "filters": self.schema.get("filters"),
+            "params": self.schema.get("params"),
+        }
+        return hashlib.sha256(
+            json.dumps(schema, sort_keys=True, default=str).encode()
+        ).hexdigest()
 
     def get_row_count(self) -> int:
         query_builder = QueryBuilder(self.schema)
@@ -183,7 +621,104 @@ class DatasetLoader:
         result = self.execute_query(query)
         return result.iloc[0, 0]
 
-    def execute_query(self, query: str) -> pd.DataFrame:
+    def get_fingerprint(self) -> str:
+        """
+        Return a fingerprint of the data in the source, based on its row count
+        and, if the schema declares an `update_column`, on its latest value.
+        The fingerprint of csv and parquet files is based on their size and
+        modification time instead, which doesn't require reading them.
+        """
+        if self.schema["source"].get("type") in ["csv", "parquet"]:
+            return self._get_files_fingerprint()
+
+        query_builder = QueryBuilder(self.schema)
+        query = query_builder.get_fingerprint_query()
+        result = self.execute_query(query)
+
+        metadata = {
+            "source": self.schema["source"].get("type"),
+            "table": query_builder._get_table_name(),
+            "values": result.iloc[0].tolist(),
+        }
+        return hashlib.sha256(
+            json.dumps(metadata, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def _get_files_fingerprint(self) -> str:
+        path = self._get_source_file_path()
+        files = [path]
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(directory, file_name)
+                for directory, _, file_names in os.walk(path)
+                for file_name in file_names
+            )
+
+        digest = hashlib.sha256()
+        for file in files:
+            stat = os.stat(file)
+            file_name = os.path.relpath(file, path)
+            digest.update(f"{file_name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
+    def _get_source_file_path(self) -> str:
+        return os.path.join(self._get_abs_dataset_path(), self.schema["source"]["path"])
+
+    def _get_duckdb_engine(self) -> DuckDBEngine:
+        if self._duckdb_engine is None:
+            source = self.schema["source"]
+            self._duckdb_engine = DuckDBEngine(
+                QueryBuilder(self.schema)._get_table_name(),
+                self._get_source_file_path(),
+                source["type"],
+                memory_limit=source.get("memory_limit"),
+            )
+
+        return self._duckdb_engine
+
+    def execute_query(
+        self,
+        query: str,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        truncate: bool = False,
+        query_cache: Optional["QueryCache"] = None,
+    ) -> pd.DataFrame:
+        """
+        Execute the query and return its result.
+
+        Args:
+            query (str): SQL query to execute.
+            max_rows (int, optional): maximum number of rows of the result.
+            max_bytes (int, optional): maximum size of the result in memory.
+            truncate (bool): truncate the result to the limits instead of
+                raising an error.
+            query_cache (QueryCache, optional): cache of the results of the
+                queries, reused while the fingerprint of the source is the
+                same.
+
+        Raises:
+            QueryResultTooLargeError: if the result exceeds the limits and
+                `truncate` is False.
+        """
+        if query_cache is not None:
+            return self._execute_cached_query(
+                query,
+                query_cache,
+                max_rows=max_rows,
+                max_bytes=max_bytes,
+                truncate=truncate,
+            )
+
+        if max_rows is not None or max_bytes is not None:
+            # stream the result to stop as soon as it exceeds the limits
+            chunks = list(
+                self.iter_query(
+                    query, max_rows=max_rows, max_bytes=max_bytes, truncate=truncate
+                )
+            )
+            return pd.concat(chunks, ignore_index=True)
+
         source = self.schema.get("source", {})
         source_type = source.get("type")
         connection_info = source.get("connection", {})
@@ -191,17 +726,111 @@ class DatasetLoader:
         if not source_type:
             raise ValueError("Source type is missing in the schema.")
 
-        load_function = self._get_loader_function(source_type)
+        if source_type in ["csv", "parquet"]:
+            # the files are queried in place
+            execute = functools.partial(self._get_duckdb_engine().execute, query)
+        else:
+            load_function = self._get_loader_function(source_type)
+            execute = functools.partial(load_function, connection_info, query)
 
         try:
-            return load_function(connection_info, query)
+            return execute()
         except Exception as e:
             raise RuntimeError(
                 f"Failed to execute query for source type '{source_type}' with query: {query}"
             ) from e
 
+    def _execute_cached_query(
+        self, query: str, query_cache: "QueryCache", **kwargs
+    ) -> pd.DataFrame:
+        source = self.schema.get("source", {})
+        try:
+            fingerprint = query_cache.get_fingerprint(source, self.get_fingerprint)
+        except RuntimeError:
+            # the freshness of a cached result can't be checked
+            return self.execute_query(query, **kwargs)
+
+        key = query_cache.get_cache_key(
+            query,
+            source,
+            fingerprint,
+            dialect=SQL_DIALECTS.get(source.get("type")),
+            **kwargs,
+        )
+        result = query_cache.get(key)
+        if result is None:
+            result = self.execute_query(query, **kwargs)
+            query_cache.set(key, result)
+
+        return result
+
+    def iter_query(
+        self,
+        query: str,
+        chunk_size: int = DEFAULT_QUERY_CHUNK_SIZE,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        truncate: bool = False,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Execute the query and yield its result by chunks of `chunk_size` rows,
+        fetched with server-side cursors where the source supports them, so
+        that large results are never fully loaded in memory.
+
+        Args:
+            query (str): SQL query to execute.
+            chunk_size (int): number of rows of each chunk.
+            max_rows (int, optional): maximum number of rows of the result.
+            max_bytes (int, optional): maximum size of the result in memory.
+            truncate (bool): stop at the limits instead of raising an error.
+
+        Raises:
+            QueryResultTooLargeError: if the result exceeds the limits and
+                `truncate` is False.
+        """
+        chunks = self._stream_query(query, chunk_size)
+        return limit_chunks(chunks, query, max_rows, max_bytes, truncate)
+
+    def _stream_query(self, query: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        source = self.schema.get("source", {})
+        source_type = source.get("type")
+        connection_info = source.get("connection", {})
+
+        if not source_type:
+            raise ValueError("Source type is missing in the schema.")
+
+        if source_type in ["csv", "parquet"]:
+            chunks = self._get_duckdb_engine().stream(query, chunk_size)
+        else:
+            try:
+                stream_function = self._get_loader_function(source_type, "stream_from")
+            except AttributeError:
+                # the connector can't stream, the result is loaded at once
+                result = self.execute_query(query)
+                for start in range(0, max(len(result), 1), chunk_size):
+                    yield result.iloc[start : start + chunk_size]
+                return
+            chunks = stream_function(connection_info, query, chunk_size)
+
+        try:
+            yield from chunks
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to execute query for source type '{source_type}' with query: {query}"
+            ) from e
+
+    async def aexecute_query(self, query: str, **kwargs) -> pd.DataFrame:
+        """Execute the query in a worker thread, without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.execute_query, query, **kwargs)
+        )
+
     def _apply_transformations(self, df: pd.DataFrame) -> pd.DataFrame:
         for transform in self.schema.get("transformations", []):
+            if transform["params"]["column"] not in df.columns:
+                # the column wasn't loaded
+                continue
             if transform["type"] == "anonymize":
                 df[transform["params"]["column"]] = df[
                     transform["params"]["column"]
@@ -223,9 +852,16 @@ class DatasetLoader:
             return value
 
     def _cache_data(self, df: pd.DataFrame, cache_file: str):
-        cache_format = self.schema["destination"]["format"]
+        destination = self.schema["destination"]
+        cache_format = destination["format"]
         if cache_format == "parquet":
-            df.to_parquet(cache_file, index=False)
+            write_parquet(
+                df,
+                cache_file,
+                partition_by=destination.get("partition_by"),
+                row_group_size=destination.get("row_group_size"),
+                index=False,
+            )
         elif cache_format == "csv":
             df.to_csv(cache_file, index=False)
         else:
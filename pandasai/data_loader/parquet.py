@@ -0,0 +1,180 @@
+import os
+import shutil
+import uuid
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    ds = None
+    pq = None
+
+# Dtypes of the partition columns restored when reading a partitioned dataset,
+# the other partition columns are read with the types inferred from the values
+PARTITION_DTYPES = [
+    "bool",
+    "int8",
+    "int16",
+    "int32",
+    "int64",
+    "uint8",
+    "uint16",
+    "uint32",
+    "uint64",
+    "float32",
+    "float64",
+]
+
+
+def _check_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required to read and write parquet datasets. "
+            "Please install it with `pip install pyarrow`."
+        )
+
+
+def _to_expression(filters: Any) -> Optional["ds.Expression"]:
+    """
+    Convert filters to a pyarrow expression. The filters are either a pyarrow
+    expression or, like the `filters` of `pd.read_parquet`, a list of
+    `(column, op, value)` tuples combined with AND, or a list of such lists
+    combined with OR.
+    """
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+
+    return pq.filters_to_expression(filters)
+
+
+def _get_hive_partitioning(path: str) -> Tuple["ds.Partitioning", List[str]]:
+    """
+    Return the hive partitioning of a directory, typed with the dtypes of the
+    partition columns recorded in the pandas metadata of the files rather
+    than inferred from their values, and the original order of the columns.
+    """
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    pandas_metadata = dataset.schema.pandas_metadata or {}
+    dtypes = {
+        column["name"]: column["numpy_type"]
+        for column in pandas_metadata.get("columns", [])
+        if column["name"] in dataset.schema.names
+    }
+
+    fields = []
+    for field in dataset.partitioning.schema:
+        dtype = dtypes.get(field.name)
+        if dtype == "object":
+            field = pa.field(field.name, pa.string())
+        elif dtype in PARTITION_DTYPES:
+            field = pa.field(field.name, pa.from_numpy_dtype(np.dtype(dtype)))
+        fields.append(field)
+
+    partitioning = ds.partitioning(pa.schema(fields), flavor="hive")
+    return partitioning, list(dtypes)
+
+
+def read_parquet(
+    path: str,
+    filters: Any = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read a parquet file, or a directory of parquet files partitioned in the
+    hive style (`column=value` directories).
+
+    The filters and the columns are pushed down to the scan: the partitions
+    not matching the filters are skipped, the row groups are pruned with
+    their statistics and only the requested columns are read.
+    """
+    _check_pyarrow()
+    partitioning, column_names = None, None
+    if os.path.isdir(path):
+        partitioning, column_names = _get_hive_partitioning(path)
+
+    dataset = ds.dataset(path, format="parquet", partitioning=partitioning)
+    table = dataset.to_table(columns=columns, filter=_to_expression(filters))
+    if columns is None and column_names:
+        # the partition columns are read last
+        table = table.select(column_names)
+
+    return table.to_pandas()
+
+
+def filter_dataframe(
+    df: pd.DataFrame,
+    filters: Any = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Apply the filters and the projection of `read_parquet` to a dataframe."""
+    if filters is None and columns is None:
+        return df
+
+    _check_pyarrow()
+    dataset = ds.dataset(pa.Table.from_pandas(df, preserve_index=False))
+    table = dataset.to_table(columns=columns, filter=_to_expression(filters))
+    return table.to_pandas()
+
+
+def write_parquet(
+    df: pd.DataFrame,
+    path: str,
+    partition_by: Optional[List[str]] = None,
+    row_group_size: Optional[int] = None,
+    index: Optional[bool] = None,
+):
+    """
+    Write a dataframe to a parquet file or, if `partition_by` is set, to a
+    directory of parquet files partitioned in the hive style by the values
+    of these columns.
+
+    The directory is written next to `path` and swapped in at the end, so
+    that readers never see a partially written dataset. The previous
+    dataset is only deleted once the new one is in place.
+
+    `index` is passed to `DataFrame.to_parquet`: by default the index is
+    stored unless it is a range index, which is stored as metadata.
+    """
+    if not partition_by:
+        options = {"row_group_size": row_group_size} if row_group_size else {}
+        df.to_parquet(path, index=index, **options)
+        return
+
+    _check_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=index)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    options = {"max_rows_per_group": row_group_size} if row_group_size else {}
+
+    ds.write_dataset(
+        table,
+        tmp_path,
+        format="parquet",
+        partitioning=partition_by,
+        partitioning_flavor="hive",
+        **options,
+    )
+
+    old_path = None
+    if os.path.exists(path):
+        old_path = f"{path}.{uuid.uuid4().hex}.old"
+        os.replace(path, old_path)
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        if old_path is not None:
+            os.replace(old_path, path)
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    if old_path is None:
+        return
+    if os.path.isdir(old_path):
+        shutil.rmtree(old_path, ignore_errors=True)
+    else:
+        os.remove(old_path)
@@ -1,25 +1,260 @@
-from typing import Dict, Any, List, Union
+import re
+from typing import Dict, Any, List, Optional, Union
+
+import sqlglot
+from sqlglot import exp
+
+from ..constants import DEFAULT_HEAD_SAMPLE_ROWS
+
+# Dialect in which the SQL of each type of source is rendered
+SQL_DIALECTS = {
+    "postgres": "postgres",
+    "cockroachdb": "postgres",
+    "mysql": "mysql",
+    "sqlite": "sqlite",
+    "snowflake": "snowflake",
+    "bigquery": "bigquery",
+    "databricks": "databricks",
+    "oracle": "oracle",
+    # csv and parquet files are queried with DuckDB
+    "csv": "duckdb",
+    "parquet": "duckdb",
+}
+
+# Operators of the filters, as in the `filters` of `pd.read_parquet`
+FILTER_OPERATORS = {
+    "=": exp.EQ,
+    "==": exp.EQ,
+    "!=": exp.NEQ,
+    "<": exp.LT,
+    "<=": exp.LTE,
+    ">": exp.GT,
+    ">=": exp.GTE,
+}
+
+# Function returning a random number, used to shuffle the rows of a table
+RANDOM_FUNCTIONS = {
+    "postgres": "RANDOM()",
+    "cockroachdb": "RANDOM()",
+    "sqlite": "RANDOM()",
+    "snowflake": "RANDOM()",
+    "csv": "RANDOM()",
+    "parquet": "RANDOM()",
+}
+# Sampling clauses reading only a fraction of the blocks of a table
+TABLESAMPLE_CLAUSES = {
+    "postgres": "TABLESAMPLE SYSTEM ({percent})",
+    "bigquery": "TABLESAMPLE SYSTEM ({percent} PERCENT)",
+    "snowflake": "TABLESAMPLE SYSTEM ({percent})",
+    "databricks": "TABLESAMPLE ({percent} PERCENT)",
+}
+
+# Predicates keeping a random fraction of the rows, for engines without
+# TABLESAMPLE. Unlike ORDER BY RANDOM(), they don't sort the table and the
+# scan stops as soon as enough rows are found.
+RANDOM_PREDICATES = {
+    "mysql": "RAND() < {fraction}",
+    "cockroachdb": "random() < {fraction}",
+    "sqlite": "ABS(RANDOM() % 1000000) < {fraction} * 1000000",
+    "csv": "random() < {fraction}",
+    "parquet": "random() < {fraction}",
+}
+
+# Names of the tables and columns, rendered as identifiers of the dialect of
+# the source, quoted if needed. A table name may be qualified by its schema
+# and catalog.
+IDENTIFIER_REGEX = re.compile(r"^\w[\w$ -]*$")
+
+# Types of the columns whose min and max are part of the metadata of a
+# dataset. Other types, e.g. strings, JSON or binary columns, are costly or
+# impossible to compare on some sources.
+RANGE_COLUMN_TYPES = {"integer", "float", "number", "datetime", "date", "timestamp"}
+
+
+def has_range_stats(column: Dict[str, Any]) -> bool:
+    """Return whether the min and max of the column are computed."""
+    return column.get("type") in RANGE_COLUMN_TYPES
 
 
 class QueryBuilder:
-    def __init__(self, schema: Dict[str, Any]):
+    """
+    Build the queries reading a dataset from its source.
+
+    The rows are restricted by the `filters` of the schema, SQL conditions
+    that may refer to parameters (`:name`) whose default values are the
+    `params` of the schema, and by the filters given when loading the dataset.
+    The parameters are bound as literals escaped for the dialect of the
+    source, never pasted in the SQL as is.
+
+    Args:
+        schema (dict): Schema of the dataset.
+        filters (list, optional): Filters of the rows, as a list of
+            `(column, op, value)` tuples combined with AND, or a list of such
+            lists combined with OR.
+        columns (List[str], optional): Columns to select, among the columns
+            of the schema.
+        params (dict, optional): Values of the parameters of the filters of
+            the schema, overriding its `params`.
+    """
+
+    def __init__(
+        self,
+        schema: Dict[str, Any],
+        filters: Optional[list] = None,
+        columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ):
         self.schema = schema
+        self.filters = filters
+        self.columns = columns
+        self.params = {**schema.get("params", {}), **(params or {})}
+        self.dialect = SQL_DIALECTS.get(schema.get("source", {}).get("type"))
 
     def build_query(self) -> str:
         columns = self._get_columns()
-        table_name = self.schema["source"]["table"]
+        table_name = self._get_table_sql(self.schema["source"]["table"])
         query = f"SELECT {columns} FROM {table_name}"
 
+        query += self._add_where()
         query += self._add_order_by()
         query += self._add_limit()
 
         return query
 
+    def build_incremental_query(self, cursor: Any) -> str:
+        """
+        Return the query selecting the rows of the table whose `update_column`
+        is greater than `cursor`, i.e. the rows added or updated since the
+        last refresh of the materialized dataset.
+        """
+        columns = self._get_columns()
+        table_name = self._get_table_sql(self.schema["source"]["table"])
+        update_column = self._get_identifier(self.schema["source"]["update_column"])
+        query = f"SELECT {columns} FROM {table_name}"
+
+        query += self._add_where(
+            exp.GT(this=exp.column(update_column), expression=exp.convert(cursor))
+        )
+        query += self._add_order_by()
+
+        return query
+
     def _get_columns(self) -> str:
-        if "columns" in self.schema:
-            return ", ".join([col["name"] for col in self.schema["columns"]])
-        else:
-            return "*"
+        if not self.schema.get("columns"):
+            if not self.columns:
+                return "*"
+            return ", ".join(self._get_column_sql(name) for name in self.columns)
+
+        return ", ".join(
+            self._format_column(column) for column in self._get_schema_columns()
+        )
+
+    def _get_schema_columns(self) -> List[dict]:
+        columns = self.schema.get("columns", [])
+        if not self.columns:
+            return columns
+
+        columns_by_name = {column["name"]: column for column in columns}
+        unknown_columns = set(self.columns) - set(columns_by_name)
+        if unknown_columns:
+            raise ValueError(
+                f"Columns not found in schema: {', '.join(sorted(unknown_columns))}"
+            )
+
+        return [columns_by_name[name] for name in self.columns]
+
+    def _get_identifier(self, name: str) -> exp.Identifier:
+        if not isinstance(name, str) or not IDENTIFIER_REGEX.match(name):
+            raise ValueError(f"Invalid identifier: {name!r}")
+
+        return exp.to_identifier(name)
+
+    def _get_column_sql(self, name: str) -> str:
+        return exp.column(self._get_identifier(name)).sql(dialect=self.dialect)
+
+    def _get_table_sql(self, name: str) -> str:
+        parts = name.split(".") if isinstance(name, str) else [name]
+        if len(parts) > 3:
+            raise ValueError(f"Invalid table name: {name!r}")
+
+        identifiers = [self._get_identifier(part) for part in reversed(parts)]
+        return exp.table_(*identifiers).sql(dialect=self.dialect)
+
+    def _get_column_expression(self, column: dict) -> str:
+        """Return the SQL of a column, or of the expression of a computed column."""
+        if "expression" not in column:
+            return self._get_column_sql(column["name"])
+
+        return sqlglot.parse_one(column["expression"], read=self.dialect).sql(
+            dialect=self.dialect
+        )
+
+    def _format_column(self, column: dict) -> str:
+        if "expression" not in column:
+            return self._get_column_sql(column["name"])
+
+        alias = self._get_identifier(column["name"]).sql(dialect=self.dialect)
+        return f"{self._get_column_expression(column)} AS {alias}"
+
+    def _get_conditions(self) -> List[exp.Expression]:
+        conditions = []
+        for condition in self.schema.get("filters", []):
+            expression = sqlglot.parse_one(condition, read=self.dialect)
+            missing_params = {
+                placeholder.name
+                for placeholder in expression.find_all(exp.Placeholder)
+                if placeholder.name not in self.params
+            }
+            if missing_params:
+                raise ValueError(
+                    f"Missing values of the parameters: "
+                    f"{', '.join(sorted(missing_params))}"
+                )
+            conditions.append(exp.replace_placeholders(expression, **self.params))
+
+        if self.filters:
+            conditions.append(self._get_filters_expression(self.filters))
+
+        return conditions
+
+    def _get_filters_expression(self, filters: list) -> exp.Expression:
+        # a list of tuples is a conjunction, a list of lists a disjunction
+        if all(isinstance(conjunction, list) for conjunction in filters):
+            return exp.or_(
+                *[self._get_filters_expression(conjunction) for conjunction in filters]
+            )
+
+        return exp.and_(*[self._get_filter_expression(*filter) for filter in filters])
+
+    def _get_filter_expression(
+        self, column: str, operator: str, value: Any
+    ) -> exp.Expression:
+        operator = operator.lower()
+        if operator in ("in", "not in"):
+            condition = exp.In(
+                this=exp.column(column),
+                expressions=[exp.convert(item) for item in value],
+            )
+            return exp.not_(condition) if operator == "not in" else condition
+
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+
+        return FILTER_OPERATORS[operator](
+            this=exp.column(column), expression=exp.convert(value)
+        )
+
+    def _add_where(self, *conditions: Union[str, exp.Expression]) -> str:
+        conditions = self._get_conditions() + [
+            sqlglot.parse_one(condition, read=self.dialect)
+            if isinstance(condition, str)
+            else condition
+            for condition in conditions
+        ]
+        if not conditions:
+            return ""
+
+        return f" WHERE {exp.and_(*conditions).sql(dialect=self.dialect)}"
 
     def _get_table_name(self):
         table_name = self.schema["source"].get("table", None) or self.schema["name"]
@@ -46,18 +281,83 @@ class QueryBuilder:
         limit = n if n else (self.schema["limit"] if "limit" in self.schema else "")
         return f" LIMIT {self.schema['limit']}" if limit else ""
 
-    def get_head_query(self, n=5):
+    def get_head_query(self, n=5, rows_count: Optional[int] = None):
+        """
+        Return the query selecting `n` random rows of the table.
+
+        If the row count of the table is known, the rows are picked from a
+        sample of about `DEFAULT_HEAD_SAMPLE_ROWS` rows read with the cheapest
+        sampling method of the engine, instead of sorting the whole table.
+        """
         source = self.schema.get("source", {})
         source_type = source.get("type")
 
-        table_name = self._get_table_name()
+        table_name = self._get_table_sql(self._get_table_name())
 
         columns = self._get_columns()
 
-        order_by = "RANDOM()" if source_type in {"sqlite", "postgres"} else "RAND()"
+        if rows_count and rows_count > DEFAULT_HEAD_SAMPLE_ROWS:
+            fraction = DEFAULT_HEAD_SAMPLE_ROWS / rows_count
+
+            if source_type in TABLESAMPLE_CLAUSES:
+                tablesample = TABLESAMPLE_CLAUSES[source_type].format(
+                    percent=f"{fraction * 100:.6g}"
+                )
+                return (
+                    f"SELECT {columns} FROM {table_name} {tablesample}"
+                    f"{self._add_where()} LIMIT {n}"
+                )
 
-        return f"SELECT {columns} FROM {table_name} ORDER BY {order_by} LIMIT {n}"
+            if source_type in RANDOM_PREDICATES:
+                predicate = RANDOM_PREDICATES[source_type].format(
+                    fraction=f"{fraction:.6g}"
+                )
+                return (
+                    f"SELECT {columns} FROM {table_name}"
+                    f"{self._add_where(predicate)} LIMIT {n}"
+                )
+
+        order_by = RANDOM_FUNCTIONS.get(source_type, "RAND()")
+
+        return (
+            f"SELECT {columns} FROM {table_name}"
+            f"{self._add_where()} ORDER BY {order_by} LIMIT {n}"
+        )
+
+    def get_first_rows_query(self, n=5):
+        table_name = self._get_table_sql(self._get_table_name())
+        columns = self._get_columns()
+        return f"SELECT {columns} FROM {table_name}{self._add_where()} LIMIT {n}"
 
     def get_row_count(self):
-        table_name = self._get_table_name()
-        return f"SELECT COUNT(*) FROM {table_name}"
+        table_name = self._get_table_sql(self._get_table_name())
+        return f"SELECT COUNT(*) FROM {table_name}{self._add_where()}"
+
+    def get_fingerprint_query(self):
+        table_name = self._get_table_sql(self._get_table_name())
+        update_column = self.schema["source"].get("update_column")
+
+        if update_column:
+            update_column = self._get_column_sql(update_column)
+            return (
+                f"SELECT COUNT(*), MAX({update_column}) FROM {table_name}"
+                f"{self._add_where()}"
+            )
+
+        return f"SELECT COUNT(*) FROM {table_name}{self._add_where()}"
+
+    def get_stats_query(self):
+        """
+        Return the query computing, in a single scan, the row count of the
+        table, the non-null count of each of its columns and the min and max
+        of its numeric and datetime columns.
+        """
+        table_name = self._get_table_sql(self._get_table_name())
+        aggregates = ["COUNT(*)"]
+        for column in self.schema.get("columns", []):
+            name = self._get_column_expression(column)
+            aggregates.append(f"COUNT({name})")
+            if has_range_stats(column):
+                aggregates.extend([f"MIN({name})", f"MAX({name})"])
+
+        return f"SELECT {', '.join(aggregates)} FROM {table_name}{self._add_where()}"
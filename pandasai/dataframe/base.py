@@ -4,7 +4,7 @@ import os
 import re
 from zipfile import ZipFile
 import pandas as pd
-from typing import TYPE_CHECKING, List, Optional, Union, Dict, ClassVar
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union, Dict, ClassVar
 
 import yaml
 
@@ -16,6 +16,7 @@ from pandasai.helpers.dataframe_serializer import (
     DataframeSerializer,
     DataframeSerializerType,
 )
+from pandasai.data_loader.parquet import write_parquet
 from pandasai.helpers.path import find_project_root
 from pandasai.helpers.request import get_pandaai_session
 
@@ -45,6 +46,9 @@ class DataFrame(pd.DataFrame):
         "_agent",
         "_column_hash",
     ]
+    # The memo of the serialization isn't shared with the derived dataframes
+    _internal_names: ClassVar[list] = pd.DataFrame._internal_names + ["_serialized"]
+    _internal_names_set: ClassVar[set] = set(_internal_names)
 
     def __init__(self, *args, **kwargs):
         self.name: Optional[str] = kwargs.pop("name", None)
@@ -60,6 +64,7 @@ class DataFrame(pd.DataFrame):
         self.config = Config()
         self._agent: Optional[Agent] = None
         self._column_hash = self._calculate_column_hash()
+        self._serialized: Dict[tuple, Tuple[str, str]] = {}
 
     def _validate_schema(self, schema: Optional[Dict]) -> None:
         """Validates the provided schema format."""
@@ -84,6 +89,32 @@ class DataFrame(pd.DataFrame):
     def column_hash(self):
         return self._column_hash
 
+    def get_fingerprint(self) -> str:
+        """
+        Return a fingerprint of the content of the DataFrame, which changes
+        when the data changes.
+
+        The shape, column names and dtypes are hashed along with every row,
+        so that any edit of the data changes the fingerprint.
+
+        Returns:
+            str: Fingerprint of the DataFrame
+        """
+        digest = hashlib.sha256(str(self.shape).encode())
+        digest.update(
+            ",".join(f"{name}:{dtype}" for name, dtype in self.dtypes.items()).encode()
+        )
+
+        data = pd.DataFrame(self, copy=False)
+        try:
+            row_hashes = pd.util.hash_pandas_object(data, index=True)
+        except TypeError:
+            # columns holding unhashable values, like lists or dicts
+            row_hashes = pd.util.hash_pandas_object(data.astype(str), index=True)
+        digest.update(row_hashes.values.tobytes())
+
+        return digest.hexdigest()
+
     def chat(self, prompt: str, config: Optional[Union[dict, Config]] = None) -> str:
         """
         Interact with the DataFrame using natural language.
@@ -141,7 +172,27 @@ class DataFrame(pd.DataFrame):
         Returns:
             str: Serialized string representation of the DataFrame
         """
-        return DataframeSerializer().serialize(
+        serializer_type = DataframeSerializerType.CSV
+        options = (
+            index,
+            is_direct_sql,
+            enforce_privacy,
+            serializer_type,
+            self.name,
+            self.description,
+        )
+
+        # Reuse the serialization of previous prompts while the data is unchanged
+        fingerprint = self._get_serialization_fingerprint()
+        if fingerprint is not None:
+            if getattr(self, "_serialized", None) is None:
+                # dataframes derived from another one start without a memo
+                self._serialized = {}
+            cached = self._serialized.get(options)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+
+        serialized = DataframeSerializer().serialize(
             self,
             extras={
                 "index": index,
@@ -149,13 +200,25 @@ class DataFrame(pd.DataFrame):
                 "is_direct_sql": is_direct_sql,
                 "enforce_privacy": enforce_privacy,
             },
-            type_=DataframeSerializerType.CSV,
+            type_=serializer_type,
         )
+        if fingerprint is not None:
+            self._serialized[options] = (fingerprint, serialized)
+        return serialized
+
+    def _get_serialization_fingerprint(self) -> Optional[str]:
+        """
+        Return a value changing with the serialized data, or None if it isn't
+        cheaper to get than serializing the data again, as for local data.
+        """
+        return None
 
     def get_head(self):
         return self.head()
 
-    def _create_yml_template(self, name, description, columns: List[dict]):
+    def _create_yml_template(
+        self, name, description, columns: List[dict], data_path: str = "data.parquet"
+    ):
         """
         Generate a .yml file with a simplified metadata template from a pandas DataFrame.
 
@@ -170,17 +233,37 @@ class DataFrame(pd.DataFrame):
             "name": name,
             "description": description,
             "columns": columns,
-            "source": {"type": "parquet", "path": "data.parquet"},
+            "source": {"type": "parquet", "path": data_path},
             "destination": {
                 "type": "local",
                 "format": "parquet",
-                "path": "data.parquet",
+                "path": data_path,
             },
         }
 
     def save(
-        self, path: str, name: str, description: str = None, columns: List[dict] = []
+        self,
+        path: str,
+        name: str,
+        description: str = None,
+        columns: List[dict] = [],
+        partition_by: Optional[List[str]] = None,
+        row_group_size: Optional[int] = None,
     ):
+        """
+        Save the dataframe as a parquet dataset in the `datasets` folder.
+
+        Args:
+            path (str): Path in the format 'organization/dataset_name'.
+            name (str): Name of the dataset.
+            description (str, optional): Description of the dataset.
+            columns (List[dict], optional): Description of the columns.
+            partition_by (List[str], optional): Columns whose values split the
+                data into a directory per partition, so that loading a subset
+                of the partitions only reads their files.
+            row_group_size (int, optional): Maximum number of rows of the row
+                groups of the parquet files.
+        """
         self.name = name
         self.description = description
 
@@ -213,11 +296,23 @@ class DataFrame(pd.DataFrame):
 
         os.makedirs(dataset_directory, exist_ok=True)
 
-        self.to_parquet(os.path.join(dataset_directory, "data.parquet"))
+        data_path = "data" if partition_by else "data.parquet"
+        write_parquet(
+            self,
+            os.path.join(dataset_directory, data_path),
+            partition_by=partition_by,
+            row_group_size=row_group_size,
+        )
 
         # create schema yaml file
         schema_path = os.path.join(dataset_directory, "schema.yaml")
-        self.schema = self._create_yml_template(self.name, self.description, columns)
+        self.schema = self._create_yml_template(
+            self.name, self.description, columns, data_path
+        )
+        if partition_by:
+            self.schema["destination"]["partition_by"] = partition_by
+        if row_group_size:
+            self.schema["destination"]["row_group_size"] = row_group_size
         # Save metadata to a .yml file
         with open(schema_path, "w") as yml_file:
             yaml.dump(self.schema, yml_file, sort_keys=False)
@@ -235,6 +330,8 @@ class DataFrame(pd.DataFrame):
         }
 
         dataset_directory = os.path.join(find_project_root(), "datasets", self.path)
+        if self.schema and self.schema.get("destination", {}).get("partition_by"):
+            raise ValueError("Pushing partitioned datasets is not supported yet.")
 
         headers = {"accept": "application/json", "x-authorization": f"Bearer {api_key}"}
 
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, ClassVar, Iterator
 import pandas as pd
 from pandasai.dataframe.base import DataFrame
 
@@ -15,6 +15,7 @@ class VirtualDataFrame(DataFrame):
         "name",
         "description",
         "schema",
+        "path",
         "config",
         "_agent",
         "_column_hash",
@@ -35,7 +36,29 @@ class VirtualDataFrame(DataFrame):
 
     @property
     def rows_count(self) -> int:
-        return self._loader.get_row_count()
+        return self._loader.get_metadata()["rows_count"]
 
-    def execute_sql_query(self, query: str) -> pd.DataFrame:
-        return self._loader.execute_query(query)
+    @property
+    def column_stats(self) -> dict:
+        """Non-null count, min and max of the columns declared in the schema."""
+        return self._loader.get_metadata()["columns"]
+
+    def _get_serialization_fingerprint(self) -> str:
+        # The serialization only depends on the cached metadata of the source
+        return self._loader.get_metadata()["refreshed_at"]
+
+    def get_fingerprint(self, *args, **kwargs) -> str:
+        """
+        Return a fingerprint of the data in the source, computed from its
+        metadata rather than from the data itself.
+        """
+        return self._loader.get_fingerprint()
+
+    def execute_sql_query(self, query: str, **kwargs) -> pd.DataFrame:
+        return self._loader.execute_query(query, **kwargs)
+
+    async def aexecute_sql_query(self, query: str, **kwargs) -> pd.DataFrame:
+        return await self._loader.aexecute_query(query, **kwargs)
+
+    def iter_sql_query(self, query: str, **kwargs) -> Iterator[pd.DataFrame]:
+        return self._loader.iter_query(query, **kwargs)
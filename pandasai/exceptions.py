@@ -273,3 +273,27 @@ class DatasetNotFound(Exception):
     Args:
         Exception (Exception): DatasetNotFound
     """
+
+
+class QueryResultTooLargeError(Exception):
+    """
+    Raise error if the result of a query exceeds the configured limits
+    Args:
+        Exception (Exception): QueryResultTooLargeError
+    """
+
+
+class CodeExecutionTimeoutError(Exception):
+    """
+    Raise error if the generated code exceeds its time limit
+    Args:
+        Exception (Exception): CodeExecutionTimeoutError
+    """
+
+
+class CodeExecutionCancelledError(Exception):
+    """
+    Raise error if the execution of the generated code is cancelled
+    Args:
+        Exception (Exception): CodeExecutionCancelledError
+    """
@@ -1,57 +1,89 @@
 import glob
+import hashlib
+import json
 import os
-from typing import Any
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 
 try:
     import duckdb
 except ImportError:
     duckdb = None
 
-from ..constants import CACHE_TOKEN, DEFAULT_FILE_PERMISSIONS
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from ..constants import (
+    CACHE_TOKEN,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_FILE_PERMISSIONS,
+)
 from .path import find_project_root
 
 
-class Cache:
-    """Cache class for caching queries. It is used to cache queries
-    to save time and money.
+def _get_cache_dir(abs_path: Optional[str] = None) -> str:
+    # Define cache directory and create directory if it does not exist
+    if abs_path:
+        cache_dir = abs_path
+    else:
+        try:
+            cache_dir = os.path.join(find_project_root(), "cache")
+        except ValueError:
+            cache_dir = os.path.join(os.getcwd(), "cache")
 
-    Args:
-        filename (str): filename to store the cache.
-    """
+    os.makedirs(cache_dir, mode=DEFAULT_FILE_PERMISSIONS, exist_ok=True)
+    return cache_dir
 
-    def __init__(self, filename="cache_db_0.11", abs_path=None):
-        # Define cache directory and create directory if it does not exist
-        if abs_path:
-            cache_dir = abs_path
-        else:
-            try:
-                cache_dir = os.path.join(find_project_root(), "cache")
-            except ValueError:
-                cache_dir = os.path.join(os.getcwd(), "cache")
 
-        os.makedirs(cache_dir, mode=DEFAULT_FILE_PERMISSIONS, exist_ok=True)
+class BaseCache(ABC):
+    """Interface for the cache backends used to store generated code.
 
-        self.filepath = os.path.join(cache_dir, f"{filename}.db")
-        self.connection = duckdb.connect(self.filepath)
-        self.connection.execute(
-            "CREATE TABLE IF NOT EXISTS cache (key STRING, value STRING)"
-        )
+    Args:
+        max_entries (int, optional): maximum number of entries to keep, the
+            least recently used entries are evicted first. `None` disables
+            the cap.
+        ttl (float, optional): default time to live of an entry, in seconds.
+            `None` means entries never expire.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def versioned_key(self, key: str) -> str:
         return f"{CACHE_TOKEN}-{key}"
 
-    def set(self, key: str, value: str) -> None:
+    def _get_expiry(self, now: float, ttl: Optional[float]) -> Optional[float]:
+        ttl = ttl if ttl is not None else self.ttl
+        return now + ttl if ttl is not None else None
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
         """Set a key value pair in the cache.
 
         Args:
             key (str): key to store the value.
             value (str): value to store in the cache.
+            ttl (float, optional): time to live of the entry in seconds,
+                defaults to the ttl of the cache.
         """
-        self.connection.execute(
-            "INSERT INTO cache VALUES (?, ?)", [self.versioned_key(key), value]
-        )
+        raise NotImplementedError("set method must be implemented by subclass.")
 
-    def get(self, key: str) -> str:
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
         """Get a value from the cache.
 
         Args:
@@ -60,46 +92,430 @@ class Cache:
         Returns:
             str: value from the cache.
         """
-        result = self.connection.execute(
-            "SELECT value FROM cache WHERE key=?", [self.versioned_key(key)]
-        )
-        return row[0] if (row := result.fetchone()) else None
+        raise NotImplementedError("get method must be implemented by subclass.")
 
+    @abstractmethod
     def delete(self, key: str) -> None:
         """Delete a key value pair from the cache.
 
         Args:
             key (str): key to delete the value from the cache.
         """
+        raise NotImplementedError("delete method must be implemented by subclass.")
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Clean the cache."""
+        raise NotImplementedError("clear method must be implemented by subclass.")
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError("__len__ method must be implemented by subclass.")
+
+    def close(self) -> None:
+        """Close the cache."""
+
+    def destroy(self) -> None:
+        """Destroy the cache."""
+        self.clear()
+        self.close()
+
+    def stats(self) -> dict:
+        """Return the hit, miss and eviction counters of the cache."""
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get_cache_key_components(self, context: Any) -> dict:
+        """
+        Return the raw values the cache key of the current conversation is
+        derived from. Useful for debugging cache misses.
+
+        Returns:
+            dict: The components of the cache key
+        """
+        llm = context.config.llm
+        return {
+            "conversation": context.memory.get_conversation(),
+            # make the cache key unique for each combination of dfs
+            "dfs": [str(df.column_hash) for df in context.dfs],
+            "llm_type": llm.type if llm is not None else None,
+            "llm_model": getattr(llm, "model", None),
+            "direct_sql": context.config.direct_sql,
+            "output_type": context.output_type,
+        }
+
+    def get_cache_key(self, context: Any) -> str:
+        """
+        Return the cache key for the current conversation. The key is a
+        fixed-width digest, so its size doesn't depend on the conversation
+        length.
+
+        Returns:
+            str: The cache key for the current conversation
+        """
+        components = self.get_cache_key_components(context)
+        serialized = json.dumps(components, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class InMemoryCache(BaseCache):
+    """Process-local LRU cache backed by an ordered dictionary.
+
+    Args:
+        max_entries (int, optional): maximum number of entries to keep.
+        ttl (float, optional): default time to live of an entry, in seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+    ):
+        super().__init__(max_entries=max_entries, ttl=ttl)
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        versioned_key = self.versioned_key(key)
+        with self._lock:
+            self._entries[versioned_key] = (
+                value,
+                self._get_expiry(time.time(), ttl),
+            )
+            self._entries.move_to_end(versioned_key)
+
+            while self.max_entries is not None and len(self._entries) > (
+                self.max_entries
+            ):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key: str) -> Optional[str]:
+        versioned_key = self.versioned_key(key)
+        with self._lock:
+            entry = self._entries.get(versioned_key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[versioned_key]
+                self.misses += 1
+                self.evictions += 1
+                return None
+
+            self._entries.move_to_end(versioned_key)
+            self.hits += 1
+            return value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(self.versioned_key(key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _SQLCache(BaseCache):
+    """Shared implementation of the cache backends storing the entries in
+    a keyed SQL table."""
+
+    connection: Any
+
+    def _create_table(self) -> None:
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key VARCHAR PRIMARY KEY,
+                value VARCHAR,
+                created_at DOUBLE,
+                last_accessed_at DOUBLE,
+                expires_at DOUBLE
+            )
+            """
+        )
+
+    @abstractmethod
+    def _execute_delete(self, query: str, params: list) -> int:
+        """Run a DELETE statement and return the number of deleted rows."""
+        raise NotImplementedError(
+            "_execute_delete method must be implemented by subclass."
+        )
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+            [self.versioned_key(key), value, now, now, self._get_expiry(now, ttl)],
+        )
+        self._evict(now)
+
+    def get(self, key: str) -> Optional[str]:
+        versioned_key = self.versioned_key(key)
+        row = self.connection.execute(
+            "SELECT value, expires_at FROM cache WHERE key=?", [versioned_key]
+        ).fetchone()
+
+        now = time.time()
+        if row is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            self.connection.execute("DELETE FROM cache WHERE key=?", [versioned_key])
+            self.misses += 1
+            self.evictions += 1
+            return None
+
+        self.connection.execute(
+            "UPDATE cache SET last_accessed_at=? WHERE key=?", [now, versioned_key]
+        )
+        self.hits += 1
+        return value
+
+    def delete(self, key: str) -> None:
         self.connection.execute(
             "DELETE FROM cache WHERE key=?", [self.versioned_key(key)]
         )
 
+    def _evict(self, now: float) -> None:
+        """Remove the expired entries and the least recently used entries
+        exceeding `max_entries`."""
+        self.evictions += self._execute_delete(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            [now],
+        )
+
+        if self.max_entries is None:
+            return
+
+        overflow = len(self) - self.max_entries
+        if overflow > 0:
+            self.evictions += self._execute_delete(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY last_accessed_at ASC LIMIT ?)",
+                [overflow],
+            )
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
     def close(self) -> None:
-        """Close the cache."""
         self.connection.close()
 
     def clear(self) -> None:
-        """Clean the cache."""
         self.connection.execute("DELETE FROM cache")
 
+
+class Cache(_SQLCache):
+    """Cache class for caching queries. It is used to cache queries
+    to save time and money.
+
+    Entries are stored in a keyed DuckDB table, so a `set` on an existing key
+    replaces the previous value instead of appending a new row. The number of
+    entries is capped by `max_entries`: once the cap is exceeded, the least
+    recently used entries are evicted. Each entry can optionally expire after
+    `ttl` seconds.
+
+    Args:
+        filename (str): filename to store the cache.
+        abs_path (str, optional): directory to store the cache in.
+        max_entries (int, optional): maximum number of entries to keep.
+            `None` disables the cap.
+        ttl (float, optional): default time to live of an entry, in seconds.
+            `None` means entries never expire.
+    """
+
+    def __init__(
+        self,
+        filename="cache_db_0.11",
+        abs_path=None,
+        max_entries: Optional[int] = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+    ):
+        super().__init__(max_entries=max_entries, ttl=ttl)
+        cache_dir = _get_cache_dir(abs_path)
+
+        self.filepath = os.path.join(cache_dir, f"{filename}.db")
+        self.connection = duckdb.connect(self.filepath)
+        self._create_table()
+
+    def _create_table(self) -> None:
+        columns = {
+            row[0]
+            for row in self.connection.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = 'cache'"
+            ).fetchall()
+        }
+
+        # Caches created by older versions are append-only tables without
+        # a primary key, they can't be migrated in place so we start over.
+        if columns and "expires_at" not in columns:
+            self.connection.execute("DROP TABLE cache")
+
+        super()._create_table()
+
+    def _execute_delete(self, query: str, params: list) -> int:
+        row = self.connection.execute(query, params).fetchone()
+        return row[0] if row else 0
+
     def destroy(self) -> None:
         """Destroy the cache."""
         self.connection.close()
         for cache_file in glob.glob(f"{self.filepath}.*"):
             os.remove(cache_file)
 
-    def get_cache_key(self, context: Any) -> str:
-        """
-        Return the cache key for the current conversation.
 
-        Returns:
-            str: The cache key for the current conversation
-        """
-        cache_key = context.memory.get_conversation()
+class SQLiteCache(_SQLCache):
+    """Cache stored in a SQLite database in WAL mode, so that several
+    processes can read it concurrently while one of them writes.
+
+    Args:
+        filename (str): filename to store the cache.
+        abs_path (str, optional): directory to store the cache in.
+        max_entries (int, optional): maximum number of entries to keep.
+        ttl (float, optional): default time to live of an entry, in seconds.
+        timeout (float, optional): seconds to wait for a lock held by
+            another process before failing.
+    """
+
+    def __init__(
+        self,
+        filename="cache_db_0.11",
+        abs_path=None,
+        max_entries: Optional[int] = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+        timeout: float = 30.0,
+    ):
+        super().__init__(max_entries=max_entries, ttl=ttl)
+        cache_dir = _get_cache_dir(abs_path)
+
+        self.filepath = os.path.join(cache_dir, f"{filename}.sqlite")
+        self.connection = sqlite3.connect(
+            self.filepath,
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_table()
+
+    def _execute_delete(self, query: str, params: list) -> int:
+        return self.connection.execute(query, params).rowcount
+
+    def destroy(self) -> None:
+        """Destroy the cache."""
+        self.connection.close()
+        for cache_file in glob.glob(f"{self.filepath}*"):
+            os.remove(cache_file)
+
+
+class RedisCache(BaseCache):
+    """Cache stored in a Redis compatible server, so that generated code can
+    be shared across processes and machines.
+
+    Expiration is delegated to the server, while the least recently used
+    order is tracked in a sorted set next to the entries.
+
+    Args:
+        client (optional): client speaking the Redis protocol. If not
+            provided, one is created from `url` with the `redis` package.
+        url (str, optional): url of the Redis server.
+        namespace (str, optional): prefix of the keys stored in Redis.
+        max_entries (int, optional): maximum number of entries to keep.
+        ttl (float, optional): default time to live of an entry, in seconds.
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        url: str = "redis://localhost:6379/0",
+        namespace: str = "pandasai:cache",
+        max_entries: Optional[int] = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+    ):
+        super().__init__(max_entries=max_entries, ttl=ttl)
 
-        # make the cache key unique for each combination of dfs
-        for df in context.dfs:
-            cache_key += str(df.column_hash)
+        if client is None:
+            if redis is None:
+                raise ImportError(
+                    "Could not import redis python package. "
+                    "Please install it with `pip install redis`."
+                )
+            client = redis.Redis.from_url(url)
 
-        return cache_key
+        self.client = client
+        self.namespace = namespace
+        self._index_key = f"{namespace}:lru"
+
+    def versioned_key(self, key: str) -> str:
+        return f"{self.namespace}:{super().versioned_key(key)}"
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        versioned_key = self.versioned_key(key)
+        ttl = ttl if ttl is not None else self.ttl
+
+        if ttl is not None:
+            self.client.set(versioned_key, value, px=max(int(ttl * 1000), 1))
+        else:
+            self.client.set(versioned_key, value)
+        self.client.zadd(self._index_key, {versioned_key: time.time()})
+
+        self._evict()
+
+    def get(self, key: str) -> Optional[str]:
+        versioned_key = self.versioned_key(key)
+        value = self.client.get(versioned_key)
+
+        if value is None:
+            # the entry may have been expired by the server
+            if self.client.zrem(self._index_key, versioned_key):
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+        self.client.zadd(self._index_key, {versioned_key: time.time()})
+        self.hits += 1
+        return value.decode() if isinstance(value, bytes) else value
+
+    def delete(self, key: str) -> None:
+        versioned_key = self.versioned_key(key)
+        self.client.delete(versioned_key)
+        self.client.zrem(self._index_key, versioned_key)
+
+    def _evict(self) -> None:
+        if self.max_entries is None:
+            return
+
+        overflow = self.client.zcard(self._index_key) - self.max_entries
+        if overflow > 0:
+            keys = self.client.zrange(self._index_key, 0, overflow - 1)
+            if keys:
+                self.client.delete(*keys)
+                self.client.zrem(self._index_key, *keys)
+                self.evictions += len(keys)
+
+    def clear(self) -> None:
+        keys = self.client.zrange(self._index_key, 0, -1)
+        if keys:
+            self.client.delete(*keys)
+        self.client.delete(self._index_key)
+
+    def __len__(self) -> int:
+        return self.client.zcard(self._index_key)
+
+    def close(self) -> None:
+        if hasattr(self.client, "close"):
+            self.client.close()
@@ -0,0 +1,218 @@
+import atexit
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..constants import (
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_MAX_SIZE,
+    DEFAULT_POOL_TIMEOUT,
+)
+
+
+def ping(connection: Any, query: str = "SELECT 1") -> bool:
+    """Check a DB-API connection by running a trivial query on it."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query)
+        cursor.fetchall()
+    finally:
+        cursor.close()
+
+    return True
+
+
+class ConnectionPool:
+    """Pool of the connections to the data sources, keyed on the fingerprint
+    of their connection info, so that the queries to a source reuse open
+    connections instead of paying a handshake each time.
+
+    Args:
+        max_size (int, optional): maximum number of open connections to a
+            source.
+        idle_timeout (float, optional): number of seconds after which an idle
+            connection is closed.
+        timeout (float, optional): number of seconds to wait for a connection
+            when all the connections to a source are in use.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_POOL_MAX_SIZE,
+        idle_timeout: Optional[float] = DEFAULT_POOL_IDLE_TIMEOUT,
+        timeout: Optional[float] = DEFAULT_POOL_TIMEOUT,
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle: Dict[str, List[Tuple[Any, float]]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def get_key(source_type: str, connection_info: dict) -> str:
+        """Return the fingerprint of the connection info of a source."""
+        info = {"type": source_type, "connection": connection_info}
+        return hashlib.sha256(
+            json.dumps(info, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    @contextmanager
+    def connection(
+        self,
+        source_type: str,
+        connection_info: dict,
+        connect: Callable[[], Any],
+        health_check: Optional[Callable[[Any], bool]] = None,
+    ) -> Iterator[Any]:
+        """
+        Borrow a connection to a source, for the duration of the context.
+
+        Args:
+            source_type (str): type of the source.
+            connection_info (dict): connection info of the source.
+            connect (Callable[[], Any]): function opening a new connection,
+                called when no idle connection is available.
+            health_check (Callable[[Any], bool], optional): function checking
+                an idle connection before reusing it, by returning False or
+                raising if the connection is broken.
+
+        Raises:
+            TimeoutError: if all the connections to the source stay in use
+                for more than `timeout` seconds.
+        """
+        key = self.get_key(source_type, connection_info)
+        connection = self._acquire(key, connect, health_check)
+        try:
+            yield connection
+        except BaseException:
+            # the connection may be left in a broken state
+            self._discard(key, connection)
+            raise
+        else:
+            self._release(key, connection)
+
+    def _acquire(
+        self,
+        key: str,
+        connect: Callable[[], Any],
+        health_check: Optional[Callable[[Any], bool]],
+    ) -> Any:
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        with self._condition:
+            self._close_expired()
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    connection, _ = idle.pop()
+                    break
+
+                if self._sizes.get(key, 0) < self.max_size:
+                    self._sizes[key] = self._sizes.get(key, 0) + 1
+                    connection = None
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        f"No connection available after {self.timeout} seconds, "
+                        f"all the {self.max_size} connections are in use."
+                    )
+                self._condition.wait(remaining)
+
+        if connection is not None:
+            if self._is_healthy(connection, health_check):
+                return connection
+            self._close(connection)
+
+        try:
+            return connect()
+        except BaseException:
+            with self._condition:
+                self._sizes[key] -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, key: str, connection: Any) -> None:
+        with self._condition:
+            self._idle.setdefault(key, []).append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def _discard(self, key: str, connection: Any) -> None:
+        self._close(connection)
+        with self._condition:
+            self._sizes[key] -= 1
+            self._condition.notify()
+
+    def _close_expired(self) -> None:
+        if self.idle_timeout is None:
+            return
+
+        expiry = time.monotonic() - self.idle_timeout
+        for key, idle in self._idle.items():
+            expired = [connection for connection, since in idle if since < expiry]
+            if not expired:
+                continue
+
+            idle[:] = [
+                (connection, since) for connection, since in idle if since >= expiry
+            ]
+            self._sizes[key] -= len(expired)
+            for connection in expired:
+                self._close(connection)
+
+    @staticmethod
+    def _is_healthy(
+        connection: Any, health_check: Optional[Callable[[Any], bool]]
+    ) -> bool:
+        if health_check is None:
+            return True
+
+        try:
+            return health_check(connection) is not False
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(connection: Any) -> None:
+        close = getattr(connection, "close", None)
+        if close is None:
+            return
+
+        try:
+            close()
+        except Exception:
+            # the connection is already closed or broken
+            pass
+
+    def close_all(self) -> None:
+        """Close all the idle connections, for instance before the process exits."""
+        with self._condition:
+            for key, idle in self._idle.items():
+                self._sizes[key] -= len(idle)
+                for connection, _ in idle:
+                    self._close(connection)
+            self._idle.clear()
+
+    def __len__(self) -> int:
+        return sum(self._sizes.values())
+
+
+_connection_pool: Optional[ConnectionPool] = None
+_connection_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Return the connection pool shared by the whole process."""
+    global _connection_pool
+
+    with _connection_pool_lock:
+        if _connection_pool is None:
+            _connection_pool = ConnectionPool()
+            atexit.register(_connection_pool.close_all)
+
+    return _connection_pool
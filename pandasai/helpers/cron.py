@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+from typing import List, Set, Tuple
+
+# Name and range of the fields of a cron expression
+CRON_FIELDS = [
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+]
+
+# Maximum number of days searched back for the previous scheduled time
+MAX_SEARCHED_DAYS = 366 * 5
+
+
+def _parse_field(field: str, name: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in field.split(","):
+        values_range, _, step = part.partition("/")
+        step = int(step) if step else 1
+
+        if values_range == "*":
+            start, end = low, high
+        elif "-" in values_range:
+            start, end = (int(value) for value in values_range.split("-", 1))
+        else:
+            start = int(values_range)
+            end = high if step > 1 else start
+
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid {name} field in cron expression: {field}")
+
+        values.update(range(start, end + 1, step))
+
+    return values
+
+
+def parse_cron(expression: str) -> Tuple[List[Set[int]], bool, bool]:
+    """
+    Parse a cron expression of 5 fields (minute, hour, day of month, month
+    and day of week), each a `*`, a value, a range or a list of them with an
+    optional `/step`.
+
+    Returns:
+        The values allowed for each field, and whether the day of month and
+        the day of week fields are restricted.
+
+    Raises:
+        ValueError: if the expression is invalid.
+    """
+    fields = expression.split()
+    if len(fields) != len(CRON_FIELDS):
+        raise ValueError(f"Invalid cron expression: {expression}")
+
+    try:
+        values = [
+            _parse_field(field, name, low, high)
+            for field, (name, low, high) in zip(fields, CRON_FIELDS)
+        ]
+    except ValueError as e:
+        raise ValueError(f"Invalid cron expression: {expression}") from e
+
+    # both 0 and 7 are Sunday
+    if 7 in values[4]:
+        values[4] = (values[4] - {7}) | {0}
+
+    return values, fields[2] != "*", fields[4] != "*"
+
+
+def get_previous_cron_time(expression: str, now: datetime) -> datetime:
+    """
+    Return the latest time, at or before `now`, scheduled by a cron expression.
+
+    Raises:
+        ValueError: if the expression is invalid or never matches.
+    """
+    (minutes, hours, days, months, weekdays), days_set, weekdays_set = parse_cron(
+        expression
+    )
+
+    def is_scheduled_day(time: datetime) -> bool:
+        if time.month not in months:
+            return False
+        day_matches = time.day in days
+        # cron counts the days of the week from Sunday
+        weekday_matches = (time.weekday() + 1) % 7 in weekdays
+        if days_set and weekdays_set:
+            return day_matches or weekday_matches
+        return day_matches and weekday_matches
+
+    time = now.replace(second=0, microsecond=0)
+    oldest = time - timedelta(days=MAX_SEARCHED_DAYS)
+
+    while time > oldest:
+        if not is_scheduled_day(time):
+            # last minute of the previous day
+            time = time.replace(hour=0, minute=0) - timedelta(minutes=1)
+        elif time.hour not in hours:
+            # last minute of the previous hour
+            time = time.replace(minute=0) - timedelta(minutes=1)
+        elif time.minute not in minutes:
+            time -= timedelta(minutes=1)
+        else:
+            return time
+
+    raise ValueError(f"The cron expression never matches: {expression}")
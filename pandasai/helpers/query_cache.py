@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+import sqlglot
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from ..constants import (
+    CACHE_TOKEN,
+    DEFAULT_QUERY_CACHE_FINGERPRINT_TTL,
+    DEFAULT_QUERY_CACHE_MAX_DISK_SIZE,
+    DEFAULT_QUERY_CACHE_MAX_SIZE,
+)
+
+
+def normalize_query(query: str, dialect: Optional[str] = None) -> str:
+    """
+    Return the canonical text of a query, so that queries differing only by
+    their whitespace, comments or keyword case share their cached result.
+    """
+    try:
+        expressions = sqlglot.parse(query, read=dialect)
+        return ";".join(
+            expression.sql(dialect=dialect, comments=False)
+            for expression in expressions
+            if expression is not None
+        )
+    except sqlglot.errors.SqlglotError:
+        return " ".join(query.split())
+
+
+class QueryCache:
+    """Cache of the results of the SQL queries run on the data sources, so
+    that retries and follow-ups running the same query don't hit the source
+    again.
+
+    Results are keyed on the normalized query, the connection and the
+    fingerprint of the source, and stored in the Arrow IPC format. The least
+    recently used results are spilled to disk when the results kept in
+    memory exceed `max_size`, and dropped when the spilled results exceed
+    `max_disk_size`.
+
+    Args:
+        max_size (int, optional): maximum total size, in bytes, of the results
+            kept in memory.
+        max_disk_size (int, optional): maximum total size, in bytes, of the
+            results spilled to disk. 0 disables the spilling.
+        fingerprint_ttl (float, optional): number of seconds during which the
+            fingerprint of a source is reused before being computed again,
+            i.e. how long changes in the source may go unnoticed.
+        max_age (float, optional): number of seconds after which a result is
+            never served, whatever the fingerprint of the source.
+        cache_dir (str, optional): directory of the spilled results, a
+            temporary directory by default.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = DEFAULT_QUERY_CACHE_MAX_SIZE,
+        max_disk_size: Optional[int] = DEFAULT_QUERY_CACHE_MAX_DISK_SIZE,
+        fingerprint_ttl: float = DEFAULT_QUERY_CACHE_FINGERPRINT_TTL,
+        max_age: Optional[float] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required to cache the results of the queries. "
+                "Please install it with `pip install pyarrow`."
+            )
+
+        self.max_size = max_size
+        self.max_disk_size = max_disk_size
+        self.fingerprint_ttl = fingerprint_ttl
+        self.max_age = max_age
+        self.size = 0
+        self.disk_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache_dir = cache_dir
+        self._memory: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._disk: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._fingerprints: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.RLock()
+
+    def get_cache_key(
+        self,
+        query: str,
+        source: dict,
+        fingerprint: str,
+        dialect: Optional[str] = None,
+        **options: Any,
+    ) -> str:
+        """
+        Return the cache key of the result of a query run on a source.
+
+        Args:
+            query (str): SQL query.
+            source (dict): source of the dataset, with its connection.
+            fingerprint (str): fingerprint of the data in the source.
+            dialect (str, optional): SQL dialect of the source.
+            **options: options of the execution changing the result.
+        """
+        key = {
+            "token": CACHE_TOKEN,
+            "query": normalize_query(query, dialect),
+            "source": source,
+            "fingerprint": fingerprint,
+            "options": options,
+        }
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get_fingerprint(self, source: dict, compute: Callable[[], str]) -> str:
+        """
+        Return the fingerprint of a source, computed again only when the one
+        computed last is older than `fingerprint_ttl`.
+        """
+        source_key = json.dumps(source, sort_keys=True, default=str)
+        with self._lock:
+            fingerprint = self._fingerprints.get(source_key)
+
+        if fingerprint is None or time.time() - fingerprint[1] >= self.fingerprint_ttl:
+            fingerprint = (compute(), time.time())
+            with self._lock:
+                self._fingerprints[source_key] = fingerprint
+
+        return fingerprint[0]
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached result of a query, if any."""
+        with self._lock:
+            data = self._get_data(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return pa.ipc.open_stream(data).read_all().to_pandas()
+
+    def _get_data(self, key: str) -> Optional[bytes]:
+        if key in self._memory:
+            data, created_at = self._memory[key]
+            if self._is_expired(created_at):
+                self._remove(key)
+                return None
+            self._memory.move_to_end(key)
+            return data
+
+        if key in self._disk:
+            _, created_at = self._disk[key]
+            if self._is_expired(created_at):
+                self._remove(key)
+                return None
+            with open(self._get_file_path(key), "rb") as file:
+                data = file.read()
+            # the result is used again, it's kept in memory
+            self._remove(key)
+            self._add(key, data, created_at)
+            return data
+
+        return None
+
+    def set(self, key: str, df: pd.DataFrame) -> None:
+        """Store the result of a query, if Arrow can represent it."""
+        try:
+            table = pa.Table.from_pandas(df)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # mixed types in an object column, or values Arrow can't represent
+            return
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        data = sink.getvalue().to_pybytes()
+
+        with self._lock:
+            self._remove(key)
+            self._add(key, data, time.time())
+
+    def _add(self, key: str, data: bytes, created_at: float) -> None:
+        self._memory[key] = (data, created_at)
+        self.size += len(data)
+
+        while self.max_size is not None and self.size > self.max_size:
+            evicted_key, (evicted_data, evicted_at) = self._memory.popitem(last=False)
+            self.size -= len(evicted_data)
+            self._spill(evicted_key, evicted_data, evicted_at)
+
+    def _spill(self, key: str, data: bytes, created_at: float) -> None:
+        if self.max_disk_size is not None and len(data) > self.max_disk_size:
+            self.evictions += 1
+            return
+
+        with open(self._get_file_path(key), "wb") as file:
+            file.write(data)
+        self._disk[key] = (len(data), created_at)
+        self.disk_size += len(data)
+
+        while self.max_disk_size is not None and self.disk_size > self.max_disk_size:
+            evicted_key, (size, _) = self._disk.popitem(last=False)
+            self.disk_size -= size
+            self._remove_file(evicted_key)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        if key in self._memory:
+            data, _ = self._memory.pop(key)
+            self.size -= len(data)
+        if key in self._disk:
+            size, _ = self._disk.pop(key)
+            self.disk_size -= size
+            self._remove_file(key)
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.max_age is not None and time.time() - created_at > self.max_age
+
+    def _get_file_path(self, key: str) -> str:
+        if self._cache_dir is None:
+            self._cache_dir = tempfile.mkdtemp(prefix="pandasai-query-cache-")
+            # remove the spilled results with the cache
+            weakref.finalize(self, shutil.rmtree, self._cache_dir, True)
+        os.makedirs(self._cache_dir, exist_ok=True)
+        return os.path.join(self._cache_dir, f"{key}.arrow")
+
+    def _remove_file(self, key: str) -> None:
+        try:
+            os.remove(self._get_file_path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Remove all the results and fingerprints from the cache."""
+        with self._lock:
+            for key in list(self._disk):
+                self._remove_file(key)
+            self._memory.clear()
+            self._disk.clear()
+            self._fingerprints.clear()
+            self.size = 0
+            self.disk_size = 0
+
+    def stats(self) -> dict:
+        """Return the hit, miss and eviction counters of the cache."""
+        return {
+            "entries": len(self),
+            "size": self.size,
+            "disk_size": self.disk_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._disk)
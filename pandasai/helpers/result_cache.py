@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import pandas as pd
+
+from ..constants import (
+    CACHE_TOKEN,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_RESULT_CACHE_MAX_SIZE,
+)
+
+if TYPE_CHECKING:
+    from pandasai.dataframe.base import DataFrame
+
+
+class ResultCache:
+    """In-memory cache of the results of executed code, so that asking the
+    same question on unchanged data doesn't execute the code again.
+
+    Results are keyed on the code and the fingerprint of each dataframe: a
+    hash of all the rows of local dataframes, and the fingerprint of the
+    source of virtual ones.
+    Dataframe results are stored as parquet and chart results as PNG bytes,
+    which keeps the cached values immutable and compact.
+
+    Args:
+        max_entries (int, optional): maximum number of results to keep.
+        max_size (int, optional): maximum total size of the stored results,
+            in bytes. The least recently used results are evicted first.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = DEFAULT_CACHE_MAX_ENTRIES,
+        max_size: Optional[int] = DEFAULT_RESULT_CACHE_MAX_SIZE,
+    ):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[dict, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_cache_key(self, code: str, dfs: List[DataFrame]) -> str:
+        """
+        Return the cache key of the result of a code run on the dataframes.
+        """
+        digest = hashlib.sha256(f"{CACHE_TOKEN}-{code}".encode())
+        for df in dfs:
+            digest.update(df.get_fingerprint().encode())
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached result, in the format returned by the code."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return self._deserialize(entry[0])
+
+    def set(self, key: str, result: dict) -> None:
+        """Store the result of a code, if its type can be cached."""
+        serialized = self._serialize(result)
+        if serialized is None:
+            return
+
+        size = self._get_size(serialized)
+        if self.max_size is not None and size > self.max_size:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+
+            self._entries[key] = (serialized, size)
+            self.size += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_size is not None and self.size > self.max_size)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def _serialize(self, result: dict) -> Optional[dict]:
+        result_type, value = result.get("type"), result.get("value")
+
+        if result_type in ("number", "string"):
+            return {"type": result_type, "value": value}
+
+        if result_type == "dataframe":
+            is_series = isinstance(value, pd.Series)
+            df = value.to_frame(name="value") if is_series else value
+            buffer = io.BytesIO()
+            try:
+                df.to_parquet(buffer)
+            except (ImportError, ValueError, TypeError):
+                # no parquet engine installed, or the dataframe has values
+                # or column names parquet can't represent
+                return None
+            return {
+                "type": result_type,
+                "value": buffer.getvalue(),
+                "is_series": is_series,
+                "series_name": value.name if is_series else None,
+            }
+
+        if result_type == "plot":
+            if isinstance(value, str) and os.path.isfile(value):
+                with open(value, "rb") as image_file:
+                    image = image_file.read()
+                return {"type": result_type, "value": value, "image": image}
+            if isinstance(value, str):
+                return {"type": result_type, "value": value}
+
+        return None
+
+    @staticmethod
+    def _deserialize(serialized: dict) -> dict:
+        result_type, value = serialized["type"], serialized["value"]
+
+        if result_type == "dataframe":
+            value = pd.read_parquet(io.BytesIO(value))
+            if serialized["is_series"]:
+                value = value.iloc[:, 0].rename(serialized["series_name"])
+        elif result_type == "plot" and "image" in serialized:
+            # the chart may have been overwritten or deleted in the meantime
+            directory = os.path.dirname(value)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(value, "wb") as image_file:
+                image_file.write(serialized["image"])
+
+        return {"type": result_type, "value": value}
+
+    @staticmethod
+    def _get_size(serialized: dict) -> int:
+        return sum(
+            len(value) if isinstance(value, (bytes, str)) else sys.getsizeof(value)
+            for key, value in serialized.items()
+            if key in ("value", "image")
+        )
+
+    def clear(self) -> None:
+        """Remove all the results from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        """Return the hit, miss and eviction counters of the cache."""
+        return {
+            "entries": len(self),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
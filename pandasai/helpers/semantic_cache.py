@@ -0,0 +1,211 @@
+import hashlib
+import re
+import threading
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from ..constants import (
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_SEMANTIC_CACHE_THRESHOLD,
+)
+
+# Numbers and quoted values of a question, which must be the same for the
+# code of a question to be reused for another one
+LITERAL_REGEX = re.compile(
+    r"(?<!\w)'([^']+)'(?!\w)|\"([^\"]+)\"|`([^`]+)`|(\d+(?:[.,]\d+)*)"
+)
+
+# Words that don't change the meaning of a question, the other words must be
+# the same for the code of a question to be reused for another one. Negations
+# like "not", "no" or "without" are never stopwords.
+STOPWORDS = frozenset(
+    (
+        "a an the is are was were be been do does did what which who how of in on "
+        "for to me us i we you please show give tell find get return display list "
+        "there this that these those can could would"
+    ).split()
+)
+
+
+def hashing_embedding(text: str, dimensions: int = 512) -> np.ndarray:
+    """
+    Embed a text locally by hashing its words and character trigrams into a
+    fixed size vector. It doesn't capture synonyms, but is enough to match
+    questions differing by word order, casing, punctuation or stopwords.
+
+    Args:
+        text (str): text to embed.
+        dimensions (int, optional): size of the vector.
+
+    Returns:
+        np.ndarray: the embedding of the text.
+    """
+    vector = np.zeros(dimensions, dtype=np.float32)
+    words = re.findall(r"\w+", text.lower())
+
+    features = list(words)
+    for word in words:
+        padded = f" {word} "
+        features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+
+    for feature in features:
+        digest = hashlib.md5(feature.encode()).digest()
+        index = int.from_bytes(digest[:4], "little") % dimensions
+        sign = 1.0 if digest[4] % 2 == 0 else -1.0
+        vector[index] += sign
+
+    return vector
+
+
+def get_literals(text: str) -> Tuple[str, ...]:
+    """
+    Return the numbers and quoted values of a text, e.g. `("5", "France")`
+    for "top 5 cities of 'France'", in a canonical order.
+    """
+    return tuple(
+        sorted(
+            next(group for group in match.groups() if group is not None)
+            for match in LITERAL_REGEX.finditer(text)
+        )
+    )
+
+
+def get_content_words(text: str) -> FrozenSet[str]:
+    """
+    Return the lowercased words of a text that aren't stopwords, e.g.
+    `{"customers", "not", "order"}` for "Which customers didn't order?".
+    """
+    text = re.sub(r"n['’]t\b", " not", text.lower()).replace("cannot", "can not")
+    return frozenset(re.findall(r"\w+", text)) - STOPWORDS
+
+
+class _SemanticIndex:
+    """In-process vector index of the (query, code) pairs of a schema."""
+
+    def __init__(self, dimensions: int):
+        self.queries: List[str] = []
+        self.codes: List[str] = []
+        self.literals: List[Tuple[str, ...]] = []
+        self.words: List[FrozenSet[str]] = []
+        self.vectors = np.empty((0, dimensions), dtype=np.float32)
+
+
+class SemanticCache:
+    """Cache reusing the code generated for questions similar to the current
+    one, instead of only for identical conversations.
+
+    Questions are embedded with a local embedding function and compared, by
+    cosine similarity, to the questions previously answered successfully on
+    dataframes with the same schema fingerprint. The code of the most
+    similar question is reused if the similarity reaches `threshold` and
+    both questions have the same numbers, quoted values and words other than
+    stopwords, as similar questions like "age over 30" and "age over 40",
+    "salary of women" and "salary of men", or "did order" and "did not
+    order" need different code.
+
+    The cache is disabled unless it is set in the `semantic_cache` option.
+
+    Args:
+        embedding_function (Callable[[str], np.ndarray], optional): function
+            embedding a text into a vector. Defaults to `hashing_embedding`.
+        threshold (float, optional): minimum cosine similarity between two
+            questions for the code to be reused.
+        max_entries (int, optional): maximum number of questions kept per
+            schema fingerprint, the oldest ones are evicted first.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Optional[Callable[[str], np.ndarray]] = None,
+        threshold: float = DEFAULT_SEMANTIC_CACHE_THRESHOLD,
+        max_entries: Optional[int] = DEFAULT_CACHE_MAX_ENTRIES,
+    ):
+        self.embedding_function = embedding_function or hashing_embedding
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._indexes: Dict[str, _SemanticIndex] = {}
+        self._lock = threading.Lock()
+
+    def _embed(self, query: str) -> np.ndarray:
+        vector = np.asarray(self.embedding_function(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def add(self, query: str, code: str, fingerprint: str) -> None:
+        """Store the code answering a question.
+
+        Args:
+            query (str): the question asked.
+            code (str): the code that answered the question successfully.
+            fingerprint (str): fingerprint of the schema of the dataframes.
+        """
+        vector = self._embed(query)
+
+        with self._lock:
+            index = self._indexes.get(fingerprint)
+            if index is None:
+                index = self._indexes[fingerprint] = _SemanticIndex(len(vector))
+
+            if query in index.queries:
+                position = index.queries.index(query)
+                index.codes[position] = code
+                return
+
+            index.queries.append(query)
+            index.codes.append(code)
+            index.literals.append(get_literals(query))
+            index.words.append(get_content_words(query))
+            index.vectors = np.vstack([index.vectors, vector])
+
+            if self.max_entries is not None and len(index.queries) > self.max_entries:
+                overflow = len(index.queries) - self.max_entries
+                del index.queries[:overflow]
+                del index.codes[:overflow]
+                del index.literals[:overflow]
+                del index.words[:overflow]
+                index.vectors = index.vectors[overflow:]
+
+    def get(self, query: str, fingerprint: str) -> Optional[str]:
+        """Return the code of the most similar question, if similar enough.
+
+        Args:
+            query (str): the question asked.
+            fingerprint (str): fingerprint of the schema of the dataframes.
+
+        Returns:
+            Optional[str]: the code to reuse, None if no question is similar
+            enough.
+        """
+        with self._lock:
+            index = self._indexes.get(fingerprint)
+            if index is None or not index.queries:
+                self.misses += 1
+                return None
+
+            similarities = index.vectors @ self._embed(query)
+            literals = get_literals(query)
+            words = get_content_words(query)
+            for position, (query_literals, query_words) in enumerate(
+                zip(index.literals, index.words)
+            ):
+                if query_literals != literals or query_words != words:
+                    similarities[position] = -np.inf
+
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return index.codes[best]
+
+    def clear(self) -> None:
+        """Remove all the questions from the cache."""
+        with self._lock:
+            self._indexes.clear()
+
+    def __len__(self) -> int:
+        return sum(len(index.queries) for index in self._indexes.values())
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import ast
+import asyncio
+import functools
 import re
 from abc import abstractmethod
 from typing import TYPE_CHECKING, Any, Optional
@@ -149,6 +151,25 @@ class LLM:
         """
         raise MethodNotImplementedError("Call method has not been implemented")
 
+    async def acall(self, instruction: BasePrompt, context: AgentState = None) -> str:
+        """
+        Execute the LLM with given prompt without blocking the event loop.
+
+        By default `call` is run in a worker thread, LLMs with an async client
+        should override this method.
+
+        Args:
+            instruction (BasePrompt): A prompt object with instruction for LLM.
+            context (AgentState, optional): AgentState. Defaults to None.
+
+        Returns:
+            str: Response
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.call, instruction, context)
+        )
+
     def generate_code(self, instruction: BasePrompt, context: AgentState) -> str:
         """
         Generate the code based on the instruction and the given prompt.
@@ -162,3 +183,17 @@ class LLM:
         """
         response = self.call(instruction, context)
         return self._extract_code(response)
+
+    async def agenerate_code(self, instruction: BasePrompt, context: AgentState) -> str:
+        """
+        Asynchronously generate the code based on the instruction and the given prompt.
+
+        Args:
+            instruction (BasePrompt): Prompt with instruction for LLM.
+
+        Returns:
+            str: A string of Python code.
+
+        """
+        response = await self.acall(instruction, context)
+        return self._extract_code(response)
@@ -103,7 +103,7 @@ class ChatController(BaseController[User]):
         if memory:
             agent.context.memory = memory
 
-        response = agent.chat(chat_request.query)
+        response = await agent.achat(chat_request.query)
 
         if os.path.exists(path_plot_directory):
             shutil.rmtree(path_plot_directory)
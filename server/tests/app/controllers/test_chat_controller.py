@@ -0,0 +1,82 @@
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from app.controllers.chat import ChatController
+from app.schemas.requests.chat import ChatRequest
+from app.schemas.responses.chat import ChatResponse
+from core.constants import CHAT_FALLBACK_MESSAGE
+
+
+class TestChatController:
+    @pytest.fixture
+    def controller(self):
+        space_repository = Mock()
+        dataset = MagicMock()
+        dataset.connector.config = {"file_path": "data.csv"}
+        dataset.head = None
+        space_repository.get_space_datasets = AsyncMock(return_value=[dataset])
+
+        conversation_repository = Mock()
+        conversation_repository.create = AsyncMock(return_value=Mock(id="conv-id"))
+        conversation_repository.add_conversation_message = AsyncMock(
+            return_value=Mock(id="message-id", query="How many rows?")
+        )
+
+        logs_repository = Mock()
+        logs_repository.add_log = AsyncMock(return_value=Mock(id="log-id"))
+
+        return ChatController(
+            Mock(), space_repository, conversation_repository, logs_repository
+        )
+
+    @pytest.fixture
+    def agent(self):
+        with patch(
+            "core.database.transactional.session", new_callable=AsyncMock
+        ), patch.multiple(
+            "app.controllers.chat",
+            pd=Mock(),
+            PandasConnector=Mock(),
+            env_config=Mock(OPENAI_API_KEY=None),
+            Agent=DEFAULT,
+        ) as mocks:
+            agent = mocks["Agent"].return_value
+            agent.pipeline.query_exec_tracker.get_summary.return_value = {
+                "success": True,
+                "execution_time": 0.1,
+            }
+            yield agent
+
+    @pytest.mark.asyncio
+    async def test_chat_awaits_agent(self, controller, agent):
+        agent.achat = AsyncMock(
+            return_value={"type": "number", "value": 3, "message": "3"}
+        )
+        user = Mock(id="user-id")
+        chat_request = ChatRequest(workspace_id="space-id", query="How many rows?")
+
+        response = await controller.chat(user, chat_request)
+
+        agent.achat.assert_awaited_once_with("How many rows?")
+        agent.chat.assert_not_called()
+        assert isinstance(response, ChatResponse)
+        assert response.conversation_id == "conv-id"
+        assert response.message_id == "message-id"
+        assert response.response[0].value == 3
+
+    @pytest.mark.asyncio
+    async def test_chat_returns_fallback_message_on_agent_error(
+        self, controller, agent
+    ):
+        agent.achat = AsyncMock(
+            return_value="Unfortunately, I was not able to get your answers"
+        )
+        user = Mock(id="user-id")
+        chat_request = ChatRequest(workspace_id="space-id", query="How many rows?")
+
+        response = await controller.chat(user, chat_request)
+
+        agent.achat.assert_awaited_once_with("How many rows?")
+        assert response[0]["value"] == CHAT_FALLBACK_MESSAGE
+        controller.logs_repository.add_log.assert_not_called()
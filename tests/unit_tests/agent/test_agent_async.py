@@ -0,0 +1,100 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from pandasai.agent import Agent
+from pandasai.dataframe.base import DataFrame
+from pandasai.llm.fake import FakeLLM
+
+
+class AsyncLLM(FakeLLM):
+    """LLM answering only through the async API, with the given responses"""
+
+    def __init__(self, *responses: str):
+        super().__init__()
+        self.responses = list(responses)
+        self.prompts = []
+
+    def call(self, instruction, context=None):
+        raise AssertionError("the async API must not call the LLM synchronously")
+
+    async def acall(self, instruction, context=None):
+        self.prompts.append(instruction.to_string())
+        return self.responses.pop(0)
+
+
+def code(value: str) -> str:
+    return f"```python\nresult = {{'type': 'number', 'value': {value}}}\n```"
+
+
+class TestAgentAsync:
+    @pytest.fixture
+    def sample_df(self) -> DataFrame:
+        return DataFrame(
+            pd.DataFrame(
+                {
+                    "country": ["United States", "United Kingdom", "Japan", "China"],
+                    "happiness_index": [6.94, 7.22, 5.87, 5.12],
+                }
+            )
+        )
+
+    def test_achat(self, sample_df):
+        llm = AsyncLLM(code("len(dfs[0])"))
+        agent = Agent(sample_df, {"llm": llm, "enable_cache": False})
+
+        response = asyncio.run(agent.achat("How many countries?"))
+
+        assert response.value == 4
+        assert (
+            agent.last_generated_code
+            == "result = {'type': 'number', 'value': len(dfs[0])}"
+        )
+
+    def test_achat_starts_new_conversation(self, sample_df):
+        llm = AsyncLLM(code("1"), code("2"))
+        agent = Agent(sample_df, {"llm": llm, "enable_cache": False})
+
+        asyncio.run(agent.achat("First question"))
+        asyncio.run(agent.achat("Second question"))
+
+        assert agent._state.memory.count() == 1
+        assert "Second question" in agent._state.memory.get_last_message()
+
+    def test_afollow_up(self, sample_df):
+        llm = AsyncLLM(code("1"), code("2"))
+        agent = Agent(sample_df, {"llm": llm, "enable_cache": False})
+
+        async def conversation():
+            await agent.achat("First question")
+            return await agent.afollow_up("Second question")
+
+        response = asyncio.run(conversation())
+
+        assert response.value == 2
+        # the follow-up keeps the previous messages of the conversation
+        assert agent._state.memory.count() == 2
+        assert "Second question" in llm.prompts[1]
+
+    def test_achat_retries_failed_code(self, sample_df):
+        llm = AsyncLLM(code("1 / 0"), code("len(dfs[0])"))
+        agent = Agent(sample_df, {"llm": llm, "enable_cache": False})
+
+        response = asyncio.run(agent.achat("How many countries?"))
+
+        assert response.value == 4
+        # the correction is generated with the async API from the error
+        assert len(llm.prompts) == 2
+        assert "division by zero" in llm.prompts[1]
+
+    def test_achat_returns_error_after_max_retries(self, sample_df):
+        llm = AsyncLLM(code("1 / 0"), code("1 / 0"))
+        agent = Agent(sample_df, {"llm": llm, "enable_cache": False, "max_retries": 1})
+
+        response = asyncio.run(agent.achat("How many countries?"))
+
+        assert isinstance(response, str)
+        assert response.startswith("Unfortunately, I was not able to")
+        assert "division by zero" in response
+        assert len(llm.prompts) == 2
@@ -0,0 +1,62 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from pandasai.agent import Agent
+from pandasai.dataframe.base import DataFrame
+from pandasai.llm.fake import FakeLLM
+
+
+class TestAgentBatch:
+    @pytest.fixture
+    def sample_df(self) -> DataFrame:
+        return DataFrame(
+            pd.DataFrame(
+                {
+                    "country": ["United States", "United Kingdom", "Japan", "China"],
+                    "happiness_index": [6.94, 7.22, 5.87, 5.12],
+                }
+            )
+        )
+
+    @pytest.fixture
+    def agent(self, sample_df) -> Agent:
+        llm = FakeLLM()
+        llm.response = (
+            "```python\nresult = {'type': 'number', 'value': len(dfs[0])}\n```"
+        )
+        return Agent(sample_df, {"llm": llm, "enable_cache": False})
+
+    def test_chat_batch(self, agent):
+        responses = agent.chat_batch(
+            ["How many countries?", "How many rows?", "How many entries?"],
+            max_concurrency=2,
+        )
+
+        assert [response.value for response in responses] == [4, 4, 4]
+        # the conversation of the agent is left untouched
+        assert agent._state.memory.count() == 0
+
+    def test_chat_batch_in_running_event_loop(self, agent):
+        async def notebook_cell():
+            return agent.chat_batch(["How many countries?", "How many rows?"])
+
+        responses = asyncio.run(notebook_cell())
+
+        assert [response.value for response in responses] == [4, 4]
+
+    def test_chat_batch_isolates_errors(self, sample_df):
+        class QueryLLM(FakeLLM):
+            def call(self, instruction, context=None):
+                if "fail" in context.memory.get_last_message():
+                    raise Exception("LLM failure")
+                return "```python\nresult = {'type': 'string', 'value': 'ok'}\n```"
+
+        agent = Agent(sample_df, {"llm": QueryLLM(), "enable_cache": False})
+
+        responses = agent.chat_batch(["first", "fail", "last"])
+
+        assert responses[0].value == "ok"
+        assert "LLM failure" in responses[1]
+        assert responses[2].value == "ok"
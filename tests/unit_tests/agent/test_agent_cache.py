@@ -0,0 +1,42 @@
+from typing import List
+
+import pytest
+
+from pandasai.agent import Agent
+from pandasai.dataframe.base import DataFrame
+from pandasai.helpers.cache import InMemoryCache
+from pandasai.helpers.result_cache import ResultCache
+from pandasai.llm.fake import FakeLLM
+
+
+class SequenceLLM(FakeLLM):
+    """Fake LLM returning a different response to each call."""
+
+    def __init__(self, responses: List[str]):
+        super().__init__()
+        self.responses = list(responses)
+
+    def call(self, instruction, context=None) -> str:
+        return self.responses.pop(0)
+
+
+class TestAgentCache:
+    @pytest.fixture
+    def df(self):
+        return DataFrame({"country": ["France", "Spain", "Italy"]})
+
+    def test_caches_corrected_code(self, df):
+        broken_code = "result = {'type': 'number', 'value': missing}"
+        fixed_code = "result = {'type': 'number', 'value': len(dfs[0])}"
+        llm = SequenceLLM([f"```python\n{broken_code}\n```", fixed_code])
+        cache, result_cache = InMemoryCache(), ResultCache()
+        agent = Agent(df, {"llm": llm, "cache": cache, "result_cache": result_cache})
+
+        response = agent.chat("How many countries?")
+
+        assert response.value == 3
+        assert agent.last_code_executed == fixed_code
+        assert cache.get(cache.get_cache_key(agent._state)) == fixed_code
+        # the result is cached under the code that produced it
+        assert result_cache.get(result_cache.get_cache_key(fixed_code, [df]))
+        assert result_cache.get(result_cache.get_cache_key(broken_code, [df])) is None
@@ -0,0 +1,26 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from pandasai.agent import Agent
+from pandasai.dataframe.base import DataFrame
+from pandasai.exceptions import CodeExecutionCancelledError
+from pandasai.llm.fake import FakeLLM
+
+
+class TestAgentCancel:
+    @pytest.fixture
+    def agent(self) -> Agent:
+        df = DataFrame(pd.DataFrame({"country": ["United States", "Japan"]}))
+        return Agent(df, {"llm": FakeLLM(), "enable_cache": False})
+
+    def test_cancel(self, agent: Agent):
+        agent._regenerate_code_after_error = MagicMock()
+        agent.cancel()
+
+        with pytest.raises(CodeExecutionCancelledError):
+            agent.execute_with_retries("result = 1", [])
+
+        # the cancelled code isn't corrected and retried
+        agent._regenerate_code_after_error.assert_not_called()
@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from pandasai.chat.code_execution import CodeExecutor
+from pandasai.chat.code_execution.code_executor import compile_code
+from pandasai.chat.code_execution.environment import (
+    _get_base_environment,
+    get_environment,
+    import_dependency,
+)
+
+
+class TestCodeExecutor:
+    def test_environment_is_built_once(self):
+        _get_base_environment.cache_clear()
+        dependencies = [{"module": "math", "name": "math", "alias": "math"}]
+
+        with patch(
+            "pandasai.chat.code_execution.environment.import_dependency",
+            wraps=import_dependency,
+        ) as mock_import_dependency:
+            first = get_environment(dependencies)
+            second = get_environment(dependencies)
+
+        mock_import_dependency.assert_called_once_with("math")
+        assert first["math"] is second["math"]
+        assert first["pd"] is not second["pd"]
+        assert first["pd"].DataFrame is second["pd"].DataFrame
+
+    def test_executions_are_isolated(self):
+        code_executor = CodeExecutor([])
+        code_executor.add_to_env("dfs", [])
+        code_executor.execute("pd.DataFrame = None\ncount = 1")
+
+        environment = CodeExecutor([])._environment
+
+        assert "dfs" not in environment
+        assert "count" not in environment
+        assert environment["pd"].DataFrame is not None
+
+    def test_code_is_compiled_once(self):
+        compile_code.cache_clear()
+        code = "result = {'type': 'number', 'value': len(dfs)}"
+
+        with patch("builtins.compile", wraps=compile) as mock_compile:
+            for dfs in [[], [1, 2]]:
+                code_executor = CodeExecutor([])
+                code_executor.add_to_env("dfs", dfs)
+                code_executor.execute_and_return_result(code)
+
+        mock_compile.assert_called_once()
+        assert compile_code(code) is compile_code(code)
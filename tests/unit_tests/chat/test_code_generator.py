@@ -0,0 +1,159 @@
+import ast
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pandasai.chat.code_generation import CodeGenerator, CodeHandler, walk_code
+from pandasai.dataframe.base import DataFrame
+from pandasai.exceptions import (
+    BadImportError,
+    ExecuteSQLQueryNotUsed,
+    MaliciousCodeGenerated,
+    MaliciousQueryError,
+)
+
+
+class TestCodeGenerator:
+    @pytest.fixture
+    def context(self, tmp_path):
+        context = MagicMock()
+        context.config.direct_sql = False
+        context.config.custom_whitelisted_dependencies = []
+        context.config.save_charts = True
+        context.config.save_charts_path = str(tmp_path)
+        context.prompt_id = "chart"
+        context.dfs = [DataFrame({"a": [1, 2, 3]}, name="users")]
+        return context
+
+    def test_validate_and_clean_code_parses_once(self, context):
+        code = (
+            "import pandas as pd\n"
+            "import numpy as np\n"
+            "df = dfs[0]\n"
+            "df.plot().figure.savefig('revenue.png')\n"
+            "result = {'type': 'plot', 'value': 'revenue.png'}"
+        )
+
+        with patch("ast.parse", wraps=ast.parse) as mock_parse:
+            cleaned, dependencies = CodeGenerator(context).validate_and_clean_code(code)
+
+        assert mock_parse.call_count == 1
+        chart_path = f"{context.config.save_charts_path}/chart.png"
+        assert cleaned == (
+            "df = dfs[0]\n"
+            f"df.plot().figure.savefig('{chart_path}')\n"
+            f"result = {{'type': 'plot', 'value': '{chart_path}'}}"
+        )
+        assert dependencies == [{"module": "numpy", "name": "numpy", "alias": "np"}]
+
+    def test_cleaned_code_is_cached(self, context):
+        code = "df = dfs[0]\nresult = {'type': 'number', 'value': len(df) + 7}"
+
+        cleaned, _ = CodeGenerator(context).validate_and_clean_code(code)
+        with patch("ast.parse", wraps=ast.parse) as mock_parse:
+            # another agent validating the same code
+            assert CodeGenerator(context).validate_and_clean_code(code) == (
+                cleaned,
+                [],
+            )
+            mock_parse.assert_not_called()
+
+            # the tables changed, the code is validated again
+            context.dfs = [DataFrame({"b": [1, 2, 3]}, name="users")]
+            CodeGenerator(context).validate_and_clean_code(code)
+            mock_parse.assert_called_once()
+
+    def test_cached_chart_code_creates_chart_directory(self, context, tmp_path):
+        context.config.save_charts_path = str(tmp_path / "charts")
+        code = (
+            "df = dfs[0]\n"
+            "df.plot().figure.savefig('revenue.png')\n"
+            "result = {'type': 'plot', 'value': 'revenue.png'}"
+        )
+
+        cleaned, _ = CodeGenerator(context).validate_and_clean_code(code)
+        (tmp_path / "charts").rmdir()
+
+        assert CodeGenerator(context).validate_and_clean_code(code) == (cleaned, [])
+        assert (tmp_path / "charts").is_dir()
+
+    def test_direct_sql(self, context):
+        context.config.direct_sql = True
+        generator = CodeGenerator(context)
+
+        cleaned, _ = generator.validate_and_clean_code(
+            "def execute_sql_query(sql_query):\n"
+            "    pass\n"
+            "df = execute_sql_query('SELECT * FROM users;')\n"
+            "result = {'type': 'dataframe', 'value': df}"
+        )
+        assert cleaned == (
+            "df = execute_sql_query('SELECT * FROM users')\n"
+            "result = {'type': 'dataframe', 'value': df}"
+        )
+
+        with pytest.raises(MaliciousQueryError):
+            generator.validate_and_clean_code("execute_sql_query('SELECT 1 FROM t')")
+        with pytest.raises(ExecuteSQLQueryNotUsed):
+            generator.validate_and_clean_code("df = dfs[0]")
+
+    @pytest.mark.parametrize(
+        "code,expected",
+        [
+            (
+                "df = pd.DataFrame({'a': [1, 2, 3]})",
+                "df = dfs[0]",
+            ),
+            (
+                "data = [[1], [2], [3]]\ndf = pd.DataFrame(data, columns=['a'])",
+                "data = [[1], [2], [3]]\ndf = dfs[0]",
+            ),
+            (
+                "df = pd.DataFrame({'b': [1, 2, 3]})",
+                "df = pd.DataFrame({'b': [1, 2, 3]})",
+            ),
+            (
+                "data = dfs[0].to_dict()\ndf = pd.DataFrame(data)",
+                "data = dfs[0].to_dict()\ndf = pd.DataFrame(data)",
+            ),
+        ],
+    )
+    def test_dataframe_redeclaration(self, context, code, expected):
+        cleaned, _ = CodeGenerator(context).validate_and_clean_code(code)
+
+        assert cleaned == expected
+
+    @pytest.mark.parametrize(
+        "code,error",
+        [
+            ("import os", MaliciousCodeGenerated),
+            ("from subprocess import run", MaliciousCodeGenerated),
+            ("x = dfs[0].__class__", MaliciousCodeGenerated),
+            ("x = getattr(dfs[0], '__builtins__')", MaliciousCodeGenerated),
+            ("dfs[0].to_csv('data.csv')", MaliciousCodeGenerated),
+            ("import requests", BadImportError),
+        ],
+    )
+    def test_invalid_code(self, context, code, error):
+        with pytest.raises(error):
+            CodeGenerator(context).validate_and_clean_code(code)
+
+
+class TestWalkCode:
+    def test_handlers(self):
+        class NameCollector(CodeHandler):
+            def __init__(self):
+                self.names = []
+
+            def visit_Name(self, node):
+                self.names.append(node.id)
+
+        class PassRemover(CodeHandler):
+            def visit_statement(self, node, body):
+                return None if isinstance(node, ast.Pass) else node
+
+        collector = NameCollector()
+        tree = walk_code(ast.parse("a = b\npass\nc = a"), [collector, PassRemover()])
+
+        assert collector.names == ["a", "b", "c", "a"]
+        assert [type(node) for node in tree.body] == [ast.Assign, ast.Assign]
@@ -0,0 +1,163 @@
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from pandasai.chat.code_execution import SandboxExecutor
+from pandasai.chat.code_execution.sandbox import _attach_shared_memory
+from pandasai.dataframe.base import DataFrame
+from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
+from pandasai.exceptions import CodeExecutionCancelledError, CodeExecutionTimeoutError
+
+
+@pytest.fixture(scope="module")
+def sandbox():
+    sandbox = SandboxExecutor(max_workers=1, timeout=5)
+    yield sandbox
+    sandbox.close()
+
+
+class TestSandboxExecutor:
+    @pytest.fixture
+    def df(self):
+        return DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}, name="letters")
+
+    def test_execute(self, sandbox, df):
+        result = sandbox.execute(
+            "result = {'type': 'dataframe', 'value': dfs[0][dfs[0]['a'] > 1]}", [df]
+        )
+
+        assert result["type"] == "dataframe"
+        assert result["value"].to_dict("list") == {"a": [2, 3], "b": ["y", "z"]}
+
+    def test_dataframes_are_shared_once(self, sandbox, df):
+        code = (
+            "dfs[0]['a'] = 0\n"
+            "result = {'type': 'number', 'value': dfs[0]['a'].sum()}"
+        )
+
+        assert sandbox.execute(code, [df])["value"] == 0
+        shm_name = sandbox._share(df)["segment"]["shm"]
+        # the code modified a copy of the dataframe
+        assert sandbox.execute(code.split("\n")[1], [df])["value"] == 6
+        assert sandbox._share(df)["segment"]["shm"] == shm_name
+
+        # another dataframe holding the same data reuses its segment
+        other_df = DataFrame(df.copy(), name="other")
+        assert sandbox.execute(code.split("\n")[1], [other_df])["value"] == 6
+        assert sandbox._share(other_df)["segment"]["shm"] == shm_name
+
+        df.loc[0, "a"] = 10
+        assert sandbox.execute(code.split("\n")[1], [df])["value"] == 15
+        assert sandbox._share(df)["segment"]["shm"] != shm_name
+        # the segment is still used by the other dataframe
+        assert sandbox._share(other_df)["segment"]["shm"] == shm_name
+
+    def test_edits_outside_sampled_rows_are_shared(self, sandbox):
+        df = DataFrame({"a": range(1_000_000)}, name="numbers")
+        code = "result = {'type': 'number', 'value': dfs[0]['a'].min()}"
+        assert sandbox.execute(code, [df])["value"] == 0
+
+        df.iloc[1500, 0] = -5
+        assert sandbox.execute(code, [df])["value"] == -5
+
+    def test_virtual_dataframe(self, sandbox):
+        loader = MagicMock()
+        loader.load_head.return_value = pd.DataFrame({"id": [1, 2]})
+        loader.execute_query.return_value = pd.DataFrame({"id": range(10)})
+        loader.get_metadata.return_value = {"rows_count": 10, "columns": {}}
+        df = VirtualDataFrame(
+            data_loader=loader, name="orders", schema={"name": "orders"}
+        )
+
+        result = sandbox.execute(
+            "df = dfs[0]\n"
+            "result = {'type': 'number', 'value': "
+            "len(df) * 100 + df.rows_count * 10 "
+            "+ len(df.execute_sql_query('SELECT * FROM orders', max_rows=5))}",
+            [df],
+        )
+
+        # the head is sent, the source is queried by the loader of the agent
+        assert result["value"] == 2 * 100 + 10 * 10 + 10
+        loader.execute_query.assert_called_once_with("SELECT * FROM orders", max_rows=5)
+
+    def test_execute_sql_query(self, sandbox, df):
+        queries = []
+
+        def execute_sql_query(query):
+            queries.append(query)
+            return pd.DataFrame({"total": [42]})
+
+        result = sandbox.execute(
+            "result = {'type': 'number', "
+            "'value': execute_sql_query('SELECT 42')['total'][0]}",
+            [df],
+            execute_sql_query=execute_sql_query,
+        )
+
+        assert result["value"] == 42
+        assert queries == ["SELECT 42"]
+
+    def test_sql_query_timeout(self, sandbox, df):
+        def execute_sql_query(query):
+            time.sleep(2)
+            return pd.DataFrame({"total": [42]})
+
+        sandbox.timeout = 0.5
+        start = time.monotonic()
+        try:
+            with pytest.raises(CodeExecutionTimeoutError):
+                sandbox.execute(
+                    "result = execute_sql_query('SELECT 42')",
+                    [df],
+                    execute_sql_query=execute_sql_query,
+                )
+        finally:
+            sandbox.timeout = 5
+
+        # the query counts in the time limit of the code
+        assert time.monotonic() - start < 1.5
+
+    def test_attached_segments_are_not_tracked(self):
+        shm = shared_memory.SharedMemory(create=True, size=1)
+        try:
+            with patch.object(resource_tracker, "register") as mock_register:
+                attached = _attach_shared_memory(shm.name)
+                attached.close()
+            mock_register.assert_not_called()
+            assert resource_tracker.register is not mock_register
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_error(self, sandbox, df):
+        with pytest.raises(KeyError) as exc_info:
+            sandbox.execute("dfs[0]['missing']", [df])
+
+        assert "Traceback" in str(exc_info.value.__cause__)
+
+    def test_timeout(self, sandbox, df):
+        sandbox.timeout = 0.5
+        try:
+            with pytest.raises(CodeExecutionTimeoutError):
+                sandbox.execute("while True:\n    pass", [df])
+        finally:
+            sandbox.timeout = 5
+
+        # the worker was replaced
+        assert sandbox.execute("result = 1", [df]) == 1
+
+    def test_cancel(self, sandbox, df):
+        cancel_event = threading.Event()
+        threading.Timer(0.5, cancel_event.set).start()
+
+        with pytest.raises(CodeExecutionCancelledError):
+            sandbox.execute("while True:\n    pass", [df], cancel_event=cancel_event)
+
+    def test_invalid_max_workers(self):
+        with pytest.raises(ValueError):
+            SandboxExecutor(max_workers=0)
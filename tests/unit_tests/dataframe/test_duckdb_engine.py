@@ -0,0 +1,93 @@
+import duckdb
+import pandas as pd
+import pytest
+
+from pandasai.data_loader.duckdb_engine import DuckDBEngine
+from pandasai.data_loader.parquet import write_parquet
+from pandasai.exceptions import MaliciousQueryError
+
+
+class TestDuckDBEngine:
+    @pytest.fixture
+    def sample_df(self):
+        return pd.DataFrame(
+            {"year": [2023, 2024, 2024, 2024], "amount": [1.0, 2.0, 3.0, 4.0]}
+        )
+
+    def test_execute_on_csv(self, sample_df, tmp_path):
+        path = str(tmp_path / "sales.csv")
+        sample_df.to_csv(path, index=False)
+        engine = DuckDBEngine("sales", path, "csv")
+
+        result = engine.execute(
+            "SELECT year, SUM(amount) AS total FROM sales GROUP BY year ORDER BY year"
+        )
+        assert result.to_dict("records") == [
+            {"year": 2023, "total": 1.0},
+            {"year": 2024, "total": 9.0},
+        ]
+
+    def test_execute_on_partitioned_parquet(self, sample_df, tmp_path):
+        path = str(tmp_path / "data")
+        write_parquet(sample_df, path, partition_by=["year"])
+        engine = DuckDBEngine("Sales-Data", path, "parquet")
+
+        result = engine.execute('SELECT COUNT(*) FROM "sales-data" WHERE year = 2024')
+        assert result.iloc[0, 0] == 3
+
+    def test_stream(self, sample_df, tmp_path):
+        path = str(tmp_path / "sales.parquet")
+        sample_df.to_parquet(path, index=False)
+        engine = DuckDBEngine("sales", path, "parquet")
+
+        chunks = list(engine.stream("SELECT * FROM sales", chunk_size=3))
+        assert [len(chunk) for chunk in chunks] == [3, 1]
+
+        chunks = list(engine.stream("SELECT * FROM sales WHERE year = 0", 3))
+        assert len(chunks) == 1
+        assert chunks[0].columns.tolist() == ["year", "amount"]
+        assert chunks[0].empty
+
+    def test_unsupported_source_type(self):
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            DuckDBEngine("sales", "sales.json", "json")
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "SELECT * FROM read_csv('/etc/hostname')",
+            "SELECT * FROM read_text('/etc/passwd')",
+            "SELECT * FROM sales UNION ALL SELECT * FROM read_csv('{other}')",
+        ],
+    )
+    def test_other_files_are_not_readable(self, sample_df, tmp_path, query):
+        path = str(tmp_path / "sales.csv")
+        sample_df.to_csv(path, index=False)
+        sample_df.to_csv(tmp_path / "other.csv", index=False)
+        engine = DuckDBEngine("sales", path, "csv")
+
+        with pytest.raises(duckdb.PermissionException):
+            engine.execute(query.format(other=tmp_path / "other.csv"))
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "COPY sales TO '{path}'",
+            "ATTACH '{path}' AS other",
+            "INSTALL httpfs",
+            "SET enable_external_access = true",
+            "SELECT * FROM sales; DROP VIEW sales",
+        ],
+    )
+    def test_only_select_queries_run(self, sample_df, tmp_path, query):
+        path = str(tmp_path / "sales.csv")
+        sample_df.to_csv(path, index=False)
+        engine = DuckDBEngine("sales", path, "csv")
+
+        with pytest.raises(MaliciousQueryError):
+            engine.execute(query.format(path=tmp_path / "copy.csv"))
+        with pytest.raises(MaliciousQueryError):
+            list(engine.stream(query.format(path=tmp_path / "copy.csv"), 10))
+
+        assert not (tmp_path / "copy.csv").exists()
+        assert len(engine.execute("SELECT * FROM sales")) == 4
@@ -0,0 +1,138 @@
+from unittest.mock import MagicMock, patch
+
+import duckdb
+import pandas as pd
+import pytest
+
+from pandasai.data_loader.federated_engine import FederatedQueryEngine
+from pandasai.data_loader.loader import DatasetLoader
+from pandasai.dataframe.base import DataFrame
+from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
+from pandasai.exceptions import MaliciousQueryError, QueryResultTooLargeError
+
+
+class TestFederatedQueryEngine:
+    @pytest.fixture
+    def customers(self):
+        data = pd.DataFrame(
+            {
+                "id": [1, 2, 3],
+                "country": ["FR", "DE", "US"],
+                "segment": ["smb", "enterprise", "smb"],
+            }
+        )
+        loader = MagicMock()
+        loader.load_head.return_value = data.head(0)
+        loader.execute_query.return_value = data[data["country"] != "US"][
+            ["id", "country"]
+        ]
+        schema = {
+            "name": "customers",
+            "source": {
+                "type": "postgres",
+                "connection": {"host": "localhost", "database": "crm"},
+                "table": "customers",
+            },
+        }
+        return VirtualDataFrame(schema=schema, data_loader=loader, name="customers")
+
+    @pytest.fixture
+    def orders(self, tmp_path):
+        dataset_path = tmp_path / "datasets" / "acme" / "orders"
+        dataset_path.mkdir(parents=True)
+        (dataset_path / "schema.yaml").write_text(
+            "name: orders\nsource:\n  type: parquet\n  path: orders.parquet\n"
+        )
+        pd.DataFrame(
+            {"customer_id": [1, 1, 2, 3], "amount": [10.0, 20.0, 30.0, 40.0]}
+        ).to_parquet(dataset_path / "orders.parquet", index=False)
+
+        with patch(
+            "pandasai.data_loader.loader.find_project_root",
+            return_value=str(tmp_path),
+        ):
+            yield DatasetLoader().load("acme/orders", virtualized=True)
+
+    @pytest.fixture
+    def targets(self):
+        return DataFrame(
+            {"country": ["FR", "DE"], "target": [25.0, 50.0]}, name="targets"
+        )
+
+    def test_join_sources(self, customers, orders, targets):
+        engine = FederatedQueryEngine([customers, orders, targets])
+
+        result = engine.execute_sql_query(
+            "SELECT c.country, SUM(o.amount) AS total, MAX(t.target) AS target "
+            "FROM orders o "
+            "JOIN customers c ON o.customer_id = c.id "
+            "JOIN targets t ON t.country = c.country "
+            "WHERE c.country IN ('FR', 'DE') "
+            "GROUP BY c.country ORDER BY c.country"
+        )
+
+        assert result.to_dict("records") == [
+            {"country": "DE", "total": 30.0, "target": 50.0},
+            {"country": "FR", "total": 30.0, "target": 25.0},
+        ]
+        customers._loader.execute_query.assert_called_once_with(
+            "SELECT id, country FROM customers WHERE country IN ('FR', 'DE')",
+            query_cache=None,
+        )
+
+    def test_pushdown(self, customers, orders):
+        engine = FederatedQueryEngine([customers, orders])
+
+        scans = engine._get_scans(
+            "SELECT * FROM orders o LEFT JOIN customers c ON o.customer_id = c.id "
+            "WHERE 2 < c.id AND o.amount > 5 AND (c.segment = 'smb' OR c.id = 1)"
+        )
+        assert scans == {
+            "customers": (None, [("id", ">", 2)]),
+            "orders": (None, [("amount", ">", 5)]),
+        }
+
+        scans = engine._get_scans(
+            "SELECT segment FROM customers WHERE id NOT IN (1, 2) "
+            "UNION ALL SELECT segment FROM customers WHERE id = 3"
+        )
+        assert scans == {"customers": (["id", "segment"], [])}
+
+    def test_unused_sources_are_not_read(self, customers, orders):
+        engine = FederatedQueryEngine([customers, orders])
+
+        result = engine.execute_sql_query("SELECT COUNT(*) AS n FROM orders")
+
+        assert result["n"].tolist() == [4]
+        customers._loader.execute_query.assert_not_called()
+
+    def test_result_limits(self, customers, orders):
+        engine = FederatedQueryEngine([customers, orders])
+
+        with pytest.raises(QueryResultTooLargeError):
+            engine.execute_sql_query("SELECT * FROM orders", max_rows=2)
+
+        result = engine.execute_sql_query(
+            "SELECT * FROM orders", max_rows=2, truncate=True
+        )
+        assert len(result) == 2
+
+    def test_other_files_are_not_readable(self, customers, orders, targets):
+        engine = FederatedQueryEngine([customers, orders, targets])
+
+        for query in [
+            "SELECT * FROM read_csv('/etc/passwd')",
+            "SELECT t.country FROM targets t, read_csv('/etc/passwd') p",
+        ]:
+            with pytest.raises(RuntimeError) as error:
+                engine.execute_sql_query(query)
+            assert isinstance(error.value.__cause__, duckdb.PermissionException)
+
+    def test_only_select_queries_run(self, customers, orders, tmp_path):
+        engine = FederatedQueryEngine([customers, orders])
+
+        with pytest.raises(MaliciousQueryError):
+            engine.execute_sql_query(f"COPY orders TO '{tmp_path / 'orders.csv'}'")
+
+        assert not (tmp_path / "orders.csv").exists()
+        customers._loader.execute_query.assert_not_called()
@@ -0,0 +1,32 @@
+import pytest
+
+from pandasai.dataframe.base import DataFrame
+
+
+class TestDataFrameFingerprint:
+    @pytest.fixture
+    def sample_df(self):
+        return DataFrame(
+            {
+                "Name": ["John", "Emma", "Liam", "Olivia", "Noah"],
+                "Age": [28, 35, 22, 31, 40],
+            }
+        )
+
+    def test_fingerprint(self, sample_df):
+        fingerprint = sample_df.get_fingerprint()
+        assert fingerprint == DataFrame(sample_df.copy()).get_fingerprint()
+
+        sample_df.loc[0, "Age"] = 29
+        assert sample_df.get_fingerprint() != fingerprint
+
+    def test_fingerprint_hashes_every_row(self):
+        df = DataFrame({"value": range(1_000_000)})
+        fingerprint = df.get_fingerprint()
+
+        df.iloc[1500, 0] = -5
+        assert df.get_fingerprint() != fingerprint
+
+    def test_fingerprint_with_unhashable_values(self):
+        df = DataFrame({"values": [[1, 2], [3]]})
+        assert isinstance(df.get_fingerprint(), str)
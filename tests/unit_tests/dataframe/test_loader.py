@@ -1,8 +1,13 @@
+import json
+
 import pytest
 from unittest.mock import patch, mock_open
 import pandas as pd
 from pandasai.dataframe.base import DataFrame
+from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
 from pandasai.data_loader.loader import DatasetLoader
+from pandasai.exceptions import QueryResultTooLargeError
+from pandasai.helpers.query_cache import QueryCache
 from datetime import datetime, timedelta
 
 
@@ -227,5 +232,368 @@ class TestDatasetLoader:
         with pytest.raises(ValueError, match="Unsupported cache format: unsupported"):
             loader._cache_data(df, "dummy_path")
 
+    def test_get_fingerprint(self, sample_schema):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+        sample_schema["source"]["update_column"] = "updated_at"
+
+        with patch.object(
+            loader,
+            "execute_query",
+            return_value=pd.DataFrame({"count": [10], "max": ["2024-01-01"]}),
+        ) as mock_execute_query:
+            fingerprint = loader.get_fingerprint()
+            mock_execute_query.assert_called_once_with(
+                "SELECT COUNT(*), MAX(updated_at) FROM users"
+            )
+
+        with patch.object(
+            loader,
+            "execute_query",
+            return_value=pd.DataFrame({"count": [11], "max": ["2024-01-02"]}),
+        ):
+            assert loader.get_fingerprint() != fingerprint
+
+    def test_get_metadata(self, sample_schema, tmp_path):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+        # the min and max of the string columns aren't computed
+        stats = pd.DataFrame([[3, 3, 3, 2, "2024-01-01", "2024-01-03"]])
+        head = pd.DataFrame(
+            {
+                "email": ["a@x.com", "b@x.com", "c@x.com"],
+                "first_name": ["Ann", "Bob", "Cid"],
+                "timestamp": ["2024-01-01", "2024-01-03", None],
+            }
+        )
+
+        with patch.object(
+            loader, "_get_abs_dataset_path", return_value=str(tmp_path)
+        ), patch.object(
+            loader, "execute_query", side_effect=[stats, head]
+        ) as mock_execute_query:
+            metadata = loader.get_metadata()
+            assert loader.get_metadata() is metadata
+            assert mock_execute_query.call_count == 2
+
+        assert metadata["rows_count"] == 3
+        assert metadata["columns"]["timestamp"] == {
+            "non_null_count": 2,
+            "min": "2024-01-01",
+            "max": "2024-01-03",
+        }
+        assert metadata["columns"]["email"] == {"non_null_count": 3}
+        assert (tmp_path / "metadata.json").exists()
+
+        # a new loader reads the metadata from the file
+        other_loader = loader.copy()
+        with patch.object(
+            other_loader, "_get_abs_dataset_path", return_value=str(tmp_path)
+        ), patch.object(other_loader, "execute_query") as mock_execute_query:
+            assert other_loader.get_metadata() == metadata
+            pd.testing.assert_frame_equal(other_loader.load_head(), head)
+            mock_execute_query.assert_not_called()
+
+    def test_get_metadata_refreshes_stale_metadata(self, sample_schema, tmp_path):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+        stale_metadata = {
+            "schema_hash": loader._get_schema_hash(),
+            "refreshed_at": (datetime.now() - timedelta(days=2)).isoformat(),
+        }
+        (tmp_path / "metadata.json").write_text(json.dumps(stale_metadata))
+
+        with patch.object(
+            loader, "_get_abs_dataset_path", return_value=str(tmp_path)
+        ), patch.object(loader, "refresh_metadata") as mock_refresh_metadata:
+            loader.get_metadata()
+            mock_refresh_metadata.assert_called_once()
+
+            loader.schema["metadata_refresh_frequency"] = "weekly"
+            loader._metadata = None
+            loader.get_metadata()
+            mock_refresh_metadata.assert_called_once()
+
+    def test_refresh_metadata_without_stats(self, sample_schema, tmp_path):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+        head = pd.DataFrame({"email": ["a@x.com"], "first_name": ["Ann"]})
+
+        with patch.object(
+            loader, "_get_abs_dataset_path", return_value=str(tmp_path)
+        ), patch.object(
+            loader,
+            "execute_query",
+            side_effect=[Exception("cannot aggregate"), pd.DataFrame([[1]]), head],
+        ):
+            metadata = loader.refresh_metadata()
+
+        # the source can't compute the stats, only the row count is stored
+        assert metadata["rows_count"] == 1
+        assert metadata["columns"] == {}
+        assert (tmp_path / "metadata.json").exists()
+
+    def test_is_cache_valid_with_cron_expression(self, sample_schema):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+        sample_schema["update_frequency"] = "0 0 * * *"
+
+        with patch("os.path.exists", return_value=True), patch(
+            "os.path.getmtime", return_value=datetime.now().timestamp()
+        ):
+            assert loader._is_cache_valid("dummy_path") is True
+
+        with patch("os.path.exists", return_value=True), patch(
+            "os.path.getmtime",
+            return_value=(datetime.now() - timedelta(days=1)).timestamp(),
+        ):
+            assert loader._is_cache_valid("dummy_path") is False
+
+        sample_schema["update_frequency"] = "sometimes"
+        with patch("os.path.exists", return_value=True), patch(
+            "os.path.getmtime", return_value=datetime.now().timestamp()
+        ):
+            with pytest.raises(ValueError, match="Unsupported refresh frequency"):
+                loader._is_cache_valid("dummy_path")
+
+    @pytest.fixture
+    def incremental_loader(self, sample_schema, tmp_path):
+        sample_schema["source"]["update_column"] = "id"
+        sample_schema["source"]["primary_key"] = "email"
+        sample_schema["destination"]["incremental"] = True
+        sample_schema["destination"]["compaction_threshold"] = 2
+        sample_schema["transformations"] = []
+        del sample_schema["update_frequency"]
+
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+        with patch.object(loader, "_get_abs_dataset_path", return_value=str(tmp_path)):
+            yield loader
+
+    def test_load_incrementally(self, incremental_loader, tmp_path):
+        loader = incremental_loader
+        cache_file = str(tmp_path / "users.parquet")
+        rows = pd.DataFrame({"id": [1, 2], "email": ["a@x.com", "b@x.com"]})
+
+        with patch.object(loader, "execute_query", return_value=rows) as mock_query:
+            result = loader._load_incrementally(cache_file)
+            mock_query.assert_called_once_with(
+                "SELECT email, first_name, timestamp FROM users "
+                "ORDER BY created_at DESC LIMIT 100"
+            )
+        pd.testing.assert_frame_equal(result, rows)
+
+        # only the rows updated since the last refresh are fetched and appended
+        increment = pd.DataFrame({"id": [3], "email": ["a@x.com"]})
+        with patch.object(
+            loader, "execute_query", return_value=increment
+        ) as mock_query:
+            result = loader._load_incrementally(cache_file)
+            mock_query.assert_called_once_with(
+                "SELECT email, first_name, timestamp FROM users "
+                "WHERE id > 2 ORDER BY created_at DESC"
+            )
+        assert len(loader._get_increment_files(cache_file)) == 1
+        assert sorted(result["id"].tolist()) == [2, 3]
+
+        # the increments are compacted into the main file
+        increment = pd.DataFrame({"id": [4], "email": ["c@x.com"]})
+        with patch.object(loader, "execute_query", return_value=increment):
+            result = loader._load_incrementally(cache_file)
+        assert loader._get_increment_files(cache_file) == []
+        pd.testing.assert_frame_equal(pd.read_parquet(cache_file), result)
+        assert sorted(result["id"].tolist()) == [2, 3, 4]
+
+        with open(tmp_path / "materialization.json") as file:
+            assert json.load(file)["cursor"] == 4
+
+    def test_load_incrementally_reloads_on_schema_change(
+        self, incremental_loader, tmp_path
+    ):
+        loader = incremental_loader
+        cache_file = str(tmp_path / "users.parquet")
+        rows = pd.DataFrame({"id": [1, 2], "email": ["a@x.com", "b@x.com"]})
+
+        with patch.object(loader, "execute_query", return_value=rows):
+            loader._load_incrementally(cache_file)
+
+        loader.schema["columns"].append({"name": "last_name", "type": "string"})
+        with patch.object(loader, "execute_query", return_value=rows) as mock_query:
+            loader._load_incrementally(cache_file)
+            assert "WHERE" not in mock_query.call_args[0][0]
+
+    def test_load_incrementally_skips_fresh_materialization(
+        self, incremental_loader, tmp_path
+    ):
+        loader = incremental_loader
+        loader.schema["update_frequency"] = "hourly"
+        cache_file = str(tmp_path / "users.parquet")
+        rows = pd.DataFrame({"id": [1, 2], "email": ["a@x.com", "b@x.com"]})
+
+        with patch.object(loader, "execute_query", return_value=rows):
+            loader._load_incrementally(cache_file)
+
+        with patch.object(loader, "execute_query") as mock_query:
+            pd.testing.assert_frame_equal(loader._load_incrementally(cache_file), rows)
+            mock_query.assert_not_called()
+
+    def test_load_partitioned_dataset_with_filters(self, tmp_path):
+        dataset_path = tmp_path / "datasets" / "org" / "sales"
+        dataset_path.mkdir(parents=True)
+        (dataset_path / "schema.yaml").write_text(
+            "name: sales\n"
+            "source:\n  type: parquet\n  path: data\n"
+            "destination:\n  type: local\n  format: parquet\n  path: data\n"
+            "  partition_by: [year, month]\n"
+        )
+        df = pd.DataFrame(
+            {"year": [2023, 2024, 2024], "month": [12, 1, 2], "amount": [1, 2, 3]}
+        )
+
+        with patch(
+            "pandasai.data_loader.loader.find_project_root",
+            return_value=str(tmp_path),
+        ):
+            loader = DatasetLoader()
+            loader.dataset_path = "org/sales"
+            loader._load_schema()
+            loader._cache_data(df, loader._get_cache_file_path())
+            assert (dataset_path / "data" / "year=2024" / "month=1").is_dir()
+
+            with patch("pandas.DataFrame.to_parquet") as mock_to_parquet:
+                result = loader.load(
+                    "org/sales", filters=[("year", "=", 2024)], columns=["amount"]
+                )
+                # a part of the dataset is not written back
+                mock_to_parquet.assert_not_called()
+
+        assert isinstance(result, DataFrame)
+        assert result.columns.tolist() == ["amount"]
+        assert sorted(result["amount"].tolist()) == [2, 3]
+
+    def test_load_from_source_with_filters(self, sample_schema):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+
+        with patch.object(
+            loader, "execute_query", return_value=pd.DataFrame()
+        ) as mock_execute_query:
+            loader._load_from_source(
+                filters=[("first_name", "=", "Ann")], columns=["email"]
+            )
+            mock_execute_query.assert_called_once_with(
+                "SELECT email FROM users WHERE first_name = 'Ann' "
+                "ORDER BY created_at DESC LIMIT 100"
+            )
+
+    def test_execute_query_with_query_cache(self, sample_schema):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+        query_cache = QueryCache()
+        result = pd.DataFrame({"id": [1, 2]})
+
+        with patch.object(
+            loader, "_get_loader_function", return_value=lambda *args: result
+        ) as mock_get_loader_function, patch.object(
+            loader, "get_fingerprint", return_value="fingerprint"
+        ) as mock_get_fingerprint:
+            loader.execute_query("SELECT id FROM users", query_cache=query_cache)
+            cached = loader.execute_query(
+                "select id\nfrom users", query_cache=query_cache
+            )
+            assert mock_get_loader_function.call_count == 1
+            assert mock_get_fingerprint.call_count == 1
+
+            # the source changed
+            query_cache.fingerprint_ttl = 0
+            mock_get_fingerprint.return_value = "other fingerprint"
+            loader.execute_query("SELECT id FROM users", query_cache=query_cache)
+            assert mock_get_loader_function.call_count == 2
+
+        pd.testing.assert_frame_equal(cached, result)
+
+    def test_load_virtualized_csv(self, tmp_path):
+        dataset_path = tmp_path / "datasets" / "org" / "events"
+        dataset_path.mkdir(parents=True)
+        (dataset_path / "schema.yaml").write_text(
+            "name: events\n"
+            "source:\n  type: csv\n  path: events.csv\n"
+            "destination:\n  type: local\n  format: parquet\n"
+        )
+        pd.DataFrame({"kind": ["a", "b", "a"], "amount": [1, 2, 3]}).to_csv(
+            dataset_path / "events.csv", index=False
+        )
+
+        with patch(
+            "pandasai.data_loader.loader.find_project_root",
+            return_value=str(tmp_path),
+        ):
+            df = DatasetLoader().load("org/events", virtualized=True)
+            fingerprint = df.get_fingerprint()
+
+            assert isinstance(df, VirtualDataFrame)
+            assert df.rows_count == 3
+            result = df.execute_sql_query(
+                "SELECT kind, SUM(amount) AS total FROM events "
+                "GROUP BY kind ORDER BY kind"
+            )
+            assert result.to_dict("records") == [
+                {"kind": "a", "total": 4},
+                {"kind": "b", "total": 2},
+            ]
+
+            (dataset_path / "events.csv").write_text("kind,amount\nc,4\n")
+            assert df.get_fingerprint() != fingerprint
+
+    def _stream_from(self, rows, chunk_size=2):
+        def stream_function(connection_info, query, chunk_size):
+            for start in range(0, rows, chunk_size):
+                yield pd.DataFrame({"id": range(start, min(start + chunk_size, rows))})
+
+        return stream_function
+
+    def test_iter_query(self, sample_schema):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+
+        with patch.object(
+            loader, "_get_loader_function", return_value=self._stream_from(5)
+        ) as mock_get_loader_function:
+            chunks = list(loader.iter_query("SELECT id FROM users", chunk_size=2))
+            mock_get_loader_function.assert_called_once_with("mysql", "stream_from")
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    def test_iter_query_max_rows(self, sample_schema):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+
+        with patch.object(
+            loader, "_get_loader_function", return_value=self._stream_from(5)
+        ):
+            with pytest.raises(QueryResultTooLargeError):
+                list(loader.iter_query("SELECT id FROM users", max_rows=3))
+
+            result = loader.execute_query(
+                "SELECT id FROM users", max_rows=3, truncate=True
+            )
+            assert result["id"].tolist() == [0, 1, 2]
+
+    def test_iter_query_max_bytes(self, sample_schema):
+        loader = DatasetLoader()
+        loader.schema = sample_schema
+
+        with patch.object(
+            loader, "_get_loader_function", return_value=self._stream_from(100)
+        ):
+            with pytest.raises(QueryResultTooLargeError):
+                loader.execute_query("SELECT id FROM users", max_bytes=500)
+
+            result = loader.execute_query(
+                "SELECT id FROM users", max_bytes=500, truncate=True
+            )
+            assert 0 < len(result) < 100
+            assert result.memory_usage(index=False, deep=True).sum() <= 500
+
 
 # Add more tests for _load_from_source and other methods as needed
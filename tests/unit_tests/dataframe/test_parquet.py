@@ -0,0 +1,100 @@
+import os
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from pandasai.data_loader.parquet import filter_dataframe, read_parquet, write_parquet
+
+
+class TestParquet:
+    @pytest.fixture
+    def sample_df(self):
+        return pd.DataFrame(
+            {
+                "year": [2020, 2020, 2021, 2024] * 3,
+                "month": ["01", "02", "01", "03"] * 3,
+                "value": range(12),
+            }
+        )
+
+    def test_write_and_read_partitioned_dataset(self, sample_df, tmp_path):
+        path = str(tmp_path / "data")
+        write_parquet(sample_df, path, partition_by=["year", "month"])
+
+        assert sorted(os.listdir(path)) == ["year=2020", "year=2021", "year=2024"]
+        assert sorted(os.listdir(os.path.join(path, "year=2020"))) == [
+            "month=01",
+            "month=02",
+        ]
+
+        # the columns are read in their original order and with their dtypes
+        result = read_parquet(path).sort_values("value", ignore_index=True)
+        pd.testing.assert_frame_equal(result, sample_df)
+
+    def test_read_partitioned_dataset_with_filters(self, sample_df, tmp_path):
+        path = str(tmp_path / "data")
+        write_parquet(sample_df, path, partition_by=["year", "month"])
+
+        result = read_parquet(
+            path,
+            filters=[("year", "=", 2024), ("month", "=", "03")],
+            columns=["value"],
+        )
+        assert result.columns.tolist() == ["value"]
+        assert sorted(result["value"].tolist()) == [3, 7, 11]
+
+    def test_write_parquet_with_row_group_size(self, sample_df, tmp_path):
+        import pyarrow.parquet as pq
+
+        path = str(tmp_path / "data.parquet")
+        write_parquet(sample_df, path, row_group_size=5)
+        assert pq.ParquetFile(path).num_row_groups == 3
+
+    def test_write_parquet_replaces_dataset(self, sample_df, tmp_path):
+        path = str(tmp_path / "data")
+        write_parquet(sample_df, path, partition_by=["year"])
+        write_parquet(sample_df[sample_df["year"] == 2020], path, partition_by=["year"])
+
+        assert os.listdir(path) == ["year=2020"]
+        assert os.listdir(tmp_path) == ["data"]
+
+    def test_write_parquet_keeps_index(self, sample_df, tmp_path):
+        df = sample_df.set_index("value")
+
+        path = str(tmp_path / "data.parquet")
+        write_parquet(df, path)
+        pd.testing.assert_frame_equal(pd.read_parquet(path), df)
+
+        write_parquet(df, path, index=False)
+        assert pd.read_parquet(path).columns.tolist() == ["year", "month"]
+
+    def test_write_parquet_keeps_dataset_on_failed_swap(self, sample_df, tmp_path):
+        path = str(tmp_path / "data")
+        write_parquet(sample_df, path, partition_by=["year"])
+
+        replace = os.replace
+
+        def fail_on_new_dataset(src, dst):
+            if src.endswith(".tmp"):
+                raise OSError("disk full")
+            replace(src, dst)
+
+        with patch("os.replace", side_effect=fail_on_new_dataset), pytest.raises(
+            OSError
+        ):
+            write_parquet(sample_df.head(1), path, partition_by=["year"])
+
+        # the previous dataset is restored and the new one cleaned up
+        assert os.listdir(tmp_path) == ["data"]
+        assert len(read_parquet(path)) == len(sample_df)
+
+    def test_filter_dataframe(self, sample_df):
+        assert filter_dataframe(sample_df) is sample_df
+
+        result = filter_dataframe(
+            sample_df,
+            filters=[[("value", ">", 9)], [("month", "=", "02")]],
+            columns=["value"],
+        )
+        assert result["value"].tolist() == [1, 5, 9, 10, 11]
@@ -49,3 +49,169 @@ class TestQueryBuilder:
         query = query_builder.build_query()
         expected_query = "SELECT email, first_name, timestamp FROM users ORDER BY created_at DESC, email ASC LIMIT 100"
         assert query == expected_query
+
+    def test_build_incremental_query(self, sample_schema):
+        sample_schema["source"]["update_column"] = "updated_at"
+        query_builder = QueryBuilder(sample_schema)
+        assert query_builder.build_incremental_query(42) == (
+            "SELECT email, first_name, timestamp FROM users "
+            "WHERE updated_at > 42 ORDER BY created_at DESC"
+        )
+        assert query_builder.build_incremental_query("2024-01-01 10:00:00") == (
+            "SELECT email, first_name, timestamp FROM users "
+            "WHERE updated_at > '2024-01-01 10:00:00' ORDER BY created_at DESC"
+        )
+
+    def test_get_fingerprint_query(self, sample_schema):
+        query_builder = QueryBuilder(sample_schema)
+        assert query_builder.get_fingerprint_query() == "SELECT COUNT(*) FROM users"
+
+    def test_get_fingerprint_query_with_update_column(self, sample_schema):
+        sample_schema["source"]["update_column"] = "updated_at"
+        query_builder = QueryBuilder(sample_schema)
+        assert (
+            query_builder.get_fingerprint_query()
+            == "SELECT COUNT(*), MAX(updated_at) FROM users"
+        )
+
+    def test_get_head_query(self, sample_schema):
+        sample_schema["source"]["type"] = "postgres"
+        query_builder = QueryBuilder(sample_schema)
+        assert (
+            query_builder.get_head_query()
+            == "SELECT email, first_name, timestamp FROM users ORDER BY RANDOM() LIMIT 5"
+        )
+
+    def test_get_head_query_with_tablesample(self, sample_schema):
+        sample_schema["source"]["type"] = "postgres"
+        query_builder = QueryBuilder(sample_schema)
+        assert (
+            query_builder.get_head_query(rows_count=1_000_000)
+            == "SELECT email, first_name, timestamp FROM users TABLESAMPLE SYSTEM (0.1) LIMIT 5"
+        )
+
+    def test_get_head_query_with_random_predicate(self, sample_schema):
+        sample_schema["source"]["type"] = "mysql"
+        query_builder = QueryBuilder(sample_schema)
+        assert (
+            query_builder.get_head_query(rows_count=1_000_000)
+            == "SELECT email, first_name, timestamp FROM users WHERE RAND() < 0.001 LIMIT 5"
+        )
+
+    def test_get_head_query_of_small_table(self, sample_schema):
+        sample_schema["source"]["type"] = "mysql"
+        query_builder = QueryBuilder(sample_schema)
+        assert query_builder.get_head_query(rows_count=100) == (
+            "SELECT email, first_name, timestamp FROM users ORDER BY RAND() LIMIT 5"
+        )
+
+    def test_get_stats_query(self, sample_schema):
+        sample_schema["columns"][2]["type"] = "datetime"
+        query_builder = QueryBuilder(sample_schema)
+        assert query_builder.get_stats_query() == (
+            "SELECT COUNT(*), COUNT(email), COUNT(first_name), "
+            "COUNT(timestamp), MIN(timestamp), MAX(timestamp) FROM users"
+        )
+
+    def test_build_query_with_schema_filters(self, sample_schema):
+        sample_schema["source"]["type"] = "postgres"
+        sample_schema["filters"] = ["country = 'FR'", "created_at >= :since"]
+        sample_schema["params"] = {"since": "2024-01-01"}
+        query_builder = QueryBuilder(sample_schema)
+        assert query_builder.build_query() == (
+            "SELECT email, first_name, timestamp FROM users "
+            "WHERE country = 'FR' AND created_at >= '2024-01-01' "
+            "ORDER BY created_at DESC LIMIT 100"
+        )
+
+        # the parameters are bound as escaped literals
+        query_builder = QueryBuilder(sample_schema, params={"since": "x' OR 1=1"})
+        assert "created_at >= 'x'' OR 1=1'" in query_builder.build_query()
+
+    def test_build_query_with_missing_params(self, sample_schema):
+        sample_schema["filters"] = ["created_at >= :since"]
+        query_builder = QueryBuilder(sample_schema)
+        with pytest.raises(ValueError, match="Missing values of the parameters"):
+            query_builder.build_query()
+
+    def test_build_query_with_filters_and_columns(self, sample_schema):
+        del sample_schema["limit"]
+        query_builder = QueryBuilder(
+            sample_schema,
+            filters=[
+                [("first_name", "in", ["Ann", "Bob"]), ("timestamp", ">", 10)],
+                [("email", "=", "a@x.com")],
+            ],
+            columns=["first_name", "email"],
+        )
+        assert query_builder.build_query() == (
+            "SELECT first_name, email FROM users "
+            "WHERE (first_name IN ('Ann', 'Bob') AND timestamp > 10) "
+            "OR email = 'a@x.com' ORDER BY created_at DESC"
+        )
+
+        query_builder = QueryBuilder(sample_schema, columns=["last_name"])
+        with pytest.raises(ValueError, match="Columns not found in schema"):
+            query_builder.build_query()
+
+    def test_build_query_with_computed_columns(self, sample_schema):
+        sample_schema["source"]["type"] = "bigquery"
+        sample_schema["columns"].append(
+            {"name": "domain", "expression": "SPLIT(email, '@')[OFFSET(1)]"}
+        )
+        query_builder = QueryBuilder(sample_schema, columns=["domain"])
+        assert query_builder.build_query() == (
+            "SELECT SPLIT(email, '@')[OFFSET(1)] AS domain FROM users "
+            "ORDER BY created_at DESC LIMIT 100"
+        )
+
+    @pytest.mark.parametrize(
+        "source_type,expected",
+        [
+            ("postgres", "WHERE note = 'it''s'"),
+            ("mysql", "WHERE note = 'it''s'"),
+            ("sqlite", "WHERE note = 'it''s'"),
+            ("snowflake", "WHERE note = 'it\\'s'"),
+            ("bigquery", "WHERE note = 'it\\'s'"),
+        ],
+    )
+    def test_filters_are_rendered_in_dialect(
+        self, sample_schema, source_type, expected
+    ):
+        sample_schema["source"]["type"] = source_type
+        query_builder = QueryBuilder(sample_schema, filters=[("note", "=", "it's")])
+        assert expected in query_builder.get_row_count()
+
+    def test_filters_restrict_head_and_stats_queries(self, sample_schema):
+        sample_schema["source"]["type"] = "mysql"
+        sample_schema["filters"] = ["country = 'FR'"]
+        query_builder = QueryBuilder(sample_schema)
+        assert query_builder.get_head_query(rows_count=100000) == (
+            "SELECT email, first_name, timestamp FROM users "
+            "WHERE country = 'FR' AND RAND() < 0.01 LIMIT 5"
+        )
+        assert query_builder.get_stats_query().endswith("WHERE country = 'FR'")
+
+    def test_identifiers_are_quoted_in_dialect(self, sample_schema):
+        sample_schema["source"] = {"type": "mysql", "table": "crm.users"}
+        sample_schema["columns"][1]["name"] = "first name"
+        query_builder = QueryBuilder(sample_schema)
+        assert query_builder.build_query() == (
+            "SELECT email, `first name`, timestamp FROM crm.users "
+            "ORDER BY created_at DESC LIMIT 100"
+        )
+
+    @pytest.mark.parametrize(
+        "source, column",
+        [
+            ({"table": "users; DROP TABLE users"}, "email"),
+            ({"table": "users /* x */"}, "email"),
+            ({"table": "users"}, "email, password"),
+            ({"table": "users"}, 'email"'),
+        ],
+    )
+    def test_invalid_identifiers_are_rejected(self, sample_schema, source, column):
+        sample_schema["source"] = source
+        sample_schema["columns"][0]["name"] = column
+        with pytest.raises(ValueError):
+            QueryBuilder(sample_schema).build_query()
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from pandasai.dataframe.base import DataFrame
+from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
+
+
+class TestSerializeDataFrame:
+    @pytest.fixture
+    def mock_serialize(self):
+        with patch(
+            "pandasai.dataframe.base.DataframeSerializer.serialize",
+            return_value="serialized",
+        ) as mock_serialize:
+            yield mock_serialize
+
+    @pytest.fixture
+    def virtual_df(self):
+        loader = MagicMock()
+        loader.load_head.return_value = pd.DataFrame({"a": [1, 2, 3]})
+        loader.get_metadata.return_value = {"refreshed_at": "2026-10-18T00:00:00"}
+        return VirtualDataFrame(data_loader=loader, name="orders")
+
+    def test_virtual_dataframe_is_memoized(self, virtual_df, mock_serialize):
+        assert virtual_df.serialize_dataframe(0, True, False) == "serialized"
+        assert virtual_df.serialize_dataframe(0, True, False) == "serialized"
+        assert mock_serialize.call_count == 1
+
+        # other serializer options
+        virtual_df.serialize_dataframe(1, True, False)
+        assert mock_serialize.call_count == 2
+
+        # the metadata of the source was refreshed
+        virtual_df._loader.get_metadata.return_value = {
+            "refreshed_at": "2026-10-19T00:00:00"
+        }
+        virtual_df.serialize_dataframe(0, True, False)
+        assert mock_serialize.call_count == 3
+
+    def test_local_dataframe_is_not_memoized(self, mock_serialize):
+        df = DataFrame({"a": [1, 2, 3]})
+
+        df.serialize_dataframe(0, False, False)
+        df.serialize_dataframe(0, False, False)
+
+        # serializing local data is cheaper than fingerprinting it
+        assert mock_serialize.call_count == 2
+
+    def test_derived_dataframes_have_their_own_memo(self):
+        df = DataFrame({"a": [1, 2, 3]}, name="numbers")
+        derived = DataFrame({"a": [2, 3]}).__finalize__(df)
+
+        assert derived.name == "numbers"
+        assert derived._serialized is not df._serialized
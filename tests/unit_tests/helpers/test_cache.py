@@ -1,6 +1,99 @@
+import time
 import uuid
+from types import SimpleNamespace
 
-from pandasai.helpers.cache import Cache
+import pytest
+
+from pandasai.helpers.cache import Cache, InMemoryCache, RedisCache, SQLiteCache
+from pandasai.helpers.memory import Memory
+from pandasai.llm.fake import FakeLLM
+
+
+class FakeRedis:
+    """Minimal in-process stand-in for a Redis client."""
+
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+        self.sorted_sets = {}
+
+    def set(self, name, value, px=None):
+        self.values[name] = value.encode()
+        self.expiry[name] = time.time() + px / 1000 if px else None
+
+    def get(self, name):
+        expires_at = self.expiry.get(name)
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(name)
+        return self.values.get(name)
+
+    def delete(self, *names):
+        for name in names:
+            self.values.pop(name, None)
+            self.expiry.pop(name, None)
+            self.sorted_sets.pop(name, None)
+
+    def zadd(self, name, mapping):
+        self.sorted_sets.setdefault(name, {}).update(mapping)
+
+    def zrem(self, name, *values):
+        members = self.sorted_sets.get(name, {})
+        return sum(members.pop(value, None) is not None for value in values)
+
+    def zcard(self, name):
+        return len(self.sorted_sets.get(name, {}))
+
+    def zrange(self, name, start, end):
+        members = sorted(self.sorted_sets.get(name, {}).items(), key=lambda m: m[1])
+        keys = [key for key, _ in members]
+        return keys[start:] if end == -1 else keys[start : end + 1]
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request):
+    if request.param == "memory":
+        cache = InMemoryCache(max_entries=2)
+    elif request.param == "sqlite":
+        cache = SQLiteCache(filename=f"cache_{uuid.uuid4().hex}", max_entries=2)
+    else:
+        cache = RedisCache(client=FakeRedis(), max_entries=2)
+    yield cache
+    cache.destroy()
+
+
+class TestCacheBackends:
+    def test_set_get_delete(self, backend):
+        backend.set("key", "value")
+        backend.set("key", "new value")
+        assert backend.get("key") == "new value"
+        assert len(backend) == 1
+
+        backend.delete("key")
+        assert backend.get("key") is None
+
+    def test_evicts_least_recently_used(self, backend):
+        backend.set("a", "1")
+        backend.set("b", "2")
+        backend.get("a")
+        backend.set("c", "3")
+
+        assert backend.get("b") is None
+        assert backend.get("a") == "1"
+        assert backend.get("c") == "3"
+
+    def test_expired_entry_is_a_miss(self, backend):
+        backend.set("key", "value", ttl=0.001)
+        time.sleep(0.01)
+
+        assert backend.get("key") is None
+        assert backend.stats()["misses"] == 1
+
+    def test_clear(self, backend):
+        backend.set("a", "1")
+        backend.clear()
+
+        assert len(backend) == 0
+        assert backend.get("a") is None
 
 
 class TestCache:
@@ -26,3 +119,76 @@ class TestCache:
         assert cache.get("key") == "value"
 
         cache.destroy()
+
+    def test_set_replaces_existing_key(self):
+        cache = Cache(filename=f"cache_{uuid.uuid4().hex}")
+        cache.set("key", "value")
+        cache.set("key", "new value")
+
+        assert cache.get("key") == "new value"
+        assert len(cache) == 1
+
+        cache.destroy()
+
+    def test_evicts_least_recently_used(self):
+        cache = Cache(filename=f"cache_{uuid.uuid4().hex}", max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+        assert cache.stats()["evictions"] == 1
+
+        cache.destroy()
+
+    def test_expired_entry_is_a_miss(self):
+        cache = Cache(filename=f"cache_{uuid.uuid4().hex}")
+        cache.set("key", "value", ttl=-1)
+        cache.set("other", "value")
+
+        assert cache.get("key") is None
+        assert cache.get("other") == "value"
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "evictions": 1}
+
+        cache.destroy()
+
+    def test_drops_legacy_table(self):
+        cache_filename = f"cache_{uuid.uuid4().hex}"
+        cache = Cache(filename=cache_filename)
+        cache.connection.execute("DROP TABLE cache")
+        cache.connection.execute("CREATE TABLE cache (key STRING, value STRING)")
+        cache.connection.execute("INSERT INTO cache VALUES ('k', 'v')")
+        cache.close()
+
+        cache = Cache(filename=cache_filename)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+
+        cache.destroy()
+
+    def test_cache_key_is_fixed_width_digest(self):
+        cache = Cache(filename=f"cache_{uuid.uuid4().hex}")
+        memory = Memory(memory_size=10)
+        context = SimpleNamespace(
+            memory=memory,
+            dfs=[SimpleNamespace(column_hash="abc")],
+            config=SimpleNamespace(llm=FakeLLM(), direct_sql=False),
+            output_type=None,
+        )
+
+        memory.add("short question", is_user=True)
+        short_key = cache.get_cache_key(context)
+        memory.add("a much longer question " * 1000, is_user=True)
+        long_key = cache.get_cache_key(context)
+
+        assert len(short_key) == len(long_key) == 64
+        assert short_key != long_key
+        assert cache.get_cache_key(context) == long_key
+
+        context.output_type = "number"
+        assert cache.get_cache_key(context) != long_key
+
+        cache.destroy()
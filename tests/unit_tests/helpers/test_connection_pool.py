@@ -0,0 +1,125 @@
+import sqlite3
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from pandasai.helpers.connection_pool import (
+    ConnectionPool,
+    get_connection_pool,
+    ping,
+)
+
+CONNECTION_INFO = {"host": "localhost", "database": "db"}
+
+
+class TestConnectionPool:
+    def test_reuses_connections(self):
+        pool = ConnectionPool()
+        connect = Mock(side_effect=lambda: Mock())
+
+        with pool.connection("postgres", CONNECTION_INFO, connect) as first:
+            pass
+        with pool.connection("postgres", CONNECTION_INFO, connect) as second:
+            pass
+
+        assert first is second
+        assert connect.call_count == 1
+        assert len(pool) == 1
+
+    def test_keys_on_connection_info(self):
+        pool = ConnectionPool()
+        connect = Mock(side_effect=lambda: Mock())
+
+        with pool.connection("postgres", CONNECTION_INFO, connect):
+            pass
+        with pool.connection("mysql", CONNECTION_INFO, connect):
+            pass
+        with pool.connection("postgres", {**CONNECTION_INFO, "port": 1}, connect):
+            pass
+
+        assert connect.call_count == 3
+
+    def test_discards_connection_on_error(self):
+        pool = ConnectionPool()
+        connection = Mock()
+
+        with pytest.raises(ValueError):
+            with pool.connection("postgres", CONNECTION_INFO, lambda: connection):
+                raise ValueError("query failed")
+
+        connection.close.assert_called_once()
+        assert len(pool) == 0
+
+    def test_health_check(self):
+        pool = ConnectionPool()
+        connect = Mock(side_effect=lambda: Mock())
+
+        with pool.connection("postgres", CONNECTION_INFO, connect) as first:
+            pass
+        with pool.connection(
+            "postgres", CONNECTION_INFO, connect, health_check=lambda conn: False
+        ) as second:
+            pass
+
+        assert first is not second
+        first.close.assert_called_once()
+        assert len(pool) == 1
+
+    def test_idle_timeout(self):
+        pool = ConnectionPool(idle_timeout=0)
+        connect = Mock(side_effect=lambda: Mock())
+
+        with pool.connection("postgres", CONNECTION_INFO, connect) as first:
+            pass
+        with pool.connection("postgres", CONNECTION_INFO, connect):
+            pass
+
+        first.close.assert_called_once()
+        assert connect.call_count == 2
+
+    def test_max_size(self):
+        pool = ConnectionPool(max_size=1, timeout=0.1)
+
+        with pool.connection("postgres", CONNECTION_INFO, Mock):
+            with pytest.raises(TimeoutError):
+                with pool.connection("postgres", CONNECTION_INFO, Mock):
+                    pass
+
+    def test_waits_for_a_connection(self):
+        pool = ConnectionPool(max_size=1)
+        connections = []
+
+        def borrow():
+            with pool.connection("postgres", CONNECTION_INFO, Mock) as connection:
+                connections.append(connection)
+
+        threads = [threading.Thread(target=borrow) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(connections) == 5
+        assert len(set(map(id, connections))) == 1
+
+    def test_close_all(self):
+        pool = ConnectionPool()
+        with pool.connection("postgres", CONNECTION_INFO, Mock) as connection:
+            pass
+
+        pool.close_all()
+
+        connection.close.assert_called_once()
+        assert len(pool) == 0
+
+    def test_ping(self):
+        connection = sqlite3.connect(":memory:")
+        assert ping(connection) is True
+
+        connection.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            ping(connection)
+
+    def test_get_connection_pool(self):
+        assert get_connection_pool() is get_connection_pool()
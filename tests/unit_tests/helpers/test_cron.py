@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import pytest
+
+from pandasai.helpers.cron import get_previous_cron_time, parse_cron
+
+
+class TestCron:
+    def test_parse_cron(self):
+        values, days_set, weekdays_set = parse_cron("*/15 9-17 * * 1,7")
+        assert values[0] == {0, 15, 30, 45}
+        assert values[1] == set(range(9, 18))
+        assert values[4] == {0, 1}
+        assert not days_set
+        assert weekdays_set
+
+    @pytest.mark.parametrize(
+        "expression", ["* * * *", "60 * * * *", "* * 0 * *", "a * * * *"]
+    )
+    def test_parse_invalid_cron(self, expression):
+        with pytest.raises(ValueError, match="Invalid cron expression"):
+            parse_cron(expression)
+
+    @pytest.mark.parametrize(
+        "expression,expected",
+        [
+            ("* * * * *", datetime(2024, 3, 13, 10, 42)),
+            ("0 * * * *", datetime(2024, 3, 13, 10, 0)),
+            ("30 11 * * *", datetime(2024, 3, 12, 11, 30)),
+            ("0 0 * * 1", datetime(2024, 3, 11, 0, 0)),
+            ("0 0 1 * *", datetime(2024, 3, 1, 0, 0)),
+            ("0 0 1 1 *", datetime(2024, 1, 1, 0, 0)),
+            # either the day of month or the day of week
+            ("0 0 12 * 0", datetime(2024, 3, 12, 0, 0)),
+        ],
+    )
+    def test_get_previous_cron_time(self, expression, expected):
+        # a Wednesday
+        now = datetime(2024, 3, 13, 10, 42, 30)
+        assert get_previous_cron_time(expression, now) == expected
+
+    def test_get_previous_cron_time_never_matches(self):
+        with pytest.raises(ValueError, match="never matches"):
+            get_previous_cron_time("0 0 31 2 *", datetime(2024, 3, 13))
@@ -0,0 +1,92 @@
+import time
+
+import pandas as pd
+import pytest
+
+from pandasai.helpers.query_cache import QueryCache, normalize_query
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+
+@pytest.fixture
+def source():
+    return {"type": "postgres", "table": "users", "connection": {"host": "db"}}
+
+
+class TestQueryCache:
+    def test_normalize_query(self):
+        assert normalize_query(
+            "select a,\n  b from users -- all users\nwhere a > 1"
+        ) == normalize_query("SELECT a, b FROM users WHERE a > 1")
+        assert normalize_query("not sql ((") == "not sql (("
+
+    def test_key_depends_on_query_source_and_fingerprint(self, source):
+        cache = QueryCache()
+        key = cache.get_cache_key("SELECT * FROM users", source, "fp")
+
+        assert key == cache.get_cache_key("select *  from users", source, "fp")
+        assert key != cache.get_cache_key("SELECT * FROM orders", source, "fp")
+        assert key != cache.get_cache_key("SELECT * FROM users", source, "fp2")
+        assert key != cache.get_cache_key(
+            "SELECT * FROM users", {**source, "connection": {"host": "other"}}, "fp"
+        )
+        assert key != cache.get_cache_key(
+            "SELECT * FROM users", source, "fp", max_rows=10
+        )
+
+    def test_set_and_get(self, df):
+        cache = QueryCache()
+        assert cache.get("key") is None
+
+        cache.set("key", df)
+        pd.testing.assert_frame_equal(cache.get("key"), df)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_spill_to_disk(self, df, tmp_path):
+        cache = QueryCache(max_size=1, cache_dir=str(tmp_path))
+        cache.set("first", df)
+        cache.set("second", df)
+
+        assert cache.size == 0
+        assert len(cache) == 2
+        assert len(list(tmp_path.iterdir())) == 2
+
+        # a spilled result is read back from the disk
+        pd.testing.assert_frame_equal(cache.get("first"), df)
+
+        cache.clear()
+        assert len(cache) == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_disk_size_eviction(self, df, tmp_path):
+        cache = QueryCache(max_size=1, max_disk_size=1, cache_dir=str(tmp_path))
+        cache.set("key", df)
+
+        assert cache.get("key") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_max_age(self, df):
+        cache = QueryCache(max_age=0.01)
+        cache.set("key", df)
+        time.sleep(0.02)
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_fingerprint_is_reused_within_ttl(self, source):
+        cache = QueryCache(fingerprint_ttl=60)
+        fingerprints = iter(["fp1", "fp2"])
+
+        assert cache.get_fingerprint(source, lambda: next(fingerprints)) == "fp1"
+        assert cache.get_fingerprint(source, lambda: next(fingerprints)) == "fp1"
+
+        cache.fingerprint_ttl = 0
+        assert cache.get_fingerprint(source, lambda: next(fingerprints)) == "fp2"
+
+    def test_unsupported_result_is_not_cached(self):
+        cache = QueryCache()
+        cache.set("key", pd.DataFrame({"a": [1, "x", object()]}))
+        assert len(cache) == 0
@@ -0,0 +1,95 @@
+import os
+
+import pandas as pd
+import pytest
+
+from pandasai.dataframe.base import DataFrame
+from pandasai.helpers.result_cache import ResultCache
+
+
+@pytest.fixture
+def dfs():
+    return [DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})]
+
+
+class TestResultCache:
+    def test_key_depends_on_code_and_data(self, dfs):
+        cache = ResultCache()
+        key = cache.get_cache_key("result = 1", dfs)
+
+        assert key == cache.get_cache_key("result = 1", dfs)
+        assert key != cache.get_cache_key("result = 2", dfs)
+
+        dfs[0].loc[0, "a"] = 10
+        assert key != cache.get_cache_key("result = 1", dfs)
+
+    def test_key_depends_on_every_row(self):
+        cache = ResultCache()
+        dfs = [DataFrame({"a": range(1_000_000)})]
+        key = cache.get_cache_key("result = dfs[0]['a'].min()", dfs)
+
+        dfs[0].iloc[1500, 0] = -5
+        assert key != cache.get_cache_key("result = dfs[0]['a'].min()", dfs)
+
+    def test_number_and_string(self, dfs):
+        cache = ResultCache()
+        cache.set("number", {"type": "number", "value": 42})
+        cache.set("string", {"type": "string", "value": "hello"})
+
+        assert cache.get("number") == {"type": "number", "value": 42}
+        assert cache.get("string") == {"type": "string", "value": "hello"}
+        assert cache.get("missing") is None
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_dataframe_is_a_copy(self, dfs):
+        cache = ResultCache()
+        cache.set("key", {"type": "dataframe", "value": dfs[0]})
+        dfs[0].loc[0, "a"] = 10
+
+        result = cache.get("key")
+        assert result["type"] == "dataframe"
+        assert result["value"]["a"].tolist() == [1, 2, 3]
+
+    def test_series(self, dfs):
+        cache = ResultCache()
+        cache.set("key", {"type": "dataframe", "value": dfs[0]["b"]})
+
+        result = cache.get("key")["value"]
+        assert isinstance(result, pd.Series)
+        assert result.name == "b"
+        assert result.tolist() == ["x", "y", "z"]
+
+    def test_chart_is_restored(self, tmp_path):
+        chart_path = os.path.join(tmp_path, "chart.png")
+        with open(chart_path, "wb") as chart:
+            chart.write(b"png bytes")
+
+        cache = ResultCache()
+        cache.set("key", {"type": "plot", "value": chart_path})
+        os.remove(chart_path)
+
+        assert cache.get("key") == {"type": "plot", "value": chart_path}
+        with open(chart_path, "rb") as chart:
+            assert chart.read() == b"png bytes"
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(max_entries=2)
+        cache.set("a", {"type": "number", "value": 1})
+        cache.set("b", {"type": "number", "value": 2})
+        cache.get("a")
+        cache.set("c", {"type": "number", "value": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_evicts_above_max_size(self):
+        cache = ResultCache(max_size=10)
+        cache.set("a", {"type": "string", "value": "12345"})
+        cache.set("b", {"type": "string", "value": "1234567"})
+        cache.set("c", {"type": "string", "value": "this is too large"})
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.get("c") is None
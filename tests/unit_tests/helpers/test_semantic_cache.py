@@ -0,0 +1,123 @@
+import numpy as np
+
+import pytest
+
+from pandasai.helpers.semantic_cache import (
+    SemanticCache,
+    get_content_words,
+    get_literals,
+    hashing_embedding,
+)
+
+
+class TestSemanticCache:
+    def test_reuses_code_of_similar_query(self):
+        cache = SemanticCache()
+        cache.add("What is the average salary by department?", "code", "schema")
+
+        assert cache.get("what is the average salary by department", "schema") == (
+            "code"
+        )
+        assert cache.get("Show the top 5 countries by GDP", "schema") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    @pytest.mark.parametrize(
+        "query,other_query",
+        [
+            ("How many people are over 30?", "How many people are over 40?"),
+            ("What were the sales in 2022?", "What were the sales in 2023?"),
+            ("Show the top 5 countries by GDP", "Show the top 10 countries by GDP"),
+            ("Count the orders of 'France'", "Count the orders of 'Spain'"),
+        ],
+    )
+    def test_ignores_queries_with_other_literals(self, query, other_query):
+        cache = SemanticCache()
+        cache.add(query, "code", "schema")
+
+        assert cache.get(other_query, "schema") is None
+        assert cache.get(query.rstrip("?") + "!", "schema") == "code"
+
+    @pytest.mark.parametrize(
+        "query,other_query",
+        [
+            (
+                "What is the average salary of women?",
+                "What is the average salary of men?",
+            ),
+            ("Which customers did order?", "Which customers did not order?"),
+            ("Which customers did order?", "Which customers didn't order?"),
+            ("List the products sold", "List the products never sold"),
+        ],
+    )
+    def test_ignores_queries_with_other_words(self, query, other_query):
+        cache = SemanticCache()
+        cache.add(query, "code", "schema")
+
+        assert cache.get(other_query, "schema") is None
+        assert cache.get(query.lower(), "schema") == "code"
+
+    def test_reuses_code_of_query_with_same_literals(self):
+        cache = SemanticCache()
+        cache.add("Show the top 10 countries by GDP", "top 10 code", "schema")
+        cache.add("Show the top 5 countries by GDP", "top 5 code", "schema")
+
+        assert cache.get("show the top 5 countries by gdp!", "schema") == ("top 5 code")
+
+    def test_get_literals(self):
+        assert get_literals("What's the top 5 of 'France' in 2023.5?") == (
+            "2023.5",
+            "5",
+            "France",
+        )
+
+    def test_get_content_words(self):
+        assert get_content_words("Which customers didn't order?") == {
+            "customers",
+            "not",
+            "order",
+        }
+
+    def test_isolates_schema_fingerprints(self):
+        cache = SemanticCache()
+        cache.add("What is the average salary?", "code", "schema")
+
+        assert cache.get("What is the average salary?", "other schema") is None
+
+    def test_threshold(self):
+        cache = SemanticCache(threshold=1.0)
+        cache.add("What is the average salary by department?", "code", "schema")
+
+        assert cache.get("Average salary by department?", "schema") is None
+
+    def test_custom_embedding_function(self):
+        cache = SemanticCache(
+            embedding_function=lambda text: np.array([1.0, 0.0]), threshold=1.0
+        )
+        cache.add("What is the average salary by department?", "code", "schema")
+
+        assert cache.get("Show me the salary average by department", "schema") == (
+            "code"
+        )
+
+    def test_replaces_code_of_same_query(self):
+        cache = SemanticCache()
+        cache.add("query", "old code", "schema")
+        cache.add("query", "new code", "schema")
+
+        assert len(cache) == 1
+        assert cache.get("query", "schema") == "new code"
+
+    def test_evicts_oldest_queries(self):
+        cache = SemanticCache(max_entries=1)
+        cache.add("What is the average salary?", "salary code", "schema")
+        cache.add("Show the top 5 countries by GDP", "gdp code", "schema")
+
+        assert len(cache) == 1
+        assert cache.get("What is the average salary?", "schema") is None
+
+    def test_hashing_embedding_is_deterministic(self):
+        assert np.array_equal(
+            hashing_embedding("average salary"), hashing_embedding("average salary")
+        )
+        assert hashing_embedding("average salary", dimensions=64).shape == (64,)
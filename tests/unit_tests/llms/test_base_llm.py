@@ -1,5 +1,7 @@
 """Unit tests for the base LLM class"""
 
+import asyncio
+
 import pytest
 
 from pandasai.exceptions import APIKeyNotFoundError, NoCodeFoundError
@@ -136,3 +138,12 @@ print('Hello World')
 
     def test_prepend_system_prompt_with_memory_none(self):
         assert LLM().prepend_system_prompt("hello world", None) == "hello world"
+
+    def test_acall_runs_call_in_executor(self):
+        class FakeLLM(LLM):
+            def call(self, instruction, context=None):
+                return f"```python\nresult = {instruction!r}\n```"
+
+        llm = FakeLLM()
+        code = asyncio.run(llm.agenerate_code("question", None))
+        assert code == "result = 'question'"
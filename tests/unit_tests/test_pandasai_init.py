@@ -79,6 +79,38 @@ class TestPandasAIInit:
             assert "email" in result.columns
             mock_load.assert_called_once_with("test/users")
 
+    def test_load_many(self):
+        def load(dataset_path, virtualized):
+            if dataset_path == "test/broken":
+                raise ValueError("Invalid schema")
+            return DataFrame(pd.DataFrame({"path": [dataset_path]}))
+
+        with patch("pandasai._pull_dataset"), patch(
+            "pandasai.DatasetLoader.load", side_effect=load
+        ) as mock_load:
+            results = pandasai.load_many(
+                ["test/users", "test/broken", "test/orders", "test/users"],
+                max_workers=2,
+            )
+
+        assert [result.dataset_path for result in results] == [
+            "test/users",
+            "test/broken",
+            "test/orders",
+            "test/users",
+        ]
+        assert [result.ok for result in results] == [True, False, True, True]
+        assert results[0].df["path"].tolist() == ["test/users"]
+        assert results[0] is results[3]
+        assert isinstance(results[1].error, ValueError)
+        assert results[1].df is None
+        assert all(result.duration >= 0 for result in results)
+        assert mock_load.call_count == 3
+
+    def test_load_many_invalid_max_workers(self):
+        with pytest.raises(ValueError, match="max_workers must be at least 1"):
+            pandasai.load_many(["test/users"], max_workers=0)
+
     def test_clear_cache(self):
         with patch("pandasai.helpers.cache.Cache.clear") as mock_clear:
             pandasai.clear_cache()